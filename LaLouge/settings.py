@@ -69,6 +69,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.gis',
+    'django.contrib.postgres',
 ]
 
 # Apps installed using `pip3 install <package>`
@@ -368,7 +369,13 @@ APPLICATION_SETTINGS = {
     # Default = 10 Minutes
     "OTP_LIFETIME": timedelta(minutes=10),
 
+    # How Long Websocket Payloads (e.g. New Device Tokens) Wait For
+    # The Client To Connect Before Being Dropped
+    "PENDING_DELIVERY_TTL": 300,  # in seconds, type=int
+
     "IP_MATCH_PROBABILITY_PASS_SCORE": 0.7,  # type=float
+    # Minimum estimated Jaccard similarity (0 - 1) between a
+    # request's device fingerprint and a stored device's
     "DEVICE_DATA_SIMILARITY_MATCH_SCORE": 0.7,  # type=float
 
     "LOGIN_URL": {
@@ -380,9 +387,38 @@ APPLICATION_SETTINGS = {
         "URL": "request/login-otp/"
     },
     "MABBOX_API_KEY": os.environ.get('MAPBOX_API_KEY', None),
+    # Local IP Geolocation Dataset
+    # Built With `python manage.py refresh_geolocation --source <csv|url>`
+    "GEOLOCATION": {
+        "DATASET_DIR": BASE_DIR / "data" / "geolocation",
+        "CACHE_SIZE": 4096,  # LRU entries, type=int
+        "RELOAD_INTERVAL": 300,  # in seconds, type=int
+        # Query ipinfo.io for addresses missing from the dataset
+        "REMOTE_FALLBACK": os.environ.get(
+            "GEOLOCATION_REMOTE_FALLBACK", "False"
+        ) == "True",
+        "REMOTE_URL": "https://ipinfo.io/{ip}/json/",
+        "REMOTE_TIMEOUT": 2,  # in seconds, type=int
+    },
     "API_KEY": {
         "EXPIRES_IN": 14,  # in days, type=int
     },
+    # Bounded Background Executor (`utilities.executor.background`)
+    # BACKEND: "thread" Runs Jobs In This Process, "celery" Hands Them
+    # Over To Celery Workers. Can Be Overridden Per Queue.
+    # ON_FULL: "run" Runs The Job In The Caller When The Queue Is Full,
+    # "reject" Drops It
+    "BACKGROUND_TASKS": {
+        "BACKEND": os.environ.get("BACKGROUND_TASKS_BACKEND", "thread"),
+        "QUEUES": {
+            "default": {"MAX_WORKERS": 4, "MAX_DEPTH": 100},
+            "geolocation": {"MAX_WORKERS": 4, "MAX_DEPTH": 200},
+            "registration": {"MAX_WORKERS": 4, "MAX_DEPTH": 200},
+            "notifications": {"MAX_WORKERS": 8, "MAX_DEPTH": 500},
+            # Bulk user imports, never run in the request
+            "imports": {"MAX_WORKERS": 1, "MAX_DEPTH": 5, "ON_FULL": "reject"},
+        },
+    },
     "DEFAULT_CURRENCY": {
         "name": "US Dollar",
         "symbol": "$",
@@ -401,6 +437,37 @@ APPLICATION_SETTINGS = {
         "AI_MARKETING_MAXIMUM_ROUNDS": 2,  # type=int
         "SALE_COMMISSION": 0.01,  # type=float
         "RENTAL_COMMISSION": 0.05,  # type=float
+    },
+    # Key Of The Permutation Behind Referral Codes And Generated Usernames
+    # (`utilities.generators.codes`), Defaults To `SECRET_KEY`.
+    # Never Change It Once Codes Were Issued
+    "UNIQUE_CODES": {
+        "KEY": os.environ.get("UNIQUE_CODES_KEY", None),
+    },
+    # Rows Fetched At Once By Streaming Exports (Server-Side Cursors)
+    "EXPORT_CHUNK_SIZE": 2000,  # type=int
+    # Commissions Credited Along The MLM Upline (`MLMCommissionEntry`)
+    "MLM_COMMISSIONS": {
+        "MAX_DEPTH": 20,  # Levels credited per event, type=int
+        "MINIMUM_AMOUNT": "0.01",  # Smaller commissions end the chain, type=str
+    },
+    # User Search (`User.search`), Trigram Matching Needs 3 Characters
+    "USER_SEARCH": {
+        "LIMIT": 20,  # Results per page, type=int
+        "MAX_LIMIT": 50,  # Hard cap on `?limit=`, type=int
+        "MIN_QUERY_LENGTH": 3,  # type=int
+    },
+    # User Listings (`UserAPIView.get`), Keyset Paginated
+    "USER_LISTING": {
+        "LIMIT": 20,  # Users per page, type=int
+        "MAX_LIMIT": 100,  # Hard cap on `?limit=`, type=int
+    },
+    # Bulk User Imports (`accounts.imports.UserImporter`)
+    "USER_IMPORT": {
+        "CHUNK_SIZE": 500,  # Records per transaction, type=int
+        "HASH_WORKERS": None,  # Password hashing processes, None: per CPU
+        "NOTIFICATION_BATCH": 100,  # Users per notification job, type=int
+        "JOB_TTL": 86400,  # Seconds import reports are kept, type=int
     }
 }
 
@@ -433,6 +500,11 @@ CELERY_BEAT_SCHEDULE = {
     "fetch_currency_exchange_rates": {
         "task": "configurations.tasks.update_exchange_rates_cache",
         "schedule": 3600
+    },
+    "settle_mlm_commissions": {
+        "task": "accounts.tasks.settle_mlm_commissions",
+        # Once a day (in seconds)
+        "schedule": 86400
     }
 }
 
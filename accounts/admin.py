@@ -6,7 +6,7 @@ from accounts.models.plans import (
     DefaultFeature, AIConflictResolutionAssistantFeature,
     TeamGoalFeature, AIMarketingAssistantFeature,
     MultiLevelMarketingFeature, BusinessFeature,
-    SubscriptionPlan, UserSubscriptionPlan
+    SubscriptionPlan, PlanPriceSnapshot, UserSubscriptionPlan
 )
 
 from accounts.models.account import (OTP, PhoneNumberVerificationOTP,
@@ -15,7 +15,8 @@ from accounts.models.account import (OTP, PhoneNumberVerificationOTP,
                                      KYCVerificationCheck, AccountVerification)
 
 from accounts.models.devices import (DeviceLoginHistory, DeviceTokenBlacklist,
-                                     DeviceToken, DeviceWallet, Device)
+                                     DeviceToken, DeviceWallet, WalletMovement,
+                                     Device)
 
 
 # Register your models here.
@@ -30,6 +31,7 @@ admin.site.register(AIMarketingAssistantFeature)
 admin.site.register(MultiLevelMarketingFeature)
 admin.site.register(BusinessFeature)
 admin.site.register(SubscriptionPlan)
+admin.site.register(PlanPriceSnapshot)
 admin.site.register(UserSubscriptionPlan)
 
 admin.site.register(OTP)
@@ -45,4 +47,5 @@ admin.site.register(DeviceLoginHistory)
 admin.site.register(DeviceTokenBlacklist)
 admin.site.register(DeviceToken)
 admin.site.register(DeviceWallet)
+admin.site.register(WalletMovement)
 admin.site.register(Device)
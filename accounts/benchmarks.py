@@ -0,0 +1,118 @@
+"""
+Synthetic MLM pyramids for the `generate_mlm_pyramid` and `benchmark_mlm`
+commands.
+
+Members are numbered in breadth-first order: member `i` is recruited by
+member `(i - 1) // 2`, which gives a complete binary pyramid. Their users
+are recognisable by `BENCH_USERNAME_PREFIX` and are never meant to exist
+outside of local or staging databases.
+"""
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+
+from accounts.models.users import User
+from accounts.models.mlm_user import MLMUser, MLMRelationship, MLMClosure
+
+from utilities.generators.codes import referral_codes
+
+from itertools import islice
+
+import secrets
+
+
+BENCH_USERNAME_PREFIX = "@mlm-bench-"
+
+
+def bench_members():
+    return MLMUser.objects.filter(user__username__startswith=BENCH_USERNAME_PREFIX)
+
+
+def bench_user(name: str, password: str) -> User:
+    # Built without `User.save`, which bulk inserts skip anyway
+    return User(
+        username=f"{BENCH_USERNAME_PREFIX}{name}",
+        query_id=f"mlm-bench-{name}-{secrets.token_hex(8)}".encode(),
+        secret_key=secrets.token_bytes(32),
+        password=password,
+        is_active=True,
+        is_mlm_user=True,
+    )
+
+
+def closure_rows(member_pks: list):
+    """Closure of the breadth-first binary pyramid of `member_pks`."""
+
+    for index, descendant_pk in enumerate(member_pks):
+        ancestor, depth = index, 0
+
+        while True:
+            yield MLMClosure(
+                ancestor_id=member_pks[ancestor],
+                descendant_id=descendant_pk, depth=depth
+            )
+
+            if ancestor == 0:
+                break
+
+            ancestor, depth = (ancestor - 1) // 2, depth + 1
+
+
+def generate_pyramid(size: int, batch_size: int = 2000, report=None) -> list:
+    """
+    Bulk insert a binary pyramid of `size` members, with its closure
+    and counters.
+
+    Returns:
+        list: Primary keys of the members, root first.
+    """
+
+    report = report or (lambda step: None)
+    password = make_password(None)
+
+    with transaction.atomic():
+        users = User.objects.bulk_create(
+            [bench_user(str(index), password) for index in range(size)],
+            batch_size=batch_size
+        )
+        report("users")
+
+        members = MLMUser.objects.bulk_create(
+            [
+                MLMUser(user=user, referral_code=code)
+                for user, code in zip(users, referral_codes.allocate(size))
+            ],
+            batch_size=batch_size
+        )
+        member_pks = [member.pk for member in members]
+        report("members")
+
+        MLMRelationship.objects.bulk_create(
+            [
+                MLMRelationship(
+                    parent_id=member_pks[(index - 1) // 2], child_id=pk
+                )
+                for index, pk in enumerate(member_pks) if index
+            ],
+            batch_size=batch_size
+        )
+        report("relationships")
+
+        # About size * log2(size) rows, inserted without holding them all
+        rows = closure_rows(member_pks)
+        while batch := list(islice(rows, batch_size * 5)):
+            MLMClosure.objects.bulk_create(batch, batch_size=batch_size)
+        report("closure")
+
+        MLMUser.objects.filter(pk__in=member_pks).recompute_counters()
+        report("counters")
+
+    return member_pks
+
+
+def clear_pyramid() -> int:
+    deleted, _ = User.objects.filter(
+        username__startswith=BENCH_USERNAME_PREFIX
+    ).delete()
+
+    return deleted
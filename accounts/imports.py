@@ -0,0 +1,398 @@
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.db import IntegrityError, transaction
+
+from accounts.models.users import User, BannedPhoneNumber, BannedEmail
+from accounts.registration import (create_companions, create_verification_otps,
+                                   verification_otp_model)
+
+from utilities import response
+from utilities.account import Verification
+from utilities.executor import background
+from utilities.generators.otp import OTPGenerator
+from utilities.generators.string_generators import (
+    generate_names, is_generated_name, Keys
+)
+from utilities.models.fields import validation
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import IO, Iterator
+
+import json
+import uuid
+import csv
+import io
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+IMPORT_FORMATS = ("csv", "jsonl")
+
+IMPORT_FIELDS = (
+    "phone", "password", "email", "username", "legal_name", "user_type",
+    "is_mlm_user"
+)
+
+TRUE_VALUES = {"1", "true", "yes", "y"}
+
+IMPORT_JOB_KEY = "user_import_{job_id}"
+
+
+@dataclass
+class ImportReport:
+    created: int = 0
+    # (line, message) of every record that wasn't imported
+    errors: list = field(default_factory=list)
+
+    def as_dict(self) -> dict:
+        return {
+            "created": self.created,
+            "errors": [
+                {"line": line, "message": message}
+                for line, message in self.errors
+            ],
+        }
+
+
+def read_records(stream: IO, input_format: str) -> Iterator[tuple]:
+    """
+    (line, record) of a CSV (with a header) or JSONL text stream, one
+    line at a time. Records that can't be parsed are None.
+    """
+
+    if input_format == "csv":
+        for line, record in enumerate(csv.DictReader(stream), start=2):
+            yield line, record
+
+        return
+
+    for line, text in enumerate(stream, start=1):
+        if not text.strip():
+            continue
+
+        try:
+            record = json.loads(text)
+        except ValueError:
+            record = None
+
+        yield line, record if isinstance(record, dict) else None
+
+
+def clean_record(record: dict) -> tuple:
+    """
+    Validated fields of an imported user, as (data, error message).
+    Uniqueness is checked a chunk at a time, see `UserImporter`.
+    """
+
+    if record is None:
+        return None, "Unreadable Record"
+
+    data = {
+        name: str(record.get(name) or "").strip() for name in IMPORT_FIELDS
+    }
+
+    if not data["phone"] or not data["password"]:
+        return None, "Phone And Password Are Required"
+
+    if not validation.PhoneValidation(data["phone"]).validate_pattern()[0]:
+        return None, f"Invalid Phone Number `{data['phone']}`"
+
+    if data["email"] and not (
+            validation.EmailValidation(data["email"]).validate_pattern()[0]):
+        return None, f"Invalid Email `{data['email']}`"
+
+    user_information = {
+        name: value for name, value in data.items() if name != "password"
+    }
+
+    if not validation.PasswordValidation(
+            data["password"], user_information).validate()[0]:
+        return None, "Password Too Weak Or Similar To User Information"
+
+    if data["username"]:
+        data["username"] = "@" + data["username"].lstrip("@").replace(" ", ".")
+
+        if len(data["username"]) > User._meta.get_field("username").max_length:
+            return None, f"Username `{data['username']}` Is Too Long"
+
+        if is_generated_name(data["username"]):
+            return None, f"Username `{data['username']}` Is Reserved"
+
+    data["user_type"] = data["user_type"].upper() or User.UserType.BUYER
+
+    if data["user_type"] not in User.UserType.values:
+        return None, f"Unknown User Type `{data['user_type']}`"
+
+    data["is_mlm_user"] = data["is_mlm_user"].lower() in TRUE_VALUES
+
+    return data, None
+
+
+def notify_imported_users(user_pks: list):
+    """
+    Background job generating and sending the verification OTPs of a
+    batch of imported users.
+    Only takes JSON serializable arguments so it can run on Celery too.
+    """
+
+    for user in User.objects.filter(pk__in=user_pks):
+        model = verification_otp_model(user)
+
+        try:
+            OTPGenerator(
+                secret_key=user.get_secret_key, model=model, user=user
+            ).generate_otp()
+
+            verification = Verification(user=user, model=model)
+
+            if user.email:
+                verification.email()
+            else:
+                verification.phone()
+        except Exception as e:
+            response.errors(
+                field_error="Failed To Send Verification Code",
+                for_developer=f"{str(e)}",
+                code="SERVER_ERROR",
+                status_code=1011,
+                main_thread=False,
+                param=user.pk
+            )
+
+
+class UserImporter:
+    """
+    Imports users from a CSV or JSONL stream, `chunk_size` records at a
+    time, so memory stays flat whatever the size of the stream.
+
+    Each chunk is validated in-process, checked against existing users
+    in three queries and its passwords are hashed, by `pool` when given
+    (the `import_users` command passes a process pool, web processes
+    must not fork one). Users and all their companion rows are then
+    created with one INSERT per table, in one transaction per chunk: a
+    failing chunk leaves no partial accounts behind. Verification codes
+    are sent afterwards, by background jobs of `notification_batch`
+    users: like registered ones, imported users are inactive until they
+    verify their phone or email.
+    """
+
+    def __init__(self, chunk_size: int = None, notify: bool = True):
+        import_settings = app_settings.get("USER_IMPORT", {})
+
+        self.chunk_size = chunk_size or import_settings.get("CHUNK_SIZE", 500)
+        self.notification_batch = import_settings.get("NOTIFICATION_BATCH", 100)
+        self.notify = notify
+
+    def run(self, stream: IO, input_format: str,
+            pool: ProcessPoolExecutor = None) -> ImportReport:
+        if input_format not in IMPORT_FORMATS:
+            raise ValueError(f"Unsupported Import Format `{input_format}`")
+
+        report = ImportReport()
+        records = read_records(stream, input_format)
+
+        while chunk := list(islice(records, self.chunk_size)):
+            self.import_chunk(chunk, report, pool)
+
+        return report
+
+    def hash_passwords(self, passwords: list,
+                       pool: ProcessPoolExecutor = None):
+        # A hash takes long enough for its round trip to a process not to
+        # matter
+        return (pool.map if pool else map)(make_password, passwords)
+
+    def import_chunk(self, chunk: list, report: ImportReport,
+                     pool: ProcessPoolExecutor = None) -> None:
+        records = []
+
+        for line, record in chunk:
+            data, error = clean_record(record)
+
+            if error:
+                report.errors.append((line, error))
+            else:
+                records.append((line, data))
+
+        records = self.drop_conflicts(records, report)
+
+        if not records:
+            return
+
+        passwords = self.hash_passwords(
+            [data["password"] for _, data in records], pool
+        )
+
+        try:
+            with transaction.atomic():
+                users = self.create_users(
+                    [data for _, data in records], passwords
+                )
+
+                create_companions(
+                    users, legal_names=[
+                        data["legal_name"] or None for _, data in records
+                    ]
+                )
+                create_verification_otps(users)
+
+                if self.notify:
+                    user_pks = [user.pk for user in users]
+                    transaction.on_commit(lambda: self.enqueue(user_pks))
+
+        # Users registered since the conflicts were checked
+        except IntegrityError as e:
+            report.errors.extend(
+                (line, f"Chunk Not Imported: {e}") for line, _ in records
+            )
+            return
+
+        report.created += len(users)
+
+    def drop_conflicts(self, records: list, report: ImportReport) -> list:
+        """
+        Records whose phone, email or username is neither taken (or
+        banned) nor repeated earlier in the chunk.
+        """
+
+        def values(name):
+            return [data[name] for _, data in records if data[name]]
+
+        taken = {
+            "phone": set(
+                User.objects.filter(phone__in=values("phone"))
+                .values_list("phone", flat=True)
+            ) | set(
+                BannedPhoneNumber.objects.filter(number__in=values("phone"))
+                .values_list("number", flat=True)
+            ),
+            "email": set(
+                User.objects.filter(email__in=values("email"))
+                .values_list("email", flat=True)
+            ) | set(
+                BannedEmail.objects.filter(email__in=values("email"))
+                .values_list("email", flat=True)
+            ),
+            "username": set(
+                User.objects.filter(username__in=values("username"))
+                .values_list("username", flat=True)
+            ),
+        }
+
+        accepted = []
+
+        for line, data in records:
+            conflict = next(
+                (
+                    name for name in taken
+                    if data[name] and data[name] in taken[name]
+                ),
+                None
+            )
+
+            if conflict:
+                report.errors.append(
+                    (line, f"{conflict.title()} `{data[conflict]}` Is Taken")
+                )
+                continue
+
+            for name in taken:
+                if data[name]:
+                    taken[name].add(data[name])
+
+            accepted.append((line, data))
+
+        return accepted
+
+    def create_users(self, records: list, passwords) -> list:
+        names = iter(
+            generate_names(sum(1 for data in records if not data["username"]))
+        )
+
+        users = []
+
+        for data, password in zip(records, passwords):
+            user = User(
+                phone=data["phone"], email=data["email"] or None,
+                username=data["username"] or f"@{next(names)}",
+                user_type=data["user_type"], is_mlm_user=data["is_mlm_user"],
+                password=password
+            )
+            user.secret_key = Keys(
+                [user.user_type, user.username, user.phone], _type="secret"
+            ).generate()
+
+            users.append(user)
+
+        return User.objects.bulk_create(users)
+
+    def enqueue(self, user_pks: list) -> None:
+        for start in range(0, len(user_pks), self.notification_batch):
+            background.submit(
+                "notifications", notify_imported_users,
+                user_pks[start:start + self.notification_batch]
+            )
+
+
+def set_import_status(job_id: str, **status) -> None:
+    cache.set(
+        IMPORT_JOB_KEY.format(job_id=job_id), status,
+        app_settings.get("USER_IMPORT", {}).get("JOB_TTL", 86400)
+    )
+
+
+def import_status(job_id: str) -> dict:
+    """Status (and report once done) of an import job, None if unknown."""
+    return cache.get(IMPORT_JOB_KEY.format(job_id=job_id))
+
+
+def submit_import(upload, input_format: str, notify: bool = True) -> str:
+    """
+    Store an uploaded file of users and import it in the background
+    (see `run_import`).
+
+    Returns:
+        str: Id of the import job, None if the `imports` queue is full.
+    """
+
+    job_id = uuid.uuid4().hex
+    path = default_storage.save(f"imports/{job_id}.{input_format}", upload)
+
+    set_import_status(job_id, status="QUEUED")
+
+    if not background.submit(
+            "imports", run_import, job_id, path, input_format, notify):
+        default_storage.delete(path)
+        cache.delete(IMPORT_JOB_KEY.format(job_id=job_id))
+        return None
+
+    return job_id
+
+
+def run_import(job_id: str, path: str, input_format: str, notify: bool):
+    """
+    Background job importing the users of a file stored by
+    `submit_import`, its report kept for `import_status`.
+    Only takes JSON serializable arguments so it can run on Celery too.
+    """
+
+    set_import_status(job_id, status="RUNNING")
+
+    try:
+        with default_storage.open(path, "rb") as upload:
+            report = UserImporter(notify=notify).run(
+                io.TextIOWrapper(upload, encoding="utf-8", newline=""),
+                input_format
+            )
+    except Exception as e:
+        set_import_status(job_id, status="FAILED", error=str(e))
+        raise
+    finally:
+        default_storage.delete(path)
+
+    set_import_status(job_id, status="DONE", **report.as_dict())
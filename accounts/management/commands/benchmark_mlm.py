@@ -0,0 +1,183 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from accounts.benchmarks import bench_members, bench_user
+from accounts.models.users import User
+from accounts.models.mlm_user import (
+    MLMUser, MLMClosure, MLMCommissionEntry, MLMCommissionSettlement
+)
+
+from utilities.benchmarks import (
+    run_scenario, save_baseline, compare_to_baseline
+)
+
+from decimal import Decimal
+from itertools import count
+
+import random
+
+
+class Command(BaseCommand):
+    help = ('Times the MLM operations (recruit, earnings, upline and'
+            ' downline traversal, commissions and settlement) on the'
+            ' synthetic pyramid of `generate_mlm_pyramid`')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations', type=int, default=50,
+            help='Timed runs per scenario'
+        )
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            help='Only run this scenario (can be repeated)'
+        )
+        parser.add_argument(
+            '--settlement-size', type=int, default=500,
+            help='Sales recorded before each timed settlement'
+        )
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Seed picking the members of each run'
+        )
+        parser.add_argument(
+            '--save-baseline', type=str, default=None,
+            help='Write the results to this JSON file'
+        )
+        parser.add_argument(
+            '--baseline', type=str, default=None,
+            help='Compare the results to this JSON baseline'
+        )
+        parser.add_argument(
+            '--tolerance', type=float, default=0.2,
+            help='p95 growth (ratio) reported as a regression'
+        )
+
+    def handle(self, *args, **options):
+        members = list(
+            bench_members().order_by('pk').values_list('pk', flat=True)
+        )
+
+        if not members:
+            raise CommandError(
+                'No Synthetic Pyramid, Run `generate_mlm_pyramid` First'
+            )
+
+        self.random = random.Random(options['seed'])
+        self.members = members
+        # Breadth-first numbering: the second half are the leaves
+        self.leaves = members[len(members) // 2:]
+        self.recruits = count()
+
+        scenarios = self.scenarios(options)
+        selected = options['scenarios'] or list(scenarios)
+
+        unknown = set(selected) - set(scenarios)
+        if unknown:
+            raise CommandError(
+                f"Unknown Scenarios: {', '.join(sorted(unknown))}"
+                f" (Available: {', '.join(scenarios)})"
+            )
+
+        self.stdout.write(
+            f'{len(members)} members, {len(members).bit_length()} levels'
+        )
+
+        results = []
+        for name in selected:
+            result = run_scenario(
+                name, iterations=options['iterations'], **scenarios[name]
+            )
+            results.append(result)
+
+            self.stdout.write(
+                f'  {name:<18} p50 {result.p50_ms:>9.3f}ms'
+                f'  p95 {result.p95_ms:>9.3f}ms'
+                f'  max {result.max_ms:>9.3f}ms'
+                f'  queries {result.queries}'
+            )
+
+        if options['save_baseline']:
+            save_baseline(
+                options['save_baseline'], results,
+                meta={
+                    'members': len(members),
+                    'iterations': options['iterations'],
+                    'created_at': timezone.now().isoformat(),
+                }
+            )
+            self.stdout.write(
+                self.style.SUCCESS(
+                    f"Baseline saved to {options['save_baseline']}"
+                )
+            )
+
+        if options['baseline']:
+            regressions = compare_to_baseline(
+                options['baseline'], results, tolerance=options['tolerance']
+            )
+
+            for name, description in regressions:
+                self.stdout.write(
+                    self.style.ERROR(f'  Regression in {name}: {description}')
+                )
+
+            if regressions:
+                raise CommandError(f'{len(regressions)} Regressions')
+
+            self.stdout.write(self.style.SUCCESS('No regression'))
+
+    def pick(self, pks: list) -> int:
+        return self.random.choice(pks)
+
+    def scenarios(self, options) -> dict:
+        root = self.members[0]
+
+        def recruit_setup():
+            # Recruits are synthetic users too, and rolled back anyway
+            user, = User.objects.bulk_create(
+                [bench_user(f'r{next(self.recruits)}', password='!')]
+            )
+
+            return MLMUser.objects.get(pk=self.pick(self.leaves)), user
+
+        def earnings(state):
+            member = MLMUser.objects.get(pk=self.pick(self.members))
+            return member.calculate_earnings, member.can_invite
+
+        def settlement_setup():
+            for index in range(options['settlement_size']):
+                MLMCommissionEntry.objects.record_sale(
+                    self.pick(self.members), f'bench-{index}', Decimal('100')
+                )
+
+        return {
+            'recruit': {
+                'setup': recruit_setup,
+                'run': lambda state: state[0].recruit(state[1]),
+                'rollback': True,
+            },
+            'earnings': {
+                'run': earnings,
+            },
+            'upline': {
+                'run': lambda state: list(
+                    MLMUser.objects.get(pk=self.pick(self.leaves)).upline()
+                ),
+            },
+            'downline_page': {
+                'run': lambda state: list(
+                    MLMClosure.objects.downline_rows(root)[:1000]
+                ),
+            },
+            'record_sale': {
+                'run': lambda state: MLMCommissionEntry.objects.record_sale(
+                    self.pick(self.leaves), 'bench-sale', Decimal('100')
+                ),
+                'rollback': True,
+            },
+            'settlement': {
+                'setup': settlement_setup,
+                'run': lambda state: MLMCommissionSettlement.objects.settle(),
+                'rollback': True,
+            },
+        }
@@ -0,0 +1,102 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models.mlm_user import MLMUser, MLMClosure
+from accounts.managers.mlm import DOWNLINE_COLUMNS
+
+from utilities.streaming import FORMATS, encode_lines
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+class Command(BaseCommand):
+    help = ('Exports the whole downline of an MLM user, level by level,'
+            ' as NDJSON or CSV with constant memory')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'referral_code', type=str,
+            help='Referral code of the MLM user whose downline is exported'
+        )
+        parser.add_argument(
+            '--output', choices=list(FORMATS), default='ndjson',
+            help='Output format'
+        )
+        parser.add_argument(
+            '--file', type=str, default=None,
+            help='File to write to (standard output by default)'
+        )
+        parser.add_argument(
+            '--after', type=str, default=None,
+            help='Resume after this `<level>:<member_id>` (last row exported)'
+        )
+        parser.add_argument(
+            '--max-depth', type=int, default=None,
+            help='Only export this many levels'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int,
+            default=app_settings.get('EXPORT_CHUNK_SIZE', 2000),
+            help='Rows fetched from the database at once'
+        )
+
+    def handle(self, *args, **options):
+        root_pk = MLMUser.objects.filter(
+            referral_code=options['referral_code']
+        ).values_list('pk', flat=True).first()
+
+        if root_pk is None:
+            raise CommandError(
+                f"No MLM User With Referral Code `{options['referral_code']}`"
+            )
+
+        after = None
+        if options['after']:
+            try:
+                level, member_id = (
+                    int(part) for part in options['after'].split(':')
+                )
+            except ValueError:
+                raise CommandError('--after Should Be `<level>:<member_id>`')
+
+            after = (level, member_id)
+
+        rows = MLMClosure.objects.downline_rows(
+            root_pk, after=after, max_depth=options['max_depth']
+        ).iterator(chunk_size=options['chunk_size'])
+
+        lines = encode_lines(rows, list(DOWNLINE_COLUMNS), options['output'])
+
+        # The first CSV line is the header
+        header = next(lines) if options['output'] == 'csv' else None
+
+        if not options['file']:
+            self.write(header, lines, self.stdout)
+            return
+
+        # Resumed exports are appended, without a second header
+        with open(
+            options['file'], 'a' if after else 'w', newline=''
+        ) as export_file:
+            written = self.write(
+                None if after else header, lines, export_file
+            )
+
+        self.stderr.write(
+            self.style.SUCCESS(
+                f"{written} members exported to {options['file']}"
+            )
+        )
+
+    def write(self, header: str, lines, target) -> int:
+        if header is not None:
+            target.write(header)
+
+        written = 0
+        for line in lines:
+            target.write(line)
+            written += 1
+
+        return written
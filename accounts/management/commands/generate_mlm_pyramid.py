@@ -0,0 +1,76 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.benchmarks import bench_members, clear_pyramid, generate_pyramid
+
+import time
+
+
+class Command(BaseCommand):
+    help = ('Bulk inserts a synthetic binary MLM pyramid (users, members,'
+            ' relationships, closure and counters) to benchmark against')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--depth', type=int, default=None,
+            help='Levels below the root (a full pyramid of 2^(depth+1)-1 members)'
+        )
+        parser.add_argument(
+            '--size', type=int, default=None,
+            help='Number of members (the last level may be partial)'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Rows per INSERT'
+        )
+        parser.add_argument(
+            '--replace', action='store_true',
+            help='Delete the previously generated pyramid first'
+        )
+        parser.add_argument(
+            '--clear', action='store_true',
+            help='Only delete the previously generated pyramid'
+        )
+
+    def handle(self, *args, **options):
+        if options['clear'] or options['replace']:
+            deleted = clear_pyramid()
+            self.stdout.write(f'{deleted} synthetic rows deleted')
+
+            if options['clear']:
+                return
+
+        if bench_members().exists():
+            raise CommandError(
+                'A Synthetic Pyramid Already Exists, Use --replace'
+            )
+
+        if options['size']:
+            size = options['size']
+        elif options['depth'] is not None:
+            size = 2 ** (options['depth'] + 1) - 1
+        else:
+            raise CommandError('Either --depth Or --size Is Required')
+
+        # Usernames hold up to 8 digits
+        if not 0 < size < 10 ** 8:
+            raise CommandError(f'Invalid Pyramid Size: {size}')
+
+        started_at = previous = time.perf_counter()
+
+        def report(step: str):
+            nonlocal previous
+            now = time.perf_counter()
+            self.stdout.write(f'  {step}: {now - previous:.2f}s')
+            previous = now
+
+        member_pks = generate_pyramid(
+            size, batch_size=options['batch_size'], report=report
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'{len(member_pks)} members generated'
+                f' ({size.bit_length()} levels)'
+                f' in {time.perf_counter() - started_at:.2f}s'
+            )
+        )
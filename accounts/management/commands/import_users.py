@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.imports import IMPORT_FORMATS, IMPORT_FIELDS, UserImporter
+
+from concurrent.futures import ProcessPoolExecutor
+
+import os
+import sys
+import time
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+class Command(BaseCommand):
+    help = ('Imports users (with all their companion rows) from a CSV or'
+            ' JSONL file, a chunk at a time')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'file', type=str,
+            help=(
+                'CSV (with a header) or JSONL file of users, `-` for'
+                f' standard input. Fields: {", ".join(IMPORT_FIELDS)}'
+            )
+        )
+        parser.add_argument(
+            '--format', choices=IMPORT_FORMATS, default=None,
+            help='Input format (guessed from the file extension by default)'
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help='Records validated and inserted at once'
+        )
+        parser.add_argument(
+            '--workers', type=int, default=None,
+            help='Processes hashing passwords (one per CPU by default)'
+        )
+        parser.add_argument(
+            '--no-notify', action='store_true',
+            help="Don't send verification codes to the imported users"
+        )
+
+    def handle(self, *args, **options):
+        path = options['file']
+        input_format = options['format'] or (
+            os.path.splitext(path)[1].lstrip('.').lower()
+        )
+
+        if input_format not in IMPORT_FORMATS:
+            raise CommandError(
+                f"Unknown Format For `{path}`, Pass --format"
+                f" ({', '.join(IMPORT_FORMATS)})"
+            )
+
+        importer = UserImporter(
+            chunk_size=options['chunk_size'], notify=not options['no_notify']
+        )
+        workers = options['workers'] or (
+            app_settings.get('USER_IMPORT', {}).get('HASH_WORKERS')
+        )
+
+        started_at = time.perf_counter()
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            if path == '-':
+                report = importer.run(sys.stdin, input_format, pool=pool)
+            else:
+                try:
+                    with open(path, newline='', encoding='utf-8') as stream:
+                        report = importer.run(stream, input_format, pool=pool)
+                except OSError as e:
+                    raise CommandError(f"Unable To Read `{path}`: {e}")
+
+        for line, message in report.errors:
+            self.stderr.write(self.style.WARNING(f"Line {line}: {message}"))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported {report.created} Users, Skipped {len(report.errors)}"
+            f" Records In {time.perf_counter() - started_at:.1f}s"
+        ))
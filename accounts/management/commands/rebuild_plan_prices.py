@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from utilities.pricing import rebuild_plan_price_snapshots
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the price snapshots of active subscription plans'
+            ' in every currency with a known exchange rate')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--plan', type=int, action='append', dest='plans',
+            help='Only rebuild this plan (can be repeated)'
+        )
+
+    def handle(self, *args, **options):
+        written = rebuild_plan_price_snapshots(plan_pks=options.get('plans'))
+
+        self.stdout.write(
+            self.style.SUCCESS(f'{written} plan price snapshots rebuilt')
+        )
@@ -0,0 +1,65 @@
+from django.core.management.base import BaseCommand
+
+from accounts.models.mlm_user import MLMUser, MLMClosure
+
+
+COUNTERS = (
+    'direct_children_count', 'subtree_size',
+    'subtree_depth', 'lifetime_earnings'
+)
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the MLM pyramid counters from scratch and reports'
+            ' the members whose stored counters drifted')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--fix', action='store_true',
+            help='Overwrite the drifted counters with the recomputed values'
+        )
+        parser.add_argument(
+            '--rebuild-closure', action='store_true',
+            help='Rebuild the pyramid closure table before verifying'
+        )
+        parser.add_argument(
+            '--limit', type=int, default=20,
+            help='Maximum number of drifted members to list'
+        )
+
+    def handle(self, *args, **options):
+        if options['rebuild_closure']:
+            paths = MLMClosure.objects.rebuild()
+            self.stdout.write(f'{paths} pyramid paths rebuilt')
+
+        drifted = MLMUser.objects.with_counter_drift()
+
+        total = drifted.count()
+
+        for member in drifted.order_by('pk')[:options['limit']]:
+            changes = ', '.join(
+                f'{counter}: {getattr(member, counter)}'
+                f' -> {getattr(member, f"expected_{counter}")}'
+                for counter in COUNTERS
+                if getattr(member, counter) != getattr(member, f'expected_{counter}')
+            )
+            self.stdout.write(f'  MLM user {member.pk}: {changes}')
+
+        if not total:
+            self.stdout.write(self.style.SUCCESS('No counter drift'))
+            return
+
+        if options['fix']:
+            fixed = MLMUser.objects.filter(
+                pk__in=drifted.values('pk')
+            ).recompute_counters()
+
+            self.stdout.write(
+                self.style.SUCCESS(f'{fixed} MLM users fixed')
+            )
+        else:
+            self.stdout.write(
+                self.style.WARNING(
+                    f'{total} MLM users drifted, run with --fix to repair them'
+                )
+            )
@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, connection
+from django.utils import timezone
 
 from utilities import response
 
@@ -29,3 +30,183 @@ class DeviceManager(models.Manager):
                             code="NOT_FOUND", status_code=404)
 
         return instances
+
+
+class DeviceWalletManager(models.Manager):
+    """
+    Moves money between the buckets of device wallets.
+
+    Amounts are integer minor units (cents). Every operation is a single
+    statement that updates the devices, their wallets and appends to
+    `WalletMovement` together, with `F()`-style arithmetic done by the
+    database: rows are locked for that statement only, never across a
+    read-modify-write round trip.
+    """
+
+    # Transfers applied by `sync` and `unsync`, from the wallet's current
+    # `moved` amount
+    TRANSFERS = {
+        "SYNC": {
+            "moved": "unsynced_amount",
+            "set": (
+                "synced_amount = wallet.synced_amount + locked.moved,"
+                " amount_in_sync_transition = locked.moved,"
+                " unsynced_amount = wallet.unsynced_amount - locked.moved"
+            ),
+            # Devices being synced, and the flag they end up with
+            "devices": "NOT device.is_synced",
+            "is_synced": "TRUE",
+        },
+        "UNSYNC": {
+            "moved": "amount_in_sync_transition",
+            "set": (
+                "synced_amount = wallet.synced_amount - locked.moved,"
+                " amount_in_sync_transition = 0,"
+                " unsynced_amount = wallet.unsynced_amount + locked.moved"
+            ),
+            # Devices with nothing in transition stay synced
+            "devices": (
+                "device.is_synced AND device.wallet_id IN ("
+                "SELECT id FROM {wallet} WHERE amount_in_sync_transition <> 0)"
+            ),
+            "is_synced": "FALSE",
+        },
+    }
+
+    def _tables(self) -> dict:
+        get_model = self.model._meta.apps.get_model
+
+        return {
+            "wallet": self.model._meta.db_table,
+            "device": get_model("accounts", "Device")._meta.db_table,
+            "movement": get_model("accounts", "WalletMovement")._meta.db_table,
+        }
+
+    def _transfer(self, kind: str, user_pk: int = None,
+                  device_pks: list = None) -> list:
+        if user_pk is None and device_pks is None:
+            raise ValueError("Either `user_pk` Or `device_pks` Is Required")
+
+        transfer, tables = self.TRANSFERS[kind], self._tables()
+
+        scope, params = [], {"kind": kind, "now": timezone.now()}
+
+        if user_pk is not None:
+            scope.append("device.user_id = %(user)s")
+            params["user"] = user_pk
+
+        if device_pks is not None:
+            scope.append("device.id = ANY(%(devices)s)")
+            params["devices"] = list(device_pks)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH devices AS (
+                    UPDATE {device} device
+                    SET is_synced = {is_synced}, updated_at = %(now)s
+                    WHERE {scope} AND device.wallet_id IS NOT NULL
+                        AND {devices}
+                    RETURNING device.id, device.wallet_id
+                ), locked AS (
+                    SELECT wallet.id, wallet.{moved} AS moved
+                    FROM {wallet} wallet
+                    WHERE wallet.id IN (SELECT wallet_id FROM devices)
+                    FOR UPDATE
+                ), wallets AS (
+                    UPDATE {wallet} wallet
+                    SET {set}, updated_at = %(now)s
+                    FROM locked
+                    WHERE wallet.id = locked.id
+                    RETURNING wallet.id, locked.moved, wallet.synced_amount,
+                              wallet.amount_in_sync_transition,
+                              wallet.unsynced_amount
+                ), movements AS (
+                    INSERT INTO {movement} (
+                        wallet_id, kind, amount, synced_amount,
+                        amount_in_sync_transition, unsynced_amount, created_at
+                    )
+                    SELECT id, %(kind)s, moved, synced_amount,
+                           amount_in_sync_transition, unsynced_amount, %(now)s
+                    FROM wallets
+                    WHERE moved <> 0
+                )
+                SELECT devices.id, wallets.moved, wallets.synced_amount,
+                       wallets.amount_in_sync_transition, wallets.unsynced_amount
+                FROM devices
+                JOIN wallets ON wallets.id = devices.wallet_id
+                """.format(
+                    scope=" AND ".join(scope),
+                    moved=transfer["moved"],
+                    set=transfer["set"],
+                    is_synced=transfer["is_synced"],
+                    devices=transfer["devices"].format(**tables),
+                    **tables
+                ),
+                params
+            )
+
+            return cursor.fetchall()
+
+    def sync(self, user_pk: int = None, device_pks: list = None) -> list:
+        """
+        Sync the unsynced devices of a user (or the given devices): their
+        unsynced amount moves to the synced bucket, and is remembered as
+        the amount in sync transition.
+
+        Returns:
+            list: (device pk, amount moved, synced, in transition,
+            unsynced) per device synced.
+        """
+        return self._transfer("SYNC", user_pk=user_pk, device_pks=device_pks)
+
+    def unsync(self, user_pk: int = None, device_pks: list = None) -> list:
+        """
+        Unsync synced devices: the amount in sync transition moves back
+        from the synced to the unsynced bucket.
+
+        Returns:
+            list: Same as `sync`.
+        """
+        return self._transfer("UNSYNC", user_pk=user_pk, device_pks=device_pks)
+
+    def credit(self, wallet_pk: int, amount: int) -> tuple:
+        """
+        Add `amount` (minor units, negative to debit) to the unsynced
+        bucket of a wallet.
+
+        Returns:
+            tuple: The wallet's (synced, in transition, unsynced) amounts.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH wallets AS (
+                    UPDATE {wallet}
+                    SET unsynced_amount = unsynced_amount + %(amount)s,
+                        updated_at = %(now)s
+                    WHERE id = %(wallet)s
+                    RETURNING id, synced_amount, amount_in_sync_transition,
+                              unsynced_amount
+                ), movements AS (
+                    INSERT INTO {movement} (
+                        wallet_id, kind, amount, synced_amount,
+                        amount_in_sync_transition, unsynced_amount, created_at
+                    )
+                    SELECT id, %(kind)s, %(amount)s, synced_amount,
+                           amount_in_sync_transition, unsynced_amount, %(now)s
+                    FROM wallets
+                )
+                SELECT synced_amount, amount_in_sync_transition, unsynced_amount
+                FROM wallets
+                """.format(**self._tables()),
+                {
+                    "wallet": wallet_pk,
+                    "amount": int(amount),
+                    "kind": "CREDIT" if amount >= 0 else "DEBIT",
+                    "now": timezone.now(),
+                }
+            )
+
+            return cursor.fetchone()
@@ -0,0 +1,527 @@
+from django.conf import settings
+from django.db import models, connection, transaction
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from decimal import Decimal
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+subscription_defaults = app_settings.get("SUBSCRIPTION_DEFAULTS", {})
+commission_settings = app_settings.get("MLM_COMMISSIONS", {})
+
+# Downline export columns, and the `MLMClosure` lookups they come from
+DOWNLINE_COLUMNS = {
+    "member_id": "descendant_id",
+    "parent_id": "parent_id",
+    "level": "depth",
+    "referral_code": "descendant__referral_code",
+    "username": "descendant__user__username",
+    "joined_at": "descendant__user__datetime_joined",
+    "direct_children": "descendant__direct_children_count",
+    "subtree_size": "descendant__subtree_size",
+    "lifetime_earnings": "descendant__lifetime_earnings",
+    "balance": "descendant__balance",
+    "commission_to_root": "commission_to_root",
+}
+
+
+class MLMUserQuerySet(models.QuerySet):
+    def upline_of(self, node, max_depth: int = None) -> models.QuerySet:
+        """
+        Ancestors of `node`, nearest first, annotated with their
+        `distance` (1 for the direct parent).
+        """
+
+        lookup = {
+            "descendant_paths__descendant": node,
+            "descendant_paths__depth__gt": 0,
+        }
+
+        if max_depth is not None:
+            lookup["descendant_paths__depth__lte"] = max_depth
+
+        # Filtering before annotating keeps both on the same closure join
+        return self.filter(**lookup).annotate(
+            distance=models.F("descendant_paths__depth")
+        ).order_by("distance")
+
+    def downline_of(self, node, max_depth: int = None) -> models.QuerySet:
+        """
+        Descendants of `node`, level by level, annotated with their
+        `distance` (1 for direct children).
+        """
+
+        lookup = {
+            "ancestor_paths__ancestor": node,
+            "ancestor_paths__depth__gt": 0,
+        }
+
+        if max_depth is not None:
+            lookup["ancestor_paths__depth__lte"] = max_depth
+
+        return self.filter(**lookup).annotate(
+            distance=models.F("ancestor_paths__depth")
+        ).order_by("distance", "pk")
+
+    def _counter_expressions(self) -> dict:
+        """
+        The pyramid counters of `MLMUser`, computed from the closure, the
+        relationships and the settled ledger.
+        """
+
+        get_model = self.model._meta.apps.get_model
+        MLMClosure = get_model("accounts", "MLMClosure")
+        MLMRelationship = get_model("accounts", "MLMRelationship")
+        MLMCommissionEntry = get_model("accounts", "MLMCommissionEntry")
+
+        def per_node(queryset, field: str, aggregate, output_field):
+            return Coalesce(
+                models.Subquery(
+                    queryset.filter(**{field: models.OuterRef("pk")}).values(
+                        field
+                    ).annotate(value=aggregate).values("value")
+                ),
+                models.Value(0),
+                output_field=output_field
+            )
+
+        return {
+            "direct_children_count": per_node(
+                MLMRelationship.objects.all(), "parent",
+                models.Count("pk"), models.PositiveIntegerField()
+            ),
+            "subtree_size": per_node(
+                MLMClosure.objects.filter(depth__gt=0), "ancestor",
+                models.Count("pk"), models.PositiveIntegerField()
+            ),
+            "subtree_depth": per_node(
+                MLMClosure.objects.all(), "ancestor",
+                models.Max("depth"), models.PositiveIntegerField()
+            ),
+            "lifetime_earnings": per_node(
+                MLMCommissionEntry.objects.filter(settlement__isnull=False),
+                "beneficiary", models.Sum("amount"),
+                self.model._meta.get_field("lifetime_earnings")
+            ),
+        }
+
+    def with_counter_drift(self) -> models.QuerySet:
+        """
+        Annotate each member with the recomputed value of every counter,
+        as `expected_<counter>`, keeping only the members with drift.
+        """
+
+        expressions = self._counter_expressions()
+
+        drift = models.Q()
+        for counter in expressions:
+            drift |= ~models.Q(**{counter: models.F(f"expected_{counter}")})
+
+        return self.annotate(
+            **{
+                f"expected_{counter}": expression
+                for counter, expression in expressions.items()
+            }
+        ).filter(drift)
+
+    def recompute_counters(self) -> int:
+        """Reset the counters from scratch, in one UPDATE."""
+        return self.update(**self._counter_expressions())
+
+    def count_new_subtree(self, parent_pk: int, child) -> int:
+        """
+        Add the subtree rooted at `child` (just linked under `parent_pk`)
+        to the counters of every member above it.
+        """
+
+        MLMClosure = self.model._meta.apps.get_model("accounts", "MLMClosure")
+
+        self.filter(pk=parent_pk).update(
+            direct_children_count=models.F("direct_children_count") + 1
+        )
+
+        return self.filter(
+            descendant_paths__descendant=child.pk,
+            descendant_paths__depth__gt=0
+        ).update(
+            subtree_size=models.F("subtree_size") + child.subtree_size + 1,
+            subtree_depth=Greatest(
+                models.F("subtree_depth"),
+                models.Subquery(
+                    MLMClosure.objects.filter(
+                        ancestor=models.OuterRef("pk"), descendant=child.pk
+                    ).values("depth")[:1]
+                ) + child.subtree_depth
+            )
+        )
+
+    def uncount_subtree(self, parent_pk: int, child, upline_pks: list) -> int:
+        """
+        Remove the subtree rooted at `child` (just unlinked from
+        `parent_pk`) from the counters of `upline_pks`, its former
+        ancestors.
+        """
+
+        MLMClosure = self.model._meta.apps.get_model("accounts", "MLMClosure")
+
+        self.filter(pk=parent_pk).update(
+            direct_children_count=models.F("direct_children_count") - 1
+        )
+
+        return self.filter(pk__in=upline_pks).update(
+            subtree_size=models.F("subtree_size") - child.subtree_size - 1,
+            # The deepest branch may have been removed, depths are
+            # recomputed (from the closure index) rather than decremented
+            subtree_depth=Coalesce(
+                models.Subquery(
+                    MLMClosure.objects.filter(
+                        ancestor=models.OuterRef("pk")
+                    ).values("ancestor").annotate(
+                        depth=models.Max("depth")
+                    ).values("depth")
+                ),
+                models.Value(0),
+                output_field=models.PositiveIntegerField()
+            )
+        )
+
+
+class MLMClosureManager(models.Manager):
+    """
+    Maintains the closure of `MLMRelationship`: one row per
+    (ancestor, descendant) pair, including a depth 0 row per node.
+
+    Rows are written with set-based statements, so attaching a node (or
+    a whole subtree) costs one INSERT whatever the depth of the pyramid.
+    """
+
+    def _tables(self) -> dict:
+        get_model = self.model._meta.apps.get_model
+
+        return {
+            "closure": self.model._meta.db_table,
+            "relationship": get_model("accounts", "MLMRelationship")._meta.db_table,
+            "node": get_model("accounts", "MLMUser")._meta.db_table,
+        }
+
+    def add_nodes(self, node_pks: list) -> int:
+        """Add the depth 0 rows of newly created `MLMUser`s."""
+
+        rows = self.bulk_create(
+            [
+                self.model(ancestor_id=pk, descendant_id=pk, depth=0)
+                for pk in node_pks
+            ],
+            batch_size=1000, ignore_conflicts=True
+        )
+
+        return len(rows)
+
+    def is_ancestor(self, ancestor_pk: int, descendant_pk: int) -> bool:
+        return self.filter(
+            ancestor_id=ancestor_pk, descendant_id=descendant_pk
+        ).exists()
+
+    def link(self, parent_pk: int, child_pk: int) -> int:
+        """
+        Attach the subtree rooted at `child_pk` under `parent_pk`: every
+        ancestor of the parent becomes an ancestor of every node of the
+        child's subtree.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO {closure} (ancestor_id, descendant_id, depth)
+                SELECT upline.ancestor_id, subtree.descendant_id,
+                       upline.depth + subtree.depth + 1
+                FROM {closure} upline
+                CROSS JOIN {closure} subtree
+                WHERE upline.descendant_id = %s AND subtree.ancestor_id = %s
+                ON CONFLICT (ancestor_id, descendant_id) DO NOTHING
+                """.format(**self._tables()),
+                [parent_pk, child_pk]
+            )
+
+            return cursor.rowcount
+
+    def unlink(self, child_pk: int) -> int:
+        """
+        Detach the subtree rooted at `child_pk` from all its ancestors,
+        the paths inside the subtree are kept.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                DELETE FROM {closure}
+                WHERE descendant_id IN (
+                    SELECT descendant_id FROM {closure} WHERE ancestor_id = %s
+                )
+                AND ancestor_id IN (
+                    SELECT ancestor_id FROM {closure}
+                    WHERE descendant_id = %s AND depth > 0
+                )
+                """.format(**self._tables()),
+                [child_pk, child_pk]
+            )
+
+            return cursor.rowcount
+
+    def downline_rows(self, root_pk: int, after: tuple = None,
+                      max_depth: int = None) -> models.QuerySet:
+        """
+        The downline of `root_pk` as export rows (tuples ordered as
+        `DOWNLINE_COLUMNS`), level by level, in a stable
+        (level, member_id) order.
+
+        Args:
+            after: Resume after this (level, member_id) keyset cursor.
+            max_depth: Stop after this many levels.
+        """
+
+        get_model = self.model._meta.apps.get_model
+        MLMRelationship = get_model("accounts", "MLMRelationship")
+        MLMCommissionEntry = get_model("accounts", "MLMCommissionEntry")
+
+        rows = self.filter(ancestor_id=root_pk, depth__gt=0)
+
+        if max_depth is not None:
+            rows = rows.filter(depth__lte=max_depth)
+
+        if after is not None:
+            level, member_id = after
+            rows = rows.filter(
+                models.Q(depth__gt=level)
+                | models.Q(depth=level, descendant_id__gt=member_id)
+            )
+
+        return rows.annotate(
+            parent_id=models.Subquery(
+                MLMRelationship.objects.filter(
+                    child=models.OuterRef("descendant_id")
+                ).values("parent_id")[:1]
+            ),
+            # Commissions the member generated for the root, settled or not
+            commission_to_root=Coalesce(
+                models.Subquery(
+                    MLMCommissionEntry.objects.filter(
+                        beneficiary_id=root_pk,
+                        source=models.OuterRef("descendant_id")
+                    ).values("source").annotate(
+                        total=models.Sum("amount")
+                    ).values("total")
+                ),
+                models.Value(Decimal("0")),
+                output_field=MLMCommissionEntry._meta.get_field("amount")
+            ),
+        ).order_by(
+            "depth", "descendant_id"
+        ).values_list(*DOWNLINE_COLUMNS.values())
+
+    def rebuild(self) -> int:
+        """
+        Recompute the whole closure from `MLMRelationship` with a
+        recursive CTE, e.g. after relationships were bulk written.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute("DELETE FROM {closure}".format(**self._tables()))
+            cursor.execute(
+                """
+                WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+                    SELECT id, id, 0 FROM {node}
+                    UNION ALL
+                    SELECT paths.ancestor_id, relationship.child_id,
+                           paths.depth + 1
+                    FROM paths
+                    JOIN {relationship} relationship
+                        ON relationship.parent_id = paths.descendant_id
+                )
+                INSERT INTO {closure} (ancestor_id, descendant_id, depth)
+                SELECT ancestor_id, descendant_id, MIN(depth)
+                FROM paths
+                GROUP BY ancestor_id, descendant_id
+                """.format(**self._tables())
+            )
+
+            return cursor.rowcount
+
+
+class MLMCommissionEntryManager(models.Manager):
+    """
+    Writes the commission ledger.
+
+    An event (a recruit or a sale) credits the source's whole upline
+    with one INSERT ... SELECT over `MLMClosure`. Member balances are
+    untouched, so busy uplines don't contend on their rows; they are
+    rolled up later by `MLMCommissionSettlement.objects.settle`.
+    """
+
+    def _tables(self) -> dict:
+        get_model = self.model._meta.apps.get_model
+
+        return {
+            "entry": self.model._meta.db_table,
+            "closure": get_model("accounts", "MLMClosure")._meta.db_table,
+            "node": get_model("accounts", "MLMUser")._meta.db_table,
+            "user_plan": get_model(
+                "accounts", "UserSubscriptionPlan")._meta.db_table,
+            "plan": get_model("accounts", "SubscriptionPlan")._meta.db_table,
+            "feature": get_model("accounts", "DefaultFeature")._meta.db_table,
+        }
+
+    def record(self, source_pk: int, event: str, reference: str,
+               amount: Decimal, min_depth: int = 1) -> int:
+        """
+        Credit the upline of `source_pk` (and the source itself when
+        `min_depth` is 0) for an event worth `amount`.
+
+        A member `n` levels above the first credited one earns
+        `amount * rate ** (n + 1)`, `rate` being the invite commission
+        of their own plan. The chain stops at `MAX_DEPTH` levels or once
+        commissions fall under `MINIMUM_AMOUNT`. Recording the same
+        event (`event`, `reference`) twice credits nobody twice.
+
+        Returns:
+            int: Number of ledger entries written.
+        """
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO {entry} (
+                    beneficiary_id, source_id, event, reference,
+                    depth, amount, created_at, settlement_id
+                )
+                SELECT beneficiary_id, %(source)s, %(event)s, %(reference)s,
+                       depth, amount, %(now)s, NULL
+                FROM (
+                    SELECT closure.ancestor_id AS beneficiary_id,
+                           closure.depth,
+                           ROUND(
+                               %(amount)s * POWER(
+                                   COALESCE(
+                                       feature.invite_commission, %(rate)s
+                                   ) / 100,
+                                   closure.depth - %(min_depth)s + 1
+                               ),
+                               {places}
+                           ) AS amount
+                    FROM {closure} closure
+                    JOIN {node} node ON node.id = closure.ancestor_id
+                    LEFT JOIN {user_plan} user_plan
+                        ON user_plan.user_id = node.user_id
+                        AND user_plan.is_active
+                    LEFT JOIN {plan} plan
+                        ON plan.id = user_plan.subscription_plan_id
+                    LEFT JOIN {feature} feature
+                        ON feature.id = plan.default_feature_id
+                    WHERE closure.descendant_id = %(source)s
+                        AND closure.depth >= %(min_depth)s
+                        AND closure.depth < %(min_depth)s + %(max_depth)s
+                ) chain
+                WHERE amount >= %(minimum)s
+                ON CONFLICT (event, reference, beneficiary_id) DO NOTHING
+                """.format(
+                    places=self.model._meta.get_field("amount").decimal_places,
+                    **self._tables()
+                ),
+                {
+                    "source": source_pk,
+                    "event": event,
+                    "reference": str(reference),
+                    "now": timezone.now(),
+                    "amount": Decimal(amount),
+                    "rate": Decimal(
+                        subscription_defaults.get("INVITE_COMMISSION", 10)
+                    ),
+                    "min_depth": min_depth,
+                    "max_depth": commission_settings.get("MAX_DEPTH", 20),
+                    "minimum": Decimal(
+                        str(commission_settings.get("MINIMUM_AMOUNT", "0.01"))
+                    ),
+                }
+            )
+
+            return cursor.rowcount
+
+    def record_recruit(self, recruit_pk: int, reference: str,
+                       amount: Decimal) -> int:
+        """Credit the recruiters above a new member for its subscription."""
+        return self.record(
+            recruit_pk, self.model.Event.RECRUIT, reference, amount, min_depth=1
+        )
+
+    def record_sale(self, seller_pk: int, reference: str,
+                    amount: Decimal) -> int:
+        """Credit a seller and their upline for a sale."""
+        return self.record(
+            seller_pk, self.model.Event.SALE, reference, amount, min_depth=0
+        )
+
+
+class MLMCommissionSettlementManager(models.Manager):
+    def settle(self, until=None):
+        """
+        Roll every unsettled ledger entry created up to `until` (now by
+        default) into its beneficiary's `balance`, as one settlement.
+
+        Entries are claimed with a single UPDATE, so concurrent runs
+        never settle an entry twice. Sums are computed by the database on
+        the ledger's exact decimals.
+
+        Returns:
+            MLMCommissionSettlement: The settlement, or None if there was
+            nothing to settle.
+        """
+
+        get_model = self.model._meta.apps.get_model
+        Entry = get_model("accounts", "MLMCommissionEntry")
+        MLMUser = get_model("accounts", "MLMUser")
+
+        until = until or timezone.now()
+
+        with transaction.atomic():
+            settlement = self.create(period_end=until)
+
+            claimed = Entry.objects.filter(
+                settlement__isnull=True, created_at__lte=until
+            ).update(settlement=settlement)
+
+            if not claimed:
+                transaction.set_rollback(True)
+                return None
+
+            entries = Entry.objects.filter(settlement=settlement)
+
+            earned = models.Subquery(
+                entries.filter(
+                    beneficiary=models.OuterRef("pk")
+                ).values("beneficiary").annotate(
+                    total=models.Sum("amount")
+                ).values("total")
+            )
+
+            MLMUser.objects.filter(
+                pk__in=entries.values("beneficiary")
+            ).update(
+                balance=models.F("balance") + earned,
+                lifetime_earnings=models.F("lifetime_earnings") + earned
+            )
+
+            totals = entries.aggregate(
+                entries_count=models.Count("pk"),
+                beneficiaries_count=models.Count("beneficiary", distinct=True),
+                total_amount=models.Sum("amount"),
+            )
+
+            for field, value in totals.items():
+                setattr(settlement, field, value)
+
+            settlement.save(update_fields=list(totals))
+
+        return settlement
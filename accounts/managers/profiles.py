@@ -106,20 +106,19 @@ class UserProfileManager(models.Manager):
     def get_active_profile(self, query_id: str = None,
                            auto: bool = True, *args, **kwargs) -> models.Model:
 
-        if query_id:
-            query_id = User.get_user(query_id=query_id).query_id
+        user_instance = User.get_user(query_id=query_id) if query_id else None
 
         if not auto:
-            if query_id:
-                return self.get(auto=False, user__query_id=query_id,
+            if user_instance:
+                return self.get(auto=False, user=user_instance,
                                 *args, **kwargs, user__is_active=True)
             else:
                 return self.get(auto=False, *args,
                                 **kwargs, user__is_active=True)
 
         else:
-            if query_id:
-                return self.get(user__query_id=query_id,
+            if user_instance:
+                return self.get(user=user_instance,
                                 *args, **kwargs, user__is_active=True)
 
             else:
@@ -1,8 +1,18 @@
 from typing import List, Union
+from django.conf import settings
 from django.contrib.auth.models import (UserManager)
+from django.contrib.postgres.search import TrigramSimilarity
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import models
+from django.db.models import Q
+from django.db.models.functions import Cast, Greatest
 
 from utilities import response
+from utilities.models.lookups import ILikeStartsWith
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
 
 # CreateUserManager as Users model managers name is being used because
 # it's parent class already has the name "UserManager".
@@ -139,9 +149,9 @@ class GetUserManager(UserManager):
     ) -> Union[dict, List[dict]]:
         try:
             if isinstance(query_id, str):
-                return self.get(query_id=query_id)
+                return self.get(self.model.query_id_filter(query_id))
             elif isinstance(query_id, list):
-                return self.filter(query_id__in=query_id)
+                return self.filter(self.model.query_id_filter(query_id))
         except Exception as e:
             # setting error messages for user nad developer respectively
             field_message = "Server Error. Contact Customer Support."
@@ -152,6 +162,24 @@ class GetUserManager(UserManager):
                             for_developer=for_developer,
                             code="BAD_REQUEST", status_code=400)
 
+    def joined_after(self, after: tuple = None) -> models.QuerySet:
+        """
+        Users in the order they joined, (datetime_joined, pk), starting
+        after the keyset cursor `after` (of the same form) if given.
+        """
+
+        queryset = self.order_by("datetime_joined", "pk")
+
+        if after is not None:
+            datetime_joined, pk = after
+
+            queryset = queryset.filter(
+                Q(datetime_joined__gt=datetime_joined)
+                | Q(datetime_joined=datetime_joined, pk__gt=pk)
+            )
+
+        return queryset
+
 
 class VerifyUserManager(UserManager):
 
@@ -159,11 +187,7 @@ class VerifyUserManager(UserManager):
         """
         checks if user exists using query id
         """
-        try:
-            self.get(query_id=query_id)
-        except ObjectDoesNotExist:
-            return False
-        return True
+        return self.filter(self.model.query_id_filter(query_id)).exists()
 
     def email_exists(self, email: str) -> bool:
         """
@@ -194,3 +218,85 @@ class VerifyUserManager(UserManager):
         except ObjectDoesNotExist:
             return False
         return True
+
+
+class SearchUserManager(models.Manager):
+    """
+    Search over the users others are allowed to see (visible and
+    unlocked accounts), every match served by a `gin_trgm_ops` index
+    (see `User.Meta` and `UserProfile.Meta`).
+    """
+
+    # Similarities are rounded to a numeric for the keyset: the float
+    # they are computed as doesn't survive the trip to the cursor and
+    # back, missing (or repeating) tied users
+    SIMILARITY = models.DecimalField(max_digits=7, decimal_places=6)
+
+    def get_limit(self, limit: int = None) -> int:
+        search_settings = app_settings.get("USER_SEARCH", {})
+
+        return min(
+            limit or search_settings.get("LIMIT", 20),
+            search_settings.get("MAX_LIMIT", 50)
+        )
+
+    def searchable(self) -> models.QuerySet:
+        return self.filter(is_account_visible=True, is_account_locked=False)
+
+    def legal_names(self, *conditions, **lookup) -> models.QuerySet:
+        UserProfile = self.model._meta.apps.get_model("accounts", "UserProfile")
+
+        return UserProfile.objects.filter(*conditions, **lookup).values("user_id")
+
+    def rank(self, query: str, after: tuple = None,
+             limit: int = None) -> models.QuerySet:
+        """
+        Users whose username, phone, email or legal name resemble
+        `query`, best matches first, annotated with their `similarity`.
+
+        Pages are keyset paginated: `after` is the (similarity, pk) of
+        the last user of the previous page, similarity as the `Decimal`
+        it was returned as.
+        """
+
+        queryset = self.searchable().filter(
+            Q(username__trigram_similar=query)
+            | Q(email__trigram_similar=query)
+            | Q(phone__contains=query)
+            | Q(pk__in=self.legal_names(legal_name__trigram_similar=query))
+        ).annotate(
+            similarity=Cast(
+                Greatest(
+                    TrigramSimilarity("username", query),
+                    TrigramSimilarity("phone", query),
+                    TrigramSimilarity("email", query),
+                    TrigramSimilarity("userprofile__legal_name", query),
+                ),
+                output_field=self.SIMILARITY
+            )
+        )
+
+        if after is not None:
+            similarity, pk = after
+
+            queryset = queryset.filter(
+                Q(similarity__lt=similarity)
+                | Q(similarity=similarity, pk__gt=pk)
+            )
+
+        return queryset.order_by("-similarity", "pk")[:self.get_limit(limit)]
+
+    def autocomplete(self, prefix: str, limit: int = None) -> models.QuerySet:
+        """
+        Users whose username or legal name starts with `prefix` (case
+        insensitive, through `ILIKE` so the trigram indexes serve it).
+        """
+
+        prefix = prefix.lstrip("@")
+
+        return self.searchable().filter(
+            Q(ILikeStartsWith(models.F("username"), f"@{prefix}"))
+            | Q(pk__in=self.legal_names(
+                ILikeStartsWith(models.F("legal_name"), prefix)
+            ))
+        ).order_by("username")[:self.get_limit(limit)]
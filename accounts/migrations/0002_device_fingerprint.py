@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-19 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="device",
+            name="fingerprint",
+            field=models.BinaryField(blank=True, max_length=256, null=True),
+        ),
+    ]
@@ -0,0 +1,63 @@
+# Generated by Django 5.1.1 on 2026-10-19 11:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0002_device_fingerprint"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlanPriceSnapshot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "currency_code",
+                    models.CharField(max_length=3, verbose_name="Currency Code"),
+                ),
+                (
+                    "amount",
+                    models.DecimalField(
+                        decimal_places=2,
+                        help_text="Plan price in `currency_code`, rounded to cents .",
+                        max_digits=18,
+                        verbose_name="Amount",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "plan",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="price_snapshots",
+                        to="accounts.subscriptionplan",
+                        verbose_name="Subscription Plan",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Plan Price Snapshot",
+                "verbose_name_plural": "Plan Price Snapshots",
+                "db_table": "accounts__plan_price_snapshot",
+                "db_table_comment": "Materialized price of each active subscription plan in each supported currency. Rebuilt for the affected plans when a plan feature is saved, and for every plan when exchange rates are refreshed, so plan endpoints read prices without computing them.",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("plan", "currency_code"),
+                        name="plan_price_snapshot__unique_currency_per_plan",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,89 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:05
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def build_closure(apps, schema_editor):
+    MLMClosure = apps.get_model("accounts", "MLMClosure")
+    MLMRelationship = apps.get_model("accounts", "MLMRelationship")
+    MLMUser = apps.get_model("accounts", "MLMUser")
+
+    schema_editor.execute(
+        """
+        WITH RECURSIVE paths (ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM {node}
+            UNION ALL
+            SELECT paths.ancestor_id, relationship.child_id, paths.depth + 1
+            FROM paths
+            JOIN {relationship} relationship
+                ON relationship.parent_id = paths.descendant_id
+        )
+        INSERT INTO {closure} (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, MIN(depth)
+        FROM paths
+        GROUP BY ancestor_id, descendant_id
+        """.format(
+            closure=MLMClosure._meta.db_table,
+            relationship=MLMRelationship._meta.db_table,
+            node=MLMUser._meta.db_table,
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_plan_price_snapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MLMClosure",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("depth", models.PositiveIntegerField()),
+                (
+                    "ancestor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="descendant_paths",
+                        to="accounts.mlmuser",
+                    ),
+                ),
+                (
+                    "descendant",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ancestor_paths",
+                        to="accounts.mlmuser",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["descendant", "depth"], name="mlm_closure__upline"
+                    ),
+                    models.Index(
+                        fields=["ancestor", "depth"], name="mlm_closure__downline"
+                    ),
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ancestor", "descendant"),
+                        name="mlm_closure__unique_path",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(build_closure, migrations.RunPython.noop),
+    ]
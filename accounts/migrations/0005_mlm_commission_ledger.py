@@ -0,0 +1,120 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:40
+
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0004_mlm_closure"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mlmuser",
+            name="balance",
+            field=models.DecimalField(
+                decimal_places=6, default=Decimal("0.00"), max_digits=18
+            ),
+        ),
+        migrations.CreateModel(
+            name="MLMCommissionSettlement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "period_end",
+                    models.DateTimeField(
+                        help_text="Entries created up to this date are settled ."
+                    ),
+                ),
+                ("entries_count", models.PositiveIntegerField(default=0)),
+                ("beneficiaries_count", models.PositiveIntegerField(default=0)),
+                (
+                    "total_amount",
+                    models.DecimalField(
+                        decimal_places=6, default=Decimal("0.00"), max_digits=20
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "ordering": ["-period_end"],
+            },
+        ),
+        migrations.CreateModel(
+            name="MLMCommissionEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "event",
+                    models.CharField(
+                        choices=[("RECRUIT", "recruit"), ("SALE", "sale")],
+                        max_length=10,
+                    ),
+                ),
+                ("reference", models.CharField(max_length=64)),
+                ("depth", models.PositiveIntegerField()),
+                ("amount", models.DecimalField(decimal_places=6, max_digits=18)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "beneficiary",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="commission_entries",
+                        to="accounts.mlmuser",
+                    ),
+                ),
+                (
+                    "source",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="generated_commissions",
+                        to="accounts.mlmuser",
+                    ),
+                ),
+                (
+                    "settlement",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.PROTECT,
+                        related_name="entries",
+                        to="accounts.mlmcommissionsettlement",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("settlement__isnull", True)),
+                        fields=["created_at"],
+                        name="mlm_commission__unsettled",
+                    )
+                ],
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("event", "reference", "beneficiary"),
+                        name="mlm_commission__unique_event_beneficiary",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:15
+
+from decimal import Decimal
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def count_pyramids(apps, schema_editor):
+    MLMUser = apps.get_model("accounts", "MLMUser")
+    MLMClosure = apps.get_model("accounts", "MLMClosure")
+    MLMRelationship = apps.get_model("accounts", "MLMRelationship")
+    MLMCommissionEntry = apps.get_model("accounts", "MLMCommissionEntry")
+
+    def per_node(queryset, field, aggregate, output_field):
+        return Coalesce(
+            models.Subquery(
+                queryset.filter(**{field: models.OuterRef("pk")})
+                .values(field)
+                .annotate(value=aggregate)
+                .values("value")
+            ),
+            models.Value(0),
+            output_field=output_field,
+        )
+
+    MLMUser.objects.update(
+        direct_children_count=per_node(
+            MLMRelationship.objects.all(),
+            "parent",
+            models.Count("pk"),
+            models.PositiveIntegerField(),
+        ),
+        subtree_size=per_node(
+            MLMClosure.objects.filter(depth__gt=0),
+            "ancestor",
+            models.Count("pk"),
+            models.PositiveIntegerField(),
+        ),
+        subtree_depth=per_node(
+            MLMClosure.objects.all(),
+            "ancestor",
+            models.Max("depth"),
+            models.PositiveIntegerField(),
+        ),
+        lifetime_earnings=per_node(
+            MLMCommissionEntry.objects.filter(settlement__isnull=False),
+            "beneficiary",
+            models.Sum("amount"),
+            models.DecimalField(max_digits=20, decimal_places=6),
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0005_mlm_commission_ledger"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="mlmuser",
+            name="direct_children_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mlmuser",
+            name="subtree_size",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mlmuser",
+            name="subtree_depth",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="mlmuser",
+            name="lifetime_earnings",
+            field=models.DecimalField(
+                decimal_places=6, default=Decimal("0.00"), max_digits=20
+            ),
+        ),
+        migrations.RunPython(count_pyramids, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:50
+
+from django.db import migrations
+
+
+# Sequences behind `utilities.generators.codes` (referral codes and
+# generated usernames)
+SEQUENCES = ["unique_code__referral_code", "unique_code__username"]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0006_mlmuser_counters"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[f"CREATE SEQUENCE IF NOT EXISTS {name}" for name in SEQUENCES],
+            reverse_sql=[f"DROP SEQUENCE IF EXISTS {name}" for name in SEQUENCES],
+        ),
+    ]
@@ -0,0 +1,120 @@
+# Generated by Django 5.1.1 on 2026-10-19 15:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+AMOUNT_FIELDS = ("synced_amount", "amount_in_sync_transition", "unsynced_amount")
+
+
+def to_minor_units(value) -> int:
+    # Amounts were stored as 8 byte, big endian, signed integers
+    if not value:
+        return 0
+
+    return int.from_bytes(bytes(value), byteorder="big", signed=True)
+
+
+def convert_amounts(apps, schema_editor):
+    DeviceWallet = apps.get_model("accounts", "DeviceWallet")
+
+    wallets = []
+
+    for wallet in DeviceWallet.objects.only(*AMOUNT_FIELDS).iterator(
+        chunk_size=2000
+    ):
+        for field in AMOUNT_FIELDS:
+            setattr(wallet, f"{field}_minor", to_minor_units(getattr(wallet, field)))
+
+        wallets.append(wallet)
+
+        if len(wallets) == 2000:
+            DeviceWallet.objects.bulk_update(
+                wallets, [f"{field}_minor" for field in AMOUNT_FIELDS]
+            )
+            wallets = []
+
+    DeviceWallet.objects.bulk_update(
+        wallets, [f"{field}_minor" for field in AMOUNT_FIELDS]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0007_unique_code_sequences"),
+    ]
+
+    operations = [
+        *[
+            migrations.AddField(
+                model_name="devicewallet",
+                name=f"{field}_minor",
+                field=models.BigIntegerField(default=0),
+            )
+            for field in AMOUNT_FIELDS
+        ],
+        migrations.RunPython(convert_amounts, migrations.RunPython.noop),
+        *[
+            migrations.RemoveField(
+                model_name="devicewallet",
+                name=field,
+            )
+            for field in AMOUNT_FIELDS
+        ],
+        *[
+            migrations.RenameField(
+                model_name="devicewallet",
+                old_name=f"{field}_minor",
+                new_name=field,
+            )
+            for field in AMOUNT_FIELDS
+        ],
+        migrations.CreateModel(
+            name="WalletMovement",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "kind",
+                    models.CharField(
+                        choices=[
+                            ("CREDIT", "Credit"),
+                            ("DEBIT", "Debit"),
+                            ("SYNC", "Sync"),
+                            ("UNSYNC", "Unsync"),
+                        ],
+                        max_length=6,
+                    ),
+                ),
+                ("amount", models.BigIntegerField()),
+                ("synced_amount", models.BigIntegerField()),
+                ("amount_in_sync_transition", models.BigIntegerField()),
+                ("unsynced_amount", models.BigIntegerField()),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "wallet",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="movements",
+                        to="accounts.devicewallet",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["wallet", "created_at"],
+                        name="wallet_movement__history",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0008_devicewallet_minor_units"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="user",
+            name="query_id",
+            field=models.BinaryField(
+                blank=True, db_index=True, max_length=10000, null=True
+            ),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:30
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0009_user_query_id_legacy"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        *[
+            migrations.AddIndex(
+                model_name="user",
+                index=django.contrib.postgres.indexes.GinIndex(
+                    fields=[field],
+                    name=f"user__{field}_trgm",
+                    opclasses=["gin_trgm_ops"],
+                ),
+            )
+            for field in ("username", "phone", "email")
+        ],
+        migrations.AddIndex(
+            model_name="userprofile",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["legal_name"],
+                name="user_profile__legal_name_trgm",
+                opclasses=["gin_trgm_ops"],
+            ),
+        ),
+    ]
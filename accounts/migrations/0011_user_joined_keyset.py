@@ -0,0 +1,19 @@
+# Generated by Django 5.1.1 on 2026-10-19 17:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0010_user_search_trigram"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["datetime_joined", "id"], name="user__joined_keyset"
+            ),
+        ),
+    ]
@@ -4,11 +4,13 @@ from accounts.models.plans import (  # noqa: F401
     DefaultFeature, AIConflictResolutionAssistantFeature,  # noqa: F401
     TeamGoalFeature, AIMarketingAssistantFeature,  # noqa: F401
     MultiLevelMarketingFeature, BusinessFeature,  # noqa: F401
-    SubscriptionPlan, UserSubscriptionPlan  # noqa: F401
+    SubscriptionPlan, PlanPriceSnapshot, UserSubscriptionPlan  # noqa: F401
 )
 
 from accounts.models.mlm_user import (  # noqa: F401
-    MLMUser, MLMRelationship, MLMConfig, MLMUserConfig, MLMAchievement  # noqa: F401
+    MLMUser, MLMRelationship, MLMClosure, MLMConfig,  # noqa: F401
+    MLMCommissionEntry, MLMCommissionSettlement,  # noqa: F401
+    MLMUserConfig, MLMAchievement  # noqa: F401
 )
 
 from accounts.models.account import (  # noqa: F401
@@ -19,5 +21,5 @@ from accounts.models.account import (  # noqa: F401
 
 from accounts.models.devices import (  # noqa: F401
     DeviceLoginHistory, DeviceTokenBlacklist,  # noqa: F401
-    DeviceToken, DeviceWallet, Device  # noqa: F401
+    DeviceToken, DeviceWallet, WalletMovement, Device  # noqa: F401
 )
@@ -2,9 +2,13 @@ from django.db import models
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from decimal import Decimal, ROUND_HALF_UP
+
 from accounts.models.users import User
+from accounts.managers.devices import DeviceWalletManager
 
 from utilities.generators.device import DeviceSignature
+from utilities.analysis.device_fingerprint import DeviceFingerprint
 
 
 class DeviceTokenBlacklist(models.Model):
@@ -49,13 +53,71 @@ class DeviceToken(models.Model):
 
 
 class DeviceWallet(models.Model):
-    synced_amount = models.BinaryField()
-    amount_in_sync_transition = models.BinaryField()
-    unsynced_amount = models.BinaryField()
+    # Amounts are in minor units (cents), moved only through
+    # `DeviceWallet.objects` so every change is atomic and logged
+    synced_amount = models.BigIntegerField(default=0)
+    amount_in_sync_transition = models.BigIntegerField(default=0)
+    unsynced_amount = models.BigIntegerField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    MINOR_UNITS = 100
+
+    objects = DeviceWalletManager()
+
+    @classmethod
+    def to_minor_units(cls, amount: Decimal) -> int:
+        return int(
+            (Decimal(amount) * cls.MINOR_UNITS).to_integral_value(ROUND_HALF_UP)
+        )
+
+    @classmethod
+    def from_minor_units(cls, amount: int) -> Decimal:
+        return Decimal(amount) / cls.MINOR_UNITS
+
+    def credit(self, amount: Decimal):
+        (
+            self.synced_amount, self.amount_in_sync_transition,
+            self.unsynced_amount
+        ) = DeviceWallet.objects.credit(self.pk, self.to_minor_units(amount))
+
+
+class WalletMovement(models.Model):
+    """
+    Append-only log of the changes made to device wallets, with the
+    wallet's amounts right after each of them.
+    """
+
+    class Kind(models.TextChoices):
+        CREDIT = "CREDIT", _("Credit")
+        DEBIT = "DEBIT", _("Debit")
+        SYNC = "SYNC", _("Sync")
+        UNSYNC = "UNSYNC", _("Unsync")
+
+    wallet = models.ForeignKey(
+        DeviceWallet, on_delete=models.CASCADE, related_name="movements")
+
+    kind = models.CharField(max_length=6, choices=Kind.choices)
+
+    # Minor units, moved between buckets (`SYNC`/`UNSYNC`) or
+    # added to the unsynced bucket (`CREDIT`/`DEBIT`)
+    amount = models.BigIntegerField()
+
+    synced_amount = models.BigIntegerField()
+    amount_in_sync_transition = models.BigIntegerField()
+    unsynced_amount = models.BigIntegerField()
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["wallet", "created_at"],
+                name="wallet_movement__history"
+            ),
+        ]
+
 
 class Device(models.Model):
 
@@ -83,6 +145,11 @@ class Device(models.Model):
 
     device_signature = models.BinaryField(
         null=False, blank=False, max_length=10000)
+
+    # MinHash signature of the user agent, OS, client and device type.
+    # See `utilities.analysis.device_fingerprint.DeviceFingerprint`
+    fingerprint = models.BinaryField(null=True, blank=True, max_length=256)
+
     is_synced = models.BooleanField(default=True)
 
     # This records the percentage trust the system has for this device
@@ -106,27 +173,83 @@ class Device(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
-    def sync_and_unsync_device(self):
+    FINGERPRINT_FIELDS = frozenset(
+        ("user_agent", "device_type", "client_type", "operating_system")
+    )
 
-        if self.is_synced:
-            amount_in_sync_transition = self.wallet.amount_in_sync_transition
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._fingerprint_source = instance.get_fingerprint_source()
+
+        return instance
+
+    def get_fingerprint_source(self):
+        if self.FINGERPRINT_FIELDS & self.get_deferred_fields():
+            return None
+
+        return tuple(getattr(self, field) for field in sorted(self.FINGERPRINT_FIELDS))
+
+    def refresh_fingerprint(self, force: bool = False) -> bool:
+        """
+        Recompute the fingerprint if the device has none yet or one of
+        its identifying fields changed since it was loaded.
+
+        Returns:
+            bool: Whether the fingerprint was recomputed.
+        """
+
+        source = self.get_fingerprint_source()
+
+        if (
+            not force
+            and self.fingerprint
+            and source == getattr(self, "_fingerprint_source", None)
+        ):
+            return False
 
-            if amount_in_sync_transition != 0:
-                self.wallet.synced_amount -= amount_in_sync_transition
+        self.fingerprint = DeviceFingerprint.from_device(self).to_database()
+        self._fingerprint_source = source
 
-                self.wallet.save()
-                self.is_synced = False
-                self.save()
+        return True
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        if (
+            update_fields is None
+            or self.FINGERPRINT_FIELDS.intersection(update_fields)
+        ):
+            if self.refresh_fingerprint() and update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "fingerprint"}
+
+        super().save(*args, **kwargs)
+
+    def sync_and_unsync_device(self):
+        # One statement updates the device, its wallet and the wallet log
+        if self.is_synced:
+            changed = DeviceWallet.objects.unsync(device_pks=[self.pk])
         else:
-            self.wallet.synced_amount += self.wallet.unsynced_amount
-            self.wallet.amount_in_sync_transition = self.wallet.unsynced_amount
-            self.wallet.unsynced_amount = 0
+            changed = DeviceWallet.objects.sync(device_pks=[self.pk])
+
+        if not changed:
+            return False
+
+        _, _, synced, in_transition, unsynced = changed[0]
+
+        self.is_synced = not self.is_synced
+
+        if Device.wallet.is_cached(self):
+            self.wallet.synced_amount = synced
+            self.wallet.amount_in_sync_transition = in_transition
+            self.wallet.unsynced_amount = unsynced
 
-            self.wallet.save()
+        return True
 
-            self.is_synced = True
-            self.save()
+    @classmethod
+    def sync_user_devices(cls, user) -> list:
+        """Sync every unsynced device of `user` in one statement."""
+        return DeviceWallet.objects.sync(user_pk=user.pk)
 
     def assign_device_signature(self, data, length):
 
@@ -27,14 +27,24 @@ MLM User = MultiLevel Marketing User
 
 """
 
-from django.db import models
-from decimal import Decimal, ROUND_DOWN
-from django.db.models import Sum, F
-
-import secrets
-import string
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from decimal import Decimal
 
 from accounts.models.users import User
+from utilities.generators.codes import referral_codes
+from accounts.models.plans import UserSubscriptionPlan
+from accounts.managers.mlm import (
+    MLMUserQuerySet, MLMClosureManager,
+    MLMCommissionEntryManager, MLMCommissionSettlementManager
+)
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+subscription_defaults = app_settings.get("SUBSCRIPTION_DEFAULTS", {})
 
 
 class MLMUser(models.Model):
@@ -49,19 +59,39 @@ class MLMUser(models.Model):
     # Money generated as a multi level marketing user
     amount_generated = models.BinaryField()
 
+    # Settled commissions, rolled up from `MLMCommissionEntry`
+    balance = models.DecimalField(
+        max_digits=18, decimal_places=6, default=Decimal('0.00'))
+
+    # Pyramid counters, kept up to date when members are linked or
+    # unlinked (`verify_mlm_counters` recomputes them)
+    direct_children_count = models.PositiveIntegerField(default=0)
+    subtree_size = models.PositiveIntegerField(default=0)
+    subtree_depth = models.PositiveIntegerField(default=0)
+
+    # Every settled commission, payouts don't lower it
+    lifetime_earnings = models.DecimalField(
+        max_digits=20, decimal_places=6, default=Decimal('0.00'))
+
     # ManyToMany relationship for child users
     children = models.ManyToManyField('self', through='MLMRelationship',
                                       symmetrical=False, related_name='parents')
 
+    objects = MLMUserQuerySet.as_manager()
+
     def __str__(self):
         return self.user.username
 
     def calculate_recruiter_commission(self, amount: Decimal = Decimal('0.00'),
                                        recruiter: User = None) -> Decimal:
 
-        # Calculate the commission for the recruiter
-        plan = recruiter.subscription_plan
-        commission_percentage = plan.new_user_commission_percentage
+        # Calculate the commission for the recruiter, from the invite
+        # commission of their plan (as `MLMCommissionEntry.objects.record`)
+        commission_percentage = UserSubscriptionPlan.objects.filter(
+            user=recruiter, is_active=True
+        ).values_list(
+            'subscription_plan__default_feature__invite_commission', flat=True
+        ).first() or Decimal(subscription_defaults.get('INVITE_COMMISSION', 10))
 
         commission = Decimal((amount / 100) * commission_percentage)
 
@@ -71,71 +101,58 @@ class MLMUser(models.Model):
         # Method to add a new recruit efficiently
         # Set the new user's level to zero
         new_mlm_user = MLMUser(user=new_user, level=0)
-        new_mlm_user.save()
 
-        if new_user.subscription_duration == new_user.SubscriptionDuration.MONTHLY:
-            subscription_price = Decimal(new_user.subscription_plan.monthly_price)
+        subscription_price = UserSubscriptionPlan.objects.filter(
+            user=new_user
+        ).values_list('price', flat=True).first() or Decimal('0.00')
 
-        elif new_user.subscription_duration == new_user.SubscriptionDuration.YEARLY:
-            subscription_price = Decimal(new_user.subscription_plan.yearly_price)
+        with transaction.atomic():
+            new_mlm_user.save()
+            relationship = MLMRelationship.objects.create(
+                parent=self, child=new_mlm_user)
 
-        else:
-            subscription_price = Decimal('0.00')
+            # The whole upline is credited in one statement, balances
+            # follow at the next settlement
+            MLMCommissionEntry.objects.record_recruit(
+                new_mlm_user.pk, relationship.pk, subscription_price)
 
-        commission = self.calculate_recruiter_commission(subscription_price, self.user)
-        self.balance += commission
-        self.level += 1
-        # self.balance += commission
+        return new_mlm_user
 
-        # Track the earnings for each user above the new user
-        above_users_mlm = MLMUser.objects.filter(
-            children=new_mlm_user).order_by('level')
+    def upline(self, max_depth: int = None) -> models.QuerySet:
+        """Ancestors in the pyramid, from the direct parent upwards."""
+        return MLMUser.objects.upline_of(self, max_depth=max_depth)
 
-        for above_user_mlm in above_users_mlm:
-            commission = self.calculate_recruiter_commission(
-                commission, above_user_mlm.user)
-
-            above_user_mlm.balance += commission
-            above_user_mlm.level += 1
-
-            # Check if the earning is almost zero (rounded down)
-            if above_user_mlm.balance.quantize(
-                    Decimal('1.00'), rounding=ROUND_DOWN) == Decimal('100.00'):
-                # Stop increasing levels and commissions for users earning close to zero
-                break
-
-        # Bulk update all users' balances and levels
-        above_users_mlm.update(balance=F('balance'), level=F('level'))
-
-        self.save()
+    def downline(self, max_depth: int = None) -> models.QuerySet:
+        """Descendants in the pyramid, level by level."""
+        return MLMUser.objects.downline_of(self, max_depth=max_depth)
 
     @property
     def can_invite(self):
         # Check if the user can invite more children
-        return self.children.count() < 2
+        return self.direct_children_count < subscription_defaults.get(
+            'MAXIMUM_INVITE', 2)
 
     @property
     def calculate_earnings(self):
-        # Method to calculate earnings efficiently
-        total_earnings = MLMUser.objects.filter(parents=self).aggregate(
-            total_earnings=Sum(F('balance') + 10.00, output_field=models.DecimalField())
-        )['total_earnings'] or 0.00
-        return total_earnings
+        # Commissions earned as of the last settlement
+        return self.lifetime_earnings
 
     def generate_unique_referral_code(self):
-        characters = string.ascii_uppercase + string.digits
-        while True:
-            # Use secrets.choice for secure random selection
-            new_code = ''.join(secrets.choice(characters) for _ in range(8))
-            if not MLMUser.objects.filter(referral_code=new_code).exists():
-                return new_code
+        # Unique by construction, no lookup needed
+        return referral_codes.generate()
 
     def save(self, *args, **kwargs):
         # Generate a unique referral code
         if not self.referral_code:
             self.referral_code = self.generate_unique_referral_code()
 
-        super().save(*args, **kwargs)
+        is_new = self._state.adding
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+            if is_new:
+                MLMClosure.objects.add_nodes([self.pk])
 
 
 class MLMRelationship(models.Model):
@@ -149,6 +166,163 @@ class MLMRelationship(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+
+        # A user can't be recruited into their own downline
+        if MLMClosure.objects.is_ancestor(self.child_id, self.parent_id):
+            raise ValidationError(
+                {'error': 'Child is already above parent in the pyramid.'})
+
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            MLMClosure.objects.link(self.parent_id, self.child_id)
+
+            child = MLMUser.objects.only(
+                'subtree_size', 'subtree_depth').get(pk=self.child_id)
+            MLMUser.objects.count_new_subtree(self.parent_id, child)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            child = MLMUser.objects.only(
+                'subtree_size', 'subtree_depth').get(pk=self.child_id)
+            upline = list(child.upline().values_list('pk', flat=True))
+
+            MLMClosure.objects.unlink(self.child_id)
+            deleted = super().delete(*args, **kwargs)
+
+            MLMUser.objects.uncount_subtree(self.parent_id, child, upline)
+
+            return deleted
+
+
+class MLMClosure(models.Model):
+    """
+    Closure of `MLMRelationship`: a row for every (ancestor, descendant)
+    pair of the pyramid, with the number of levels between them, and a
+    depth 0 row per user.
+
+    Upline, downline, subtree size and depth are single indexed queries
+    on this table. Rows are maintained when `MLMUser`s and
+    `MLMRelationship`s are saved; bulk writes, which skip `save`, must go
+    through `MLMClosure.objects` (`add_nodes`, `link` or `rebuild`).
+    """
+
+    ancestor = models.ForeignKey(
+        MLMUser, on_delete=models.CASCADE,
+        related_name='descendant_paths')
+
+    descendant = models.ForeignKey(
+        MLMUser, on_delete=models.CASCADE,
+        related_name='ancestor_paths')
+
+    depth = models.PositiveIntegerField()
+
+    objects = MLMClosureManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['ancestor', 'descendant'],
+                name='mlm_closure__unique_path'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['descendant', 'depth'],
+                name='mlm_closure__upline'
+            ),
+            models.Index(
+                fields=['ancestor', 'depth'],
+                name='mlm_closure__downline'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.ancestor_id} -> {self.descendant_id} ({self.depth})"
+
+
+class MLMCommissionSettlement(models.Model):
+    """A roll-up of commission ledger entries into member balances."""
+
+    period_end = models.DateTimeField(
+        help_text="Entries created up to this date are settled .")
+
+    entries_count = models.PositiveIntegerField(default=0)
+    beneficiaries_count = models.PositiveIntegerField(default=0)
+    total_amount = models.DecimalField(
+        max_digits=20, decimal_places=6, default=Decimal('0.00'))
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = MLMCommissionSettlementManager()
+
+    class Meta:
+        ordering = ['-period_end']
+
+    def __str__(self):
+        return f"Settlement {self.period_end} | {self.total_amount}"
+
+
+class MLMCommissionEntry(models.Model):
+    """
+    Append-only ledger of commissions: one row per member credited for
+    an event (a recruit or a sale) in their downline.
+
+    Entries are written by `MLMCommissionEntry.objects.record*` and only
+    ever updated to attach them to the settlement that rolled them into
+    `MLMUser.balance`.
+    """
+
+    class Event(models.TextChoices):
+        RECRUIT = "RECRUIT", "recruit"
+        SALE = "SALE", "sale"
+
+    beneficiary = models.ForeignKey(
+        MLMUser, on_delete=models.CASCADE,
+        related_name='commission_entries')
+
+    # Member who recruited or sold, at `depth` levels below the beneficiary
+    source = models.ForeignKey(
+        MLMUser, on_delete=models.CASCADE,
+        related_name='generated_commissions')
+
+    event = models.CharField(max_length=10, choices=Event.choices)
+
+    # Identifies the event, e.g. the `MLMRelationship` of a recruit
+    reference = models.CharField(max_length=64)
+
+    depth = models.PositiveIntegerField()
+
+    amount = models.DecimalField(max_digits=18, decimal_places=6)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    settlement = models.ForeignKey(
+        MLMCommissionSettlement, on_delete=models.PROTECT,
+        null=True, blank=True, related_name='entries')
+
+    objects = MLMCommissionEntryManager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['event', 'reference', 'beneficiary'],
+                name='mlm_commission__unique_event_beneficiary'
+            )
+        ]
+        indexes = [
+            models.Index(
+                fields=['created_at'],
+                condition=models.Q(settlement__isnull=True),
+                name='mlm_commission__unsettled'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.beneficiary_id} | {self.event} {self.reference} | {self.amount}"
+
 
 class MLMConfig(models.Model):
     level = models.PositiveIntegerField(unique=True)
@@ -6,10 +6,9 @@ from django.conf import settings
 from decimal import Decimal
 
 from accounts.models.users import User
-from accounts.models.settings import UserSettings
 from accounts.managers.plans import SubscriptionPlanManager
 
-from configurations.utilities.currencies import ExchangeRates
+from utilities.pricing import PricingEngine
 
 
 application_setting: dict = settings.APPLICATION_SETTINGS
@@ -19,7 +18,76 @@ subscription_defaults: dict = (
 )
 
 
-class DefaultFeature(models.Model):
+class PricedFeature:
+    """
+    Pricing shared by plans and plan features.
+
+    Costs are computed in USD by `cost_breakdown` (one entry per priced
+    component, including related features) and converted by a
+    `PricingEngine`, so the user's currency and exchange rate are only
+    resolved once however many objects get priced.
+    """
+
+    # Related features whose cost is part of this one
+    PRICED_RELATIONS = ()
+
+    @classmethod
+    def priced_related(cls) -> list:
+        """
+        `select_related` paths needed to price instances without
+        further queries.
+        """
+
+        paths = []
+
+        for name in cls.PRICED_RELATIONS:
+            related_model = cls._meta.get_field(name).related_model
+            nested = related_model.priced_related()
+
+            paths.extend(
+                [f"{name}__{path}" for path in nested] if nested else [name]
+            )
+
+        return paths
+
+    @classmethod
+    def priced_paths(cls, prefix: str = "") -> dict:
+        """
+        Lookup paths from this model to every feature its price depends
+        on, by feature model.
+        """
+
+        paths = {}
+
+        for name in cls.PRICED_RELATIONS:
+            related_model = cls._meta.get_field(name).related_model
+            path = f"{prefix}{name}"
+
+            paths.setdefault(related_model, []).append(path)
+
+            for model, nested in related_model.priced_paths(
+                f"{path}__"
+            ).items():
+                paths.setdefault(model, []).extend(nested)
+
+        return paths
+
+    def cost_breakdown(self) -> dict:
+        raise NotImplementedError
+
+    def cost(self) -> Decimal:
+        # Components are rounded to cents before being added up, so the
+        # total matches the sum of the component prices shown
+        return sum(
+            (round(cost, 2) for cost in self.cost_breakdown().values()),
+            Decimal("0.00")
+        )
+
+    def price(self, user: User = None, pricing: PricingEngine = None) -> str:
+        return str(PricingEngine.resolve(user, pricing).price(self))
+
+
+class DefaultFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -142,131 +210,54 @@ class DefaultFeature(models.Model):
 
     # Calculated for those who want an invite commission
     # greater than the default percentage (%)
-    def invite_commission_price(self, user: User) -> str:
-        invite_commission_price = (
-            (
-                (
-                    self.invite_commission
-                    - subscription_defaults.get(
-                        "INVITE_COMMISSION", 10
-                    )
-                ) / 100
-            )
-            * self.UNIT_PRICE.get(
-                "per_invite_commission", Decimal("2.50")
-            ) if (
-                Decimal(
-                    self.invite_commission
-                ) > Decimal(
-                    subscription_defaults.get(
-                        "INVITE_COMMISSION", 10
-                    )
-                )
-            ) else Decimal("0.00")
+    def invite_commission_cost(self) -> Decimal:
+        default_commission = Decimal(
+            subscription_defaults.get("INVITE_COMMISSION", 10)
         )
 
-        price = invite_commission_price
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
+        if Decimal(self.invite_commission) <= default_commission:
+            return Decimal("0.00")
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-
-            price = price * currency_eqv
-        return f"{round(price, 2)} {preferred_currency}"
-
-    def invite_price(self, user: User = None) -> str:
-
-        invite_price = (
-            Decimal(
-                self.max_invite
-                * self.UNIT_PRICE.get(
-                    "per_invite", Decimal("1.00")
-                ) if (
-                    int(
-                        self.max_invite
-                    ) > int(
-                        subscription_defaults.get(
-                            "MAXIMUM_INVITE", 2
-                        )
-                    )
-                ) else Decimal("0.00")
-            )
+        return (
+            ((self.invite_commission - default_commission) / 100)
+            * self.UNIT_PRICE.get("per_invite_commission", Decimal("2.50"))
         )
 
-        price = invite_price
+    def invite_cost(self) -> Decimal:
+        if int(self.max_invite) <= int(
+            subscription_defaults.get("MAXIMUM_INVITE", 2)
+        ):
+            return Decimal("0.00")
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
+        return Decimal(
+            self.max_invite
+            * self.UNIT_PRICE.get("per_invite", Decimal("1.00"))
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-
-            price = price * currency_eqv
-        return f"{round(price, 2)} {preferred_currency}"
+    def cost_breakdown(self) -> dict:
+        return {
+            "invite_price": self.invite_cost(),
+            "invite_commission_price": self.invite_commission_cost(),
+        }
 
-    def price(self, user: User = None) -> str:
-        """
-        Calculates the total price for the feature by summing:
-        - Price based on `max_invite` and `price_per_invite`.
-        - Price based on `invite_commission` and `price_per_invite_commission`.
-        """
-        price = (
-            # Conver to decimal after ...
-            Decimal(
-                # Getting the price in the format
-                # `string(`decimal` `string`)`
-                # that is to say the returned value
-                # is of the form: 123 USD
-                self.invite_price(
-                    user=None
-                ).split(" ")[0]  # then split it to get the decimal string
+    def invite_commission_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.invite_commission_cost()
             )
-            + Decimal(
-                self.invite_commission_price(
-                    user=None
-                ).split(" ")[0]
-            )
-        )
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
+    def invite_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(self.invite_cost())
         )
 
 
-class AIConflictResolutionAssistantFeature(models.Model):
+class AIConflictResolutionAssistantFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -352,76 +343,26 @@ class AIConflictResolutionAssistantFeature(models.Model):
             else f"{self.max_conflict} Conflicts"
         )
 
-    def max_conflict_price(self, user):
-
-        max_conflict_price = Decimal(
+    def max_conflict_cost(self) -> Decimal:
+        return Decimal(
             self.max_conflict
-            * self.UNIT_PRICE.get(
-                "per_conflict", Decimal("1.00")
-            )
+            * self.UNIT_PRICE.get("per_conflict", Decimal("1.00"))
         )
 
-        price = max_conflict_price
+    def cost_breakdown(self) -> dict:
+        return {"max_conflict_price": self.max_conflict_cost()}
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-
-            price = price * currency_eqv
-        return f"{round(price, 2)} {preferred_currency}"
-
-    def price(self, user: User):
-        """
-        Calculates the total price for the feature by summing:
-        - Price based on `max_invite` and `price_per_invite`.
-        - Price based on `invite_commission` and `price_per_invite_commission`.
-        """
-        max_conflict_price = Decimal(
-            # Conver to decimal after ...
-            Decimal(
-                # Getting the price in the format
-                # `string(`decimal` `string`)`
-                # that is to say the returned value
-                # is of the form: 123 USD
-                self.max_conflict_price(
-                    user=None
-                ).split(" ")[0]  # then split it to get the decimal string
+    def max_conflict_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.max_conflict_cost()
             )
         )
 
-        price = max_conflict_price
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
 
-
-class TeamGoalFeature(models.Model):
+class TeamGoalFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -431,6 +372,8 @@ class TeamGoalFeature(models.Model):
         "per_team": Decimal("0.5"),
     }
 
+    PRICED_RELATIONS = ("conflict_resolver",)
+
     _type = models.CharField(
         max_length=10,
         choices=FeatureBelongsTo.choices,
@@ -521,81 +464,32 @@ class TeamGoalFeature(models.Model):
             else f"{self.max_team} People"
         )
 
-    def max_team_price(self, user: User) -> str:
+    def max_team_cost(self) -> Decimal:
         """
-        Calculate cummulative team package price
+        Calculate cummulative team package cost
         """
-        price = (
-            self.max_team
-            * self.UNIT_PRICE.get(
-                "per_team", Decimal("0.5")
-            )
-        )
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
         return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def price(self, user: User) -> str:
-        """
-        Calculates the total price for the feature by summing:
-        - Price based on `max_invite` and `price_per_invite`.
-        - Price based on `invite_commission` and `price_per_invite_commission`.
-        """
-
-        conflict_resolver_price = Decimal(
-            self.conflict_resolver.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.conflict_resolver else Decimal("0.00")
-
-        max_team_price = Decimal(
-            self.max_team_price(
-                user=None
-            ).split(" ")[0]
+            self.max_team
+            * self.UNIT_PRICE.get("per_team", Decimal("0.5"))
         )
 
-        price = (
-            conflict_resolver_price
-            + max_team_price
-        )
+    def cost_breakdown(self) -> dict:
+        costs = {"max_team_price": self.max_team_cost()}
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
+        if self.conflict_resolver:
+            costs["conflict_resolver"] = self.conflict_resolver.cost()
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
+        return costs
 
-        return (
-            f"{round(price, 2)} {preferred_currency}"
+    def max_team_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(self.max_team_cost())
         )
 
 
-class AIMarketingAssistantFeature(models.Model):
+class AIMarketingAssistantFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -690,63 +584,26 @@ class AIMarketingAssistantFeature(models.Model):
             else f"{self.max_rounds} Rounds"
         )
 
-    def max_rounds_price(self, user: User) -> str:
-        price = (
+    def max_rounds_cost(self) -> Decimal:
+        return (
             self.max_rounds
-            * self.UNIT_PRICE.get(
-                "per_round", Decimal("0.1")
-            )
+            * self.UNIT_PRICE.get("per_round", Decimal("0.1"))
         )
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
+    def cost_breakdown(self) -> dict:
+        return {"max_rounds_price": self.max_rounds_cost()}
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
+    def max_rounds_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.max_rounds_cost()
             )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def price(self, user: User):
-        max_rounds_price = Decimal(
-            self.max_rounds_price(
-                user=None
-            ).split(" ")[0]
         )
 
-        price = max_rounds_price
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-
-class MultiLevelMarketingFeature(models.Model):
+class MultiLevelMarketingFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -867,133 +724,58 @@ class MultiLevelMarketingFeature(models.Model):
     def get_rental_commission(self) -> Decimal:
         return f"{round(self.rental_commission, 2)} %"
 
-    def sale_commission_price(self, user: User):
-        sale_commission_price = Decimal(
-            (
-                (
-                    self.sale_commission
-                    - Decimal(
-                        subscription_defaults.get(
-                            "SALE_COMMISSION", "0.01"
-                        )
-                    )
-                ) / 100
-            )
-            * Decimal(
-                self.UNIT_PRICE.get(
-                    "per_sale_commission", "0.85"
-                )
-            )
-        ) if (
-            self.sale_commission
-            > Decimal(
-                subscription_defaults.get(
-                    "SALE_COMMISSION", "0.01"
-                )
-            )
-        ) else Decimal("0.00")
-
-        price = sale_commission_price
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
+    def sale_commission_cost(self) -> Decimal:
+        default_commission = Decimal(
+            subscription_defaults.get("SALE_COMMISSION", "0.01")
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
+        if self.sale_commission <= default_commission:
+            return Decimal("0.00")
 
         return (
-            f"{round(price, 2)} {preferred_currency}"
+            ((self.sale_commission - default_commission) / 100)
+            * Decimal(self.UNIT_PRICE.get("per_sale_commission", "0.85"))
         )
 
-    def rental_commission_price(self, user: User):
-        rental_commission_price = Decimal(
-            (
-                (
-                    self.rental_commission
-                    - Decimal(
-                        subscription_defaults.get(
-                            "RENTAL_COMMISSION", "0.05"
-                        )
-                    )
-                ) / 100
-            )
-            * self.UNIT_PRICE.get(
-                "per_rental_commission", Decimal("0.85")
-            )
-        ) if (
-            self.rental_commission
-            > Decimal(
-                subscription_defaults.get(
-                    "RENTAL_COMMISSION", "0.05"
-                )
-            )
-        ) else Decimal("0.00")
-
-        price = rental_commission_price
-
-        preferred_currency = default_currency.get(
-            "code", "USD"
+    def rental_commission_cost(self) -> Decimal:
+        default_commission = Decimal(
+            subscription_defaults.get("RENTAL_COMMISSION", "0.05")
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
+        if self.rental_commission <= default_commission:
+            return Decimal("0.00")
 
         return (
-            f"{round(price, 2)} {preferred_currency}"
+            ((self.rental_commission - default_commission) / 100)
+            * self.UNIT_PRICE.get("per_rental_commission", Decimal("0.85"))
         )
 
-    def price(self, user: User):
-        price = (
-            Decimal(
-                self.sale_commission_price(
-                    user=None
-                ).split(" ")[0]
-            )
-            + Decimal(
-                self.rental_commission_price(
-                    user=None
-                ).split(" ")[0]
-            )
-        )
+    def cost_breakdown(self) -> dict:
+        return {
+            "sale_commission_price": self.sale_commission_cost(),
+            "rental_commission_price": self.rental_commission_cost(),
+        }
 
-        preferred_currency = default_currency.get(
-            "code", "USD"
+    def sale_commission_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.sale_commission_cost()
+            )
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
+    def rental_commission_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.rental_commission_cost()
             )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
         )
 
 
-class BusinessFeature(models.Model):
+class BusinessFeature(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -1006,6 +788,8 @@ class BusinessFeature(models.Model):
         "per_consultation_hour": Decimal("1.00"),
     }
 
+    PRICED_RELATIONS = ("mlm_feature", "marketing_assistant")
+
     _type = models.CharField(
         max_length=10,
         choices=FeatureBelongsTo.choices,
@@ -1163,189 +947,84 @@ class BusinessFeature(models.Model):
     def get_consultation_hours(self) -> Decimal:
         return f"{round(self.consultation_hours/60, 2)} Hours"
 
-    def sale_deduction_price(self, user: User):
-        price = (
-            (self.sale_deduction / 100)
+    def sale_deduction_cost(self) -> Decimal:
+        return (
+            (Decimal(self.sale_deduction or 0) / 100)
             * self.UNIT_PRICE["per_sale_deduction"]
         )
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
+    def rental_deduction_cost(self) -> Decimal:
         return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def rental_deduction_price(self, user: User):
-        price = (
-            (self.rental_deduction / 100)
+            (Decimal(self.rental_deduction or 0) / 100)
             * self.UNIT_PRICE["per_rental_deduction"]
         )
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
+    def storage_space_cost(self) -> Decimal:
         return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def storage_space_price(self, user: User):
-        price = (
-            (self.storage_space / 100)
+            (Decimal(self.storage_space or 0) / 100)
             * self.UNIT_PRICE["per_storage_space"]
         )
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
-        )
-
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
-
+    def consultation_hours_cost(self) -> Decimal:
         return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def consultation_hours_price(self, user: User):
-
-        consultation_hours = Decimal(
-            self.consultation_hours / 60
-        )
-
-        price = (
-            consultation_hours
+            Decimal((self.consultation_hours or 0) / 60)
             * self.UNIT_PRICE["per_consultation_hour"]
         )
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
-        )
+    def cost_breakdown(self) -> dict:
+        costs = {
+            "sale_deduction_price": self.sale_deduction_cost(),
+            "rental_deduction_price": self.rental_deduction_cost(),
+            "storage_space_price": self.storage_space_cost(),
+            "consultation_hours_price": self.consultation_hours_cost(),
+        }
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
+        if self.mlm_feature:
+            costs["mlm_feature"] = self.mlm_feature.cost()
 
-        return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
-
-    def price(self, user: User):
+        if self.marketing_assistant:
+            costs["marketing_assistant"] = self.marketing_assistant.cost()
 
-        sale_deduction_price = Decimal(
-            self.sale_deduction_price(
-                user=None
-            ).split(" ")[0]
-        )
+        return costs
 
-        rental_deduction_price = Decimal(
-            self.rental_deduction_price(
-                user=None
-            ).split(" ")[0]
-        )
-
-        storage_space_price = Decimal(
-            self.storage_space_price(
-                user=None
-            ).split(" ")[0]
-        )
-
-        consultation_hours_price = Decimal(
-            self.consultation_hours_price(
-                user=None
-            ).split(" ")[0]
+    def sale_deduction_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.sale_deduction_cost()
+            )
         )
 
-        mlm_feature_price = Decimal(
-            self.mlm_feature.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.mlm_feature else 0
-
-        marketing_assistant_price = Decimal(
-            self.marketing_assistant.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.marketing_assistant else 0
-
-        price = (
-            sale_deduction_price
-            + rental_deduction_price
-            + storage_space_price
-            + consultation_hours_price
-            + mlm_feature_price
-            + marketing_assistant_price
+    def rental_deduction_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.rental_deduction_cost()
+            )
         )
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
+    def storage_space_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.storage_space_cost()
+            )
         )
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
+    def consultation_hours_price(
+            self, user: User = None, pricing: PricingEngine = None
+    ) -> str:
+        return str(
+            PricingEngine.resolve(user, pricing).convert(
+                self.consultation_hours_cost()
             )
-            price = currency_eqv * price
-
-        return (
-            f"{round(price, 2)} {preferred_currency}"
         )
 
 
-class SubscriptionPlan(models.Model):
+class SubscriptionPlan(PricedFeature, models.Model):
 
     class FeatureBelongsTo(models.TextChoices):
         INTERNAL = "INTERNAL", "internal"
@@ -1394,6 +1073,8 @@ class SubscriptionPlan(models.Model):
         blank=True
     )
 
+    PRICED_RELATIONS = ("default_feature", "team_feature", "business_feature")
+
     objects = SubscriptionPlanManager()
 
     class Meta:
@@ -1422,51 +1103,16 @@ class SubscriptionPlan(models.Model):
     def __str__(self) -> str:
         return f"{self.name} | {self._type}"
 
-    def price(self, user: User) -> Decimal:
-        default_feature_price = Decimal(
-            self.default_feature.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.default_feature else Decimal("0.00")
-
-        team_feature_price = Decimal(
-            self.team_feature.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.team_feature else Decimal("0.00")
-
-        business_feature_price = Decimal(
-            self.business_feature.price(
-                user=None
-            ).split(" ")[0]
-        ) if self.business_feature else Decimal("0.00")
-
-        price = (
-            default_feature_price
-            + team_feature_price
-            + business_feature_price
-        )
+    def cost_breakdown(self) -> dict:
+        costs = {}
 
-        preferred_currency = (
-            default_currency["code"]
-            if default_currency["code"]
-            else "USD"
-        )
+        for feature_name in self.PRICED_RELATIONS:
+            feature = getattr(self, feature_name, None)
 
-        if user:
-            user_settings = UserSettings.objects.get(
-                user=user
-            )
-            preferred_currency = user_settings.preferred_currency.code
-            exchange_rates = ExchangeRates()
-            currency_eqv = exchange_rates.get_exchange_rate(
-                to_currency=preferred_currency
-            )
-            price = currency_eqv * price
+            if feature:
+                costs[feature_name] = feature.cost()
 
-        return (
-            f"{round(price, 2)} {preferred_currency}"
-        )
+        return costs
 
     @classmethod
     def get_active_plan(cls, auto: bool = True,
@@ -1480,6 +1126,60 @@ class SubscriptionPlan(models.Model):
         return manager.get_active_plan(*args, **kwargs)
 
 
+class PlanPriceSnapshot(models.Model):
+    """
+    Price of an active plan in one currency, kept up to date by
+    `utilities.pricing.rebuild_plan_price_snapshots` whenever a feature
+    is saved or exchange rates are refreshed.
+    """
+
+    plan = models.ForeignKey(
+        SubscriptionPlan,
+        on_delete=models.CASCADE,
+        related_name="price_snapshots",
+        verbose_name="Subscription Plan",
+    )
+
+    currency_code = models.CharField(
+        max_length=3,
+        verbose_name="Currency Code",
+    )
+
+    amount = models.DecimalField(
+        max_digits=18,
+        decimal_places=2,
+        verbose_name="Amount",
+        help_text=(
+            "Plan price in `currency_code`, rounded to cents ."
+        )
+    )
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Plan Price Snapshot"
+        verbose_name_plural = "Plan Price Snapshots"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["plan", "currency_code"],
+                name=(
+                    "plan_price_snapshot__"
+                    "unique_currency_per_plan"
+                ),
+            )
+        ]
+        db_table = f"{apps.get_app_config('accounts').label}__plan_price_snapshot"
+        db_table_comment = (
+            "Materialized price of each active subscription plan in each "
+            "supported currency. Rebuilt for the affected plans when a plan "
+            "feature is saved, and for every plan when exchange rates are "
+            "refreshed, so plan endpoints read prices without computing them."
+        )
+
+    def __str__(self) -> str:
+        return f"{self.plan} | {self.amount} {self.currency_code}"
+
+
 class UserSubscriptionPlan(models.Model):
     class SubscriptionDuration(models.TextChoices):
         MONTHLY = 'MONTHLY', 'monthly'
@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import Group as BaseGroup
+from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import (RegexValidator, MinLengthValidator)
 from django.utils.translation import gettext_lazy as _
 
@@ -111,5 +112,14 @@ class UserProfile(models.Model):
     def get_statuses(self):
         return self.statuses
 
+    class Meta:
+        indexes = [
+            # Trigram index behind `User.search`
+            GinIndex(
+                fields=["legal_name"], name="user_profile__legal_name_trgm",
+                opclasses=["gin_trgm_ops"]
+            ),
+        ]
+
     def __str__(self):
         return self.user.username
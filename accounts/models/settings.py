@@ -11,6 +11,52 @@ default_currency = application_setting["DEFAULT_CURRENCY"]
 default_language = application_setting["DEFAULT_LANGUAGE"]
 
 
+# Primary keys of the default currency and language, see
+# `default_reference_ids`
+_reference_ids = {}
+
+
+def cached_reference_ids_exist() -> bool:
+    # Both rows checked in one query
+    return bool(_reference_ids) and Currencies.objects.filter(
+        pk=_reference_ids["currency"]
+    ).filter(
+        models.Exists(Languages.objects.filter(pk=_reference_ids["language"]))
+    ).exists()
+
+
+def default_reference_ids() -> dict:
+    """
+    Primary keys of the default currency and language new users'
+    settings point to, created if missing. They are looked up once per
+    process and only checked to still exist afterwards: a row deleted or
+    recreated (or created by a rolled back transaction) is looked up
+    again instead of failing registrations on a dangling foreign key.
+    """
+
+    if cached_reference_ids_exist():
+        return _reference_ids
+
+    _reference_ids.update(
+        currency=Currencies.objects.get_or_create(
+            code=default_currency.get("code") or "USD",
+            defaults={
+                "name": default_currency.get("name") or "US Dollar",
+                "symbol": default_currency.get("symbol") or "$",
+            }
+        )[0].pk,
+        language=Languages.objects.get_or_create(
+            code=default_language.get("code") or "en",
+            defaults={
+                "name": default_language.get("name") or "English",
+                "flag": default_language.get("flag") or "🇬🇧",
+            }
+        )[0].pk
+    )
+
+    return _reference_ids
+
+
 class UserSettings(models.Model):
     user = models.OneToOneField(
         User, on_delete=models.CASCADE, null=False, blank=False
@@ -20,47 +66,13 @@ class UserSettings(models.Model):
 
     def save(self, *args, **kwargs):
         if not self.pk:
-            # Use get_or_create for preferred_currency
-            self.preferred_currency, _ = Currencies.objects.get_or_create(
-                code=(
-                    default_currency["code"]
-                    if default_currency["code"]
-                    else "USD"
-                ),
-                defaults={
-                    "name": (
-                        default_currency["name"]
-                        if default_currency["name"]
-                        else "US Dollar"
-                    ),
-                    'symbol': (
-                        default_currency["symbol"]
-                        if default_currency["symbol"]
-                        else "$"
-                    )
-                }
-            )
-
-            # Use get_or_create for preferred_language
-            self.preferred_language, _ = Languages.objects.get_or_create(
-                code=(
-                    default_language["code"]
-                    if default_language["code"]
-                    else "en"
-                ),
-                defaults={
-                    "name": (
-                        default_language["name"]
-                        if default_language["name"]
-                        else "English"
-                    ),
-                    "flag": (
-                        default_language["flag"]
-                        if default_language["flag"]
-                        else "🇬🇧"
-                    )
-                }
-            )
+            ids = default_reference_ids()
+
+            if self.preferred_currency_id is None:
+                self.preferred_currency_id = ids["currency"]
+
+            if self.preferred_language_id is None:
+                self.preferred_language_id = ids["language"]
 
         # Call the original save method
         super().save(*args, **kwargs)
@@ -1,21 +1,22 @@
 from typing import List, Union
 from django.db import models
-from django.db.models import Q
 from django.contrib.auth.models import (AbstractBaseUser, PermissionsMixin)
+from django.contrib.postgres.indexes import GinIndex
 from django.utils.timezone import now
 
 from rest_framework.exceptions import ValidationError
 
 # custom imports
-from accounts.managers.users import (CreateUserManager,
-                                     GetUserManager, VerifyUserManager)
+from accounts.managers.users import (CreateUserManager, GetUserManager,
+                                     VerifyUserManager, SearchUserManager)
 
-from utilities import response
-from utilities.generators.string_generators import (generate_name, QueryID, Keys)
+from utilities.generators.string_generators import (
+    generate_name, is_generated_name, Keys
+)
+from utilities.models.query_ids import QueryIDMixin
 
 # python imports
 import uuid
-import base64
 
 
 class BannedPhoneNumber(models.Model):
@@ -110,7 +111,7 @@ class APIKey(models.Model):
         self.save()
 
 
-class User(AbstractBaseUser, PermissionsMixin):
+class User(QueryIDMixin, AbstractBaseUser, PermissionsMixin):
 
     class UserType(models.TextChoices):
         BUYER = "BUYER", "buyer"
@@ -187,8 +188,9 @@ class User(AbstractBaseUser, PermissionsMixin):
     last_login = models.DateTimeField(blank=True, null=True)
     last_logout = models.DateTimeField(blank=True, null=True)
 
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True)
+        null=True, blank=True, max_length=10000, db_index=True)
 
     # Used for generating unique One Time Passwords (OTP) for `users` .
     secret_key = models.BinaryField(null=False, blank=False, max_length=46)
@@ -202,9 +204,30 @@ class User(AbstractBaseUser, PermissionsMixin):
     # returns a boolean for every check (get value)
     verify = VerifyUserManager()
 
+    # `User.search.rank(query)` and `User.search.autocomplete(prefix)`
+    search = SearchUserManager()
+
     USERNAME_FIELD = 'phone'
     REQUIRED_FIELDS = []
 
+    class Meta:
+        indexes = [
+            # Trigram indexes behind `User.search`
+            GinIndex(
+                fields=[field], name=f"user__{field}_trgm",
+                opclasses=["gin_trgm_ops"]
+            )
+            for field in ("username", "phone", "email")
+        ] + [
+            # Keyset pagination of user listings
+            models.Index(
+                fields=["datetime_joined", "id"], name="user__joined_keyset"
+            ),
+        ]
+
+    # Fields `save` generates or checks, see `save`
+    IDENTITY_FIELDS = frozenset({"username", "secret_key"})
+
     def __str__(self) -> str:
 
         return str(self.username)
@@ -250,8 +273,6 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         manager = cls.verify
 
-        query_id = base64.b64decode(query_id.encode())
-
         return manager.user_exists(query_id)
 
     @classmethod
@@ -261,40 +282,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         manager = cls.get_by
 
-        try:
-            if isinstance(query_id, str):
-                query_ids = base64.b64decode(query_id.encode())
-            elif isinstance(query_id, list):
-                query_ids = [
-                    base64.b64decode(q_id.encode())
-                    for q_id in query_id
-                ]
-        except Exception as e:
-            response.errors(
-                field_error="Unknown User ID. Try Again Or Contact Support.",
-                for_developer=f"QueryID Data Encoding Error: {e}.",
-                code="INTERNAL_SERVER_ERROR",
-                status_code=500
-            )
-
-        return manager.query_id(query_ids)
+        return manager.query_id(query_id)
 
     @property
     def get_secret_key(self):
         key = Keys()
         return key.to_base64_string(self.secret_key)
 
-    @staticmethod
-    def search(query: str) -> dict:
-
-        # query_id_instance = QueryID()
-        # query_id = query_id_instance.query_id(query_id=query_id)
-
-        return User.objects.filter(
-            Q(username__icontains=query)
-            | Q(phone__icontains=query)
-        )
-
     @property
     def _is_online(self):
 
@@ -314,7 +308,14 @@ class User(AbstractBaseUser, PermissionsMixin):
 
             return False
 
-    def save(self, *args, **kwargs):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_username = instance.__dict__.get("username")
+
+        return instance
+
+    def normalize_username(self):
 
         if self.username:
 
@@ -323,6 +324,15 @@ class User(AbstractBaseUser, PermissionsMixin):
 
             self.username = f'@{username}'
 
+            # Only a username that changed since it was loaded can clash
+            if self.username == getattr(self, "_loaded_username", None):
+                return
+
+            if is_generated_name(self.username):
+                raise ValidationError(
+                    {'error': 'Username is reserved for generated names.'}
+                )
+
             # Check if the username already exists
             if User.objects.filter(
                     username=self.username).exclude(pk=self.pk).exists():
@@ -331,28 +341,17 @@ class User(AbstractBaseUser, PermissionsMixin):
 
         else:
 
+            # Generated names are unique by construction
             self.username = f'@{generate_name()}'
 
-            while User.objects.filter(username=self.username).exists():
-                self.username = f'@{generate_name()}'
-
-        #
-        # Building user_id_generator parameters
-        #
+    def generate_secret_key(self):
+        """
+        Generate the `secret_key` (OTP seed) of the user, done once on
+        creation so OTPs keep verifying afterwards.
+        """
 
         data = [self.user_type, self.username, self.phone, str(uuid.uuid5)]
-        data_length = sum(len(item) for item in data)
-
-        #
-        # Stopped building user_id_generator parameters
-        #
-
-        query_id_instance = QueryID(data=data, length=data_length)
-
-        # Generating query_id and saving it to database
-        self.query_id = query_id_instance.to_database()
 
-        # Generating Secret Key
         # Creating A New User Data List By Filtering
         # `user_data` values that are not integers, strings, bytes or bool
         filtered_user_data = [
@@ -363,4 +362,21 @@ class User(AbstractBaseUser, PermissionsMixin):
         key_instance = Keys(filtered_user_data, _type="secret")
         self.secret_key = key_instance.generate()
 
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+
+        # Flag updates (activation, online status, last login...) write
+        # none of the identity fields and skip their checks altogether
+        if update_fields is not None and not (
+                self.IDENTITY_FIELDS.intersection(update_fields)):
+
+            return super(User, self).save(*args, **kwargs)
+
+        self.normalize_username()
+
+        if self._state.adding or not self.secret_key:
+            self.generate_secret_key()
+
         super(User, self).save(*args, **kwargs)
+
+        self._loaded_username = self.username
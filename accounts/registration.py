@@ -0,0 +1,209 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils.timezone import now
+
+from accounts.models.users import User, APIKey
+from accounts.models.settings import UserSettings, default_reference_ids
+from accounts.models.profiles import UserProfile
+from accounts.models.mlm_user import MLMUser, MLMClosure
+from accounts.models.account import (
+    PhoneNumberVerificationOTP, EmailVerificationOTP, AccountVerification,
+    KYCVerificationCheck, RealEstateCertification
+)
+
+from utilities.generators.codes import referral_codes
+
+from datetime import timedelta
+
+import secrets
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+def companion_rows(user: User, legal_name: str = None,
+                   referral_code: str = None, reference_ids: dict = None) -> list:
+    """
+    Unsaved rows every new user comes with: profile, settings,
+    verification checks, `MLMUser` and its closure row (MLM users) and
+    API key (external users). Rows referencing each other do so through
+    the instances, in the order they must be inserted.
+    """
+
+    ids = reference_ids or default_reference_ids()
+
+    certification = RealEstateCertification(user=user)
+    check = KYCVerificationCheck(
+        user=user, real_estate_certifications=certification
+    )
+
+    rows = [
+        UserProfile(user=user, legal_name=legal_name),
+        UserSettings(
+            user=user, preferred_currency_id=ids["currency"],
+            preferred_language_id=ids["language"]
+        ),
+        certification,
+        check,
+        AccountVerification(user=user, kyc_verification_check=check),
+    ]
+
+    if user.is_mlm_user:
+        member = MLMUser(
+            user=user, referral_code=referral_code or referral_codes.generate()
+        )
+
+        rows += [
+            member, MLMClosure(ancestor=member, descendant=member, depth=0)
+        ]
+
+    if user.user_type == User.UserType.EXTERNAL:
+        rows.append(
+            APIKey(
+                user=user, key=secrets.token_urlsafe(32),
+                expires_at=now() + timedelta(
+                    days=app_settings.get("API_KEY", {}).get("EXPIRES_IN", 14)
+                )
+            )
+        )
+
+    return rows
+
+
+def create_companions(users: list, legal_names: list = None) -> None:
+    """
+    Companion rows (see `companion_rows`) of many new users, one INSERT
+    per table whatever the number of users. To be run in the
+    transaction that created them.
+    """
+
+    legal_names = legal_names or [None] * len(users)
+    reference_ids = default_reference_ids()
+
+    codes = iter(
+        referral_codes.allocate(sum(1 for user in users if user.is_mlm_user))
+    )
+
+    rows = [
+        row
+        for user, legal_name in zip(users, legal_names)
+        for row in companion_rows(
+            user, legal_name,
+            referral_code=next(codes) if user.is_mlm_user else None,
+            reference_ids=reference_ids
+        )
+    ]
+
+    # Tables in the order their rows first appear: referenced rows get
+    # their primary keys before the rows referencing them are inserted
+    for model in dict.fromkeys(type(row) for row in rows):
+        model.objects.bulk_create(
+            [row for row in rows if type(row) is model]
+        )
+
+
+def verification_otp_model(user: User):
+    """OTP model the account of `user` is verified through."""
+    return EmailVerificationOTP if user.email else PhoneNumberVerificationOTP
+
+
+def create_verification_otps(users: list) -> None:
+    """
+    Verification OTP rows of new users, one INSERT per OTP model. The
+    OTPs themselves are generated when they are sent.
+    """
+
+    for model in (EmailVerificationOTP, PhoneNumberVerificationOTP):
+        model.objects.bulk_create(
+            [
+                model(user=user) for user in users
+                if verification_otp_model(user) is model
+            ]
+        )
+
+
+class RegistrationUnitOfWork:
+    """
+    Companion rows of a newly registered user (see `companion_rows`),
+    written by a single statement chaining one data-modifying CTE per
+    row, rows referencing each other through the CTEs' RETURNING.
+
+    Committed in the transaction that created the user, a registration
+    leaves either a complete account or nothing.
+    """
+
+    def __init__(self, user: User, legal_name: str = None):
+        self.user = user
+        self.rows = companion_rows(user, legal_name)
+
+    def statement(self) -> tuple:
+        quote = connection.ops.quote_name
+
+        aliases = {id(row): f"row_{index}" for index, row in enumerate(self.rows)}
+        ctes, params = [], []
+
+        for row in self.rows:
+            meta = row._meta
+            columns, values = [], []
+
+            for field in meta.concrete_fields:
+                if field.primary_key:
+                    continue
+
+                columns.append(quote(field.column))
+
+                related = (
+                    field.get_cached_value(row)
+                    if field.is_relation and field.is_cached(row) else None
+                )
+
+                # Inserted by an earlier CTE of the statement
+                if id(related) in aliases:
+                    values.append(
+                        f"(SELECT {quote(related._meta.pk.column)}"
+                        f" FROM {aliases[id(related)]})"
+                    )
+                    continue
+
+                values.append("%s")
+                params.append(
+                    field.get_db_prep_save(
+                        field.pre_save(row, add=True), connection
+                    )
+                )
+
+            ctes.append(
+                f"{aliases[id(row)]} AS ("
+                f"INSERT INTO {quote(meta.db_table)} ({', '.join(columns)})"
+                f" VALUES ({', '.join(values)})"
+                f" RETURNING {quote(meta.pk.column)})"
+            )
+
+        returning = ", ".join(
+            f"(SELECT {quote(row._meta.pk.column)} FROM {aliases[id(row)]})"
+            for row in self.rows
+        )
+
+        return f"WITH {', '.join(ctes)} SELECT {returning}", params
+
+    def commit(self) -> list:
+        """
+        Insert the companion rows.
+
+        Returns:
+            list: The rows, with their primary keys.
+        """
+
+        sql, params = self.statement()
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            pks = cursor.fetchone()
+
+        for row, pk in zip(self.rows, pks):
+            row.pk = pk
+            row._state.adding = False
+            row._state.db = connection.alias
+
+        return self.rows
@@ -0,0 +1,66 @@
+from collections import namedtuple
+
+
+PlanFeature = namedtuple("PlanFeature", ["name", "model", "serializer"])
+
+
+class PlanFeatureRegistry:
+    """
+    Plan features by name (the name of their model, as passed in the
+    `plan-feature` query parameter) with the serializer used for them.
+
+    It is populated once, by `AccountsConfig.ready`, instead of looking
+    the model and serializer up in their modules on every request.
+    """
+
+    def __init__(self):
+        self._features = {}
+
+    def register(self, model, serializer):
+        self._features[model.__name__] = PlanFeature(
+            name=model.__name__, model=model, serializer=serializer
+        )
+
+    def get(self, name: str) -> PlanFeature:
+        return self._features.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._features
+
+    def __iter__(self):
+        return iter(self._features.values())
+
+    def populate(self):
+        if self._features:
+            return
+
+        # Imported here, models and serializers need the app registry
+        from accounts.models.plans import (
+            DefaultFeature, AIConflictResolutionAssistantFeature,
+            TeamGoalFeature, AIMarketingAssistantFeature,
+            MultiLevelMarketingFeature, BusinessFeature, SubscriptionPlan
+        )
+        from accounts.serializers.plans import (
+            DefaultFeatureSerializer,
+            AIConflictResolutionAssistantFeatureSerializer,
+            TeamGoalFeatureSerializer, AIMarketingAssistantFeatureSerializer,
+            MultiLevelMarketingFeatureSerializer, BusinessFeatureSerializer,
+            SubscriptionPlanSerializer
+        )
+
+        for model, serializer in (
+            (DefaultFeature, DefaultFeatureSerializer),
+            (
+                AIConflictResolutionAssistantFeature,
+                AIConflictResolutionAssistantFeatureSerializer
+            ),
+            (TeamGoalFeature, TeamGoalFeatureSerializer),
+            (AIMarketingAssistantFeature, AIMarketingAssistantFeatureSerializer),
+            (MultiLevelMarketingFeature, MultiLevelMarketingFeatureSerializer),
+            (BusinessFeature, BusinessFeatureSerializer),
+            (SubscriptionPlan, SubscriptionPlanSerializer),
+        ):
+            self.register(model, serializer)
+
+
+plan_features = PlanFeatureRegistry()
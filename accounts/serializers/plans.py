@@ -5,6 +5,7 @@ from accounts.models.plans import SubscriptionPlan, UserSubscriptionPlan
 from accounts.serializers.users import UserSerializer
 
 from utilities import response
+from utilities.pricing import PricingEngine, Money
 
 from decimal import Decimal
 from accounts.models.plans import (
@@ -13,7 +14,36 @@ from accounts.models.plans import (
 )
 
 
-class DefaultFeatureSerializer(serializers.ModelSerializer):
+class PricingSerializerMixin:
+    """
+    Prices are converted with a single `PricingEngine` per serialization:
+    it is looked up in (or added to) the context, which nested and
+    `many=True` child serializers share with their root serializer.
+    """
+
+    def _get_user_context(self):
+        """
+        Utility function to retrieve user from the context.
+        Space Complexity: O(1)
+        Time Complexity: O(1)
+        """
+        user = self.context.get("user", None)
+
+        return user
+
+    def _get_pricing(self) -> PricingEngine:
+        pricing = self.context.get("pricing", None)
+
+        if pricing is None:
+            pricing = PricingEngine.for_user(self._get_user_context())
+            self.context["pricing"] = pricing
+
+        return pricing
+
+
+class DefaultFeatureSerializer(
+    PricingSerializerMixin, serializers.ModelSerializer
+):
     """
     Detailed serializer for the DefaultFeature model with additional
     validations, custom creation logic, and computed properties.
@@ -39,25 +69,23 @@ class DefaultFeatureSerializer(serializers.ModelSerializer):
         Calculate invite price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-        return obj.invite_price(user=user)
+        pricing = self._get_pricing()
+        return obj.invite_price(pricing=pricing)
 
     def get_invite_commission_price(self, obj):
         """
         Calculate invite price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-        return obj.invite_commission_price(user=user)
+        pricing = self._get_pricing()
+        return obj.invite_commission_price(pricing=pricing)
 
     def get_price(self, obj):
         """
         Calculate the price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def validate_name(self, value):
         """
@@ -130,20 +158,9 @@ class DefaultFeatureSerializer(serializers.ModelSerializer):
         representation["feature_details"] = f"{instance.name} ({instance._type})"
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
 class AIConflictResolutionAssistantFeatureSerializer(
-    serializers.ModelSerializer
+    PricingSerializerMixin, serializers.ModelSerializer
 ):
     """
     Detailed serializer for the AIConflictResolutionAssistantFeature
@@ -164,8 +181,7 @@ class AIConflictResolutionAssistantFeatureSerializer(
         Calculate the price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def validate_name(self, value):
         """
@@ -228,12 +244,14 @@ class AIConflictResolutionAssistantFeatureSerializer(
         Customize the representation of the serialized data.
         This can be useful for formatting output differently.
         """
-        user = self._get_user_context()
+        pricing = self._get_pricing()
         representation = super().to_representation(instance)
         representation["feature_details"] = f"{instance.name} ({instance._type})"
 
+        # Every component priced in one pass, formatted here only
         precomputed_prices = {
-            "max_conflict_price": instance.max_conflict_price(user),
+            name: str(price)
+            for name, price in pricing.breakdown(instance).items()
         }
 
         # Add precomputed values to the representation
@@ -252,20 +270,9 @@ class AIConflictResolutionAssistantFeatureSerializer(
         representation["feature_details"] = f"{instance.name} ({instance._type})"
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
 class TeamGoalFeatureSerializer(
-    serializers.ModelSerializer
+    PricingSerializerMixin, serializers.ModelSerializer
 ):
     """
     Detailed serializer for the TeamGoalFeature model
@@ -287,9 +294,7 @@ class TeamGoalFeatureSerializer(
         Calculate the price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def validate_name(self, value):
         """
@@ -342,23 +347,23 @@ class TeamGoalFeatureSerializer(
         Customize the representation of the serialized data.
         This can be useful for formatting output differently.
         """
-        user = self._get_user_context()
+        pricing = self._get_pricing()
         representation = super().to_representation(instance)
         # Handle the conflict_resolver relation
         if hasattr(instance, "conflict_resolver") and instance.conflict_resolver:
             representation["conflict_resolver"] = (
                 AIConflictResolutionAssistantFeatureSerializer(
                     instance=instance.conflict_resolver,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
             representation["conflict_resolver"] = None
 
+        # Every component priced in one pass, formatted here only
         precomputed_prices = {
-            "max_team_price": instance.max_team_price(user),
+            name: str(price)
+            for name, price in pricing.breakdown(instance).items()
         }
 
         # Add precomputed values to the representation
@@ -377,20 +382,9 @@ class TeamGoalFeatureSerializer(
         representation["feature_details"] = f"{instance.name} ({instance._type})"
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
 class AIMarketingAssistantFeatureSerializer(
-    serializers.ModelSerializer
+    PricingSerializerMixin, serializers.ModelSerializer
 ):
     """
     Detailed serializer for the TeamGoalFeature model
@@ -411,8 +405,7 @@ class AIMarketingAssistantFeatureSerializer(
         Calculate the price dynamically based on the user passed
         in the serializer context.
         """
-        user = self._get_user_context()
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def validate_name(self, value):
         """
@@ -476,11 +469,13 @@ class AIMarketingAssistantFeatureSerializer(
         This can be useful for formatting output differently.
         """
 
-        user = self._get_user_context()
+        pricing = self._get_pricing()
         representation = super().to_representation(instance)
 
+        # Every component priced in one pass, formatted here only
         precomputed_prices = {
-            "max_rounds_price": instance.max_rounds_price(user),
+            name: str(price)
+            for name, price in pricing.breakdown(instance).items()
         }
 
         # Add precomputed values to the representation
@@ -500,19 +495,10 @@ class AIMarketingAssistantFeatureSerializer(
 
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
-class MultiLevelMarketingFeatureSerializer(serializers.ModelSerializer):
+class MultiLevelMarketingFeatureSerializer(
+    PricingSerializerMixin, serializers.ModelSerializer
+):
     """
     Serializer for the MultiLevelMarketingFeature model.
     Optimized for readability, maintainability, and efficiency.
@@ -541,8 +527,7 @@ class MultiLevelMarketingFeatureSerializer(serializers.ModelSerializer):
         Space Complexity: O(1) (minimal space used)
         Time Complexity: O(1) (direct method call)
         """
-        user = self._get_user_context()
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def validate_name(self, value):
         """
@@ -593,12 +578,13 @@ class MultiLevelMarketingFeatureSerializer(serializers.ModelSerializer):
         Space Complexity: O(1) (no additional storage required)
         Time Complexity: O(1) (one database hit for precomputed prices)
         """
-        user = self._get_user_context()
+        pricing = self._get_pricing()
         representation = super().to_representation(instance)
 
+        # Every component priced in one pass, formatted here only
         precomputed_prices = {
-            "sale_commission_price": instance.sale_commission_price(user),
-            "rental_commission_price": instance.rental_commission_price(user),
+            name: str(price)
+            for name, price in pricing.breakdown(instance).items()
         }
 
         # Add precomputed values to the representation
@@ -623,19 +609,10 @@ class MultiLevelMarketingFeatureSerializer(serializers.ModelSerializer):
 
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
 
-
-class BusinessFeatureSerializer(serializers.ModelSerializer):
+class BusinessFeatureSerializer(
+    PricingSerializerMixin, serializers.ModelSerializer
+):
     """
     Optimized serializer for the BusinessFeature model
     with reduced overhead in computed fields and representations.
@@ -661,20 +638,17 @@ class BusinessFeatureSerializer(serializers.ModelSerializer):
         """
         Calculate the total price dynamically based on the user.
         """
-        user = self._get_user_context()
-
-        return obj.price(user=user)
+        return str(self._get_pricing().price(obj))
 
     def to_representation(self, instance):
         """
         Optimize the restructuring of fields and computed data.
         """
-        user = self._get_user_context()
+        pricing = self._get_pricing()
+        # Every component priced in one pass, formatted here only
         precomputed_prices = {
-            "sale_deduction_price": instance.sale_deduction_price(user),
-            "rental_deduction_price": instance.rental_deduction_price(user),
-            "storage_space_price": instance.storage_space_price(user),
-            "consultation_hours_price": instance.consultation_hours_price(user),
+            name: str(price)
+            for name, price in pricing.breakdown(instance).items()
         }
 
         # Precomputed values for a single database hit
@@ -700,9 +674,7 @@ class BusinessFeatureSerializer(serializers.ModelSerializer):
             representation["marketing_assistant"] = (
                 AIMarketingAssistantFeatureSerializer(
                     instance=instance.marketing_assistant,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
@@ -712,9 +684,7 @@ class BusinessFeatureSerializer(serializers.ModelSerializer):
             representation["mlm_feature"] = (
                 MultiLevelMarketingFeatureSerializer(
                     instance=instance.mlm_feature,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
@@ -770,17 +740,6 @@ class BusinessFeatureSerializer(serializers.ModelSerializer):
             validated_data["_type"] = validated_data["_type"].upper()
         return super().update(instance, validated_data)
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
 class BasicSubscriptionPlanSerializer(serializers.ModelSerializer):
     class Meta:
@@ -791,7 +750,9 @@ class BasicSubscriptionPlanSerializer(serializers.ModelSerializer):
         read_only_fields = ('id',)
 
 
-class SubscriptionPlanSerializer(serializers.ModelSerializer):
+class SubscriptionPlanSerializer(
+    PricingSerializerMixin, serializers.ModelSerializer
+):
 
     price = serializers.SerializerMethodField()
 
@@ -806,23 +767,26 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
 
     def get_price(self, obj):
         """
-        Calculate the total price dynamically based on the user.
+        Calculate the total price dynamically based on the user,
+        unless the view read it from `PlanPriceSnapshot` already.
         """
-        user = self._get_user_context()
-        return obj.price(user=user)
+        pricing = self._get_pricing()
+
+        snapshot_price = getattr(obj, "snapshot_price", None)
+        if snapshot_price is not None:
+            return str(Money(snapshot_price, pricing.currency))
+
+        return str(pricing.price(obj))
 
     def to_representation(self, instance):
 
-        user = self._get_user_context()
         representation = super().to_representation(instance)
 
         if hasattr(instance, "default_feature") and instance.default_feature:
             representation["default_feature"] = (
                 DefaultFeatureSerializer(
                     instance=instance.default_feature,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
@@ -832,9 +796,7 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
             representation["team_feature"] = (
                 TeamGoalFeatureSerializer(
                     instance=instance.team_feature,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
@@ -844,9 +806,7 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
             representation["business_feature"] = (
                 BusinessFeatureSerializer(
                     instance=instance.business_feature,
-                    context={
-                        "user": user
-                    }
+                    context=self.context
                 ).data
             )
         else:
@@ -854,17 +814,6 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
 
         return representation
 
-    def _get_user_context(self):
-        """
-        Utility function to retrieve user from the context.
-        Raises an error if user is not provided.
-        Space Complexity: O(1)
-        Time Complexity: O(1)
-        """
-        user = self.context.get("user", None)
-
-        return user
-
 
 class UserSubscriptionPlanSerializer(serializers.ModelSerializer):
     class Meta:
@@ -9,20 +9,14 @@ from accounts.models.users import User
 from accounts.models.account import (PhoneNumberVerificationOTP,
                                      EmailVerificationOTP)
 
-import base64
-
 
 class UserSerializer(serializers.ModelSerializer):
 
     query_id = serializers.SerializerMethodField()
 
     def get_query_id(self, obj):
-        # Assuming that `obj.query_id` contains the binary data
-        binary_data = obj.query_id
-        if binary_data:
-            # Encode the binary data to Base64
-            return base64.b64encode(binary_data).decode('utf-8')
-        return None
+        # Encoded from `pk`, see `QueryIDMixin`
+        return obj.public_query_id
 
     class Meta:
         model = User
@@ -49,6 +43,14 @@ class UserSerializer(serializers.ModelSerializer):
             }
         }
 
+    def __init__(self, *args, fields: list = None, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # Only the requested fields, e.g. `?fields=` of user listings
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     def to_representation(self, instance):
         representation = super().to_representation(instance)
 
@@ -72,7 +74,7 @@ class UserSerializer(serializers.ModelSerializer):
         # at times when it is severly needed. So, this at first level,
         # helps to manipulate its visibility to external authorised applications.
         if instance._pk_hidden:
-            representation.pop("query_id")
+            representation.pop("query_id", None)
 
         return representation
 
@@ -1,10 +1,20 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
+from django.db import transaction
 from django.apps import apps
 from django.dispatch import receiver
 
 from accounts.models.devices import DeviceWallet
 
 from utilities.generators.tokens import DeviceAuthenticator
+from utilities.pricing import plans_priced_with, refresh_plan_price_snapshots
+from utilities.executor import background
+
+
+PRICED_PLAN_MODELS = (
+    "SubscriptionPlan", "DefaultFeature", "TeamGoalFeature",
+    "AIConflictResolutionAssistantFeature", "BusinessFeature",
+    "MultiLevelMarketingFeature", "AIMarketingAssistantFeature",
+)
 
 
 # @receiver(post_save, sender=apps.get_model('accounts', 'User'))
@@ -26,13 +36,59 @@ def create_user_device(sender, instance, created, **kwargs):
     if created:
 
         # Creating Device Wallet
-        device_wallet_instance = DeviceWallet.objects.create(
-            synced_amount=(0).to_bytes(8, byteorder='big', signed=True),
-            amount_in_sync_transition=(0).to_bytes(8, byteorder='big', signed=True),
-            unsynced_amount=(0).to_bytes(8, byteorder='big', signed=True))
+        device_wallet_instance = DeviceWallet.objects.create()
 
         instance.wallet = device_wallet_instance
 
         # Creating Device Tokens
         DeviceAuthenticator(
             instance=instance, database_actions=True).generate_tokens()
+
+
+def schedule_plan_price_refresh(plan_pks=None):
+    # Rebuilt once the change is committed, off the request thread
+    transaction.on_commit(
+        lambda: background.submit(
+            "default", refresh_plan_price_snapshots, plan_pks
+        )
+    )
+
+
+def refresh_plan_prices_on_save(sender, instance, raw=False, **kwargs):
+    """
+    Signal to rebuild the price snapshots of the plans a saved plan
+    or plan feature is part of
+    """
+
+    if raw:
+        return
+
+    plan_pks = plans_priced_with(instance)
+
+    if plan_pks:
+        schedule_plan_price_refresh(plan_pks)
+
+
+def refresh_plan_prices_on_delete(sender, instance, **kwargs):
+    """
+    Signal to rebuild every plan price snapshot when a plan feature is
+    deleted (plans referencing it are updated without being saved)
+    """
+
+    schedule_plan_price_refresh()
+
+
+for model_name in PRICED_PLAN_MODELS:
+    post_save.connect(
+        refresh_plan_prices_on_save,
+        sender=apps.get_model("accounts", model_name),
+        dispatch_uid=f"refresh_plan_prices_on_save_{model_name}"
+    )
+
+    # Deleting a plan deletes its snapshots along with it
+    if model_name != "SubscriptionPlan":
+        post_delete.connect(
+            refresh_plan_prices_on_delete,
+            sender=apps.get_model("accounts", model_name),
+            dispatch_uid=f"refresh_plan_prices_on_delete_{model_name}"
+        )
@@ -0,0 +1,18 @@
+from accounts.models.mlm_user import MLMCommissionSettlement
+
+from celery import shared_task
+
+
+@shared_task
+def settle_mlm_commissions():
+    # Rolling the commission ledger into member balances
+    settlement = MLMCommissionSettlement.objects.settle()
+
+    if settlement is None:
+        return "Nothing To Settle"
+
+    return (
+        f"Settled {settlement.entries_count} Commissions"
+        f" ({settlement.total_amount}) For"
+        f" {settlement.beneficiaries_count} Members"
+    )
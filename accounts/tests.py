@@ -1,3 +1,137 @@
-# from django.test import TestCase
+from django.core.management import call_command
+from django.test import TestCase, RequestFactory
 
-# Create your tests here.
+from accounts.models.plans import (
+    DefaultFeature, AIConflictResolutionAssistantFeature, TeamGoalFeature,
+    AIMarketingAssistantFeature, MultiLevelMarketingFeature, BusinessFeature,
+    SubscriptionPlan
+)
+from accounts.registry import plan_features
+from accounts.benchmarks import generate_pyramid
+from accounts.managers.mlm import DOWNLINE_COLUMNS
+from accounts.models.mlm_user import MLMUser
+from accounts.views.plans import SubscriptionPlanView
+
+from io import StringIO
+
+import tempfile
+import json
+import csv
+import os
+
+
+class SubscriptionPlanListQueriesTest(TestCase):
+    """
+    Pins the number of queries of the plan listing: plans, all of their
+    features and their prices come from a single query.
+    """
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def create_plan(self, index: int) -> SubscriptionPlan:
+        business_feature = BusinessFeature.objects.create(
+            name=f"business {index}",
+            sale_deduction=1, rental_deduction=1,
+            storage_space=1024, consultation_hours=60,
+            marketing_assistant=AIMarketingAssistantFeature.objects.create(
+                name=f"marketing {index}"
+            ),
+            mlm_feature=MultiLevelMarketingFeature.objects.create(
+                name=f"mlm {index}"
+            )
+        )
+
+        return SubscriptionPlan.objects.create(
+            name=f"plan {index}", description="", is_active=True,
+            default_feature=DefaultFeature.objects.create(
+                name=f"default {index}"
+            ),
+            team_feature=TeamGoalFeature.objects.create(
+                name=f"team {index}",
+                conflict_resolver=(
+                    AIConflictResolutionAssistantFeature.objects.create(
+                        name=f"conflict {index}"
+                    )
+                )
+            ),
+            business_feature=business_feature
+        )
+
+    def list_plans(self):
+        return SubscriptionPlanView.as_view()(self.factory.get("/api/plans/"))
+
+    def test_query_count_does_not_grow_with_plans(self):
+        self.create_plan(1)
+
+        with self.assertNumQueries(1):
+            response = self.list_plans()
+
+        self.assertEqual(len(response.data), 1)
+
+        for index in range(2, 6):
+            self.create_plan(index)
+
+        with self.assertNumQueries(1):
+            response = self.list_plans()
+
+        self.assertEqual(len(response.data), 5)
+        self.assertIn("mlm_feature", response.data[0]["business_feature"])
+
+    def test_registry_has_every_feature(self):
+        for name in (
+            "DefaultFeature", "AIConflictResolutionAssistantFeature",
+            "TeamGoalFeature", "AIMarketingAssistantFeature",
+            "MultiLevelMarketingFeature", "BusinessFeature", "SubscriptionPlan"
+        ):
+            self.assertIn(name, plan_features)
+            self.assertEqual(plan_features.get(name).model.__name__, name)
+
+
+class ExportMLMDownlineCommandTest(TestCase):
+    """
+    The `export_mlm_downline` command, on a pyramid of 7 members: 2 on
+    the first level below the root, 4 on the second.
+    """
+
+    def setUp(self):
+        self.member_pks = generate_pyramid(7)
+        self.referral_code = MLMUser.objects.get(
+            pk=self.member_pks[0]
+        ).referral_code
+
+    def export(self, *args) -> str:
+        stdout = StringIO()
+        call_command(
+            "export_mlm_downline", self.referral_code, *args,
+            stdout=stdout, stderr=StringIO()
+        )
+
+        return stdout.getvalue()
+
+    def test_ndjson(self):
+        rows = [json.loads(line) for line in self.export().splitlines()]
+
+        self.assertEqual(
+            [row["member_id"] for row in rows], self.member_pks[1:]
+        )
+        self.assertEqual([row["level"] for row in rows], [1, 1, 2, 2, 2, 2])
+        self.assertEqual(set(rows[0]), set(DOWNLINE_COLUMNS))
+
+    def test_csv_resumed_into_a_file(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "downline.csv")
+
+            self.export("--output", "csv", "--file", path, "--max-depth", "1")
+            self.export(
+                "--output", "csv", "--file", path,
+                "--after", f"1:{self.member_pks[2]}"
+            )
+
+            with open(path, newline="") as export_file:
+                rows = list(csv.DictReader(export_file))
+
+        # One header, the resumed rows appended after the first ones
+        self.assertEqual(
+            [int(row["member_id"]) for row in rows], self.member_pks[1:]
+        )
@@ -1,8 +1,17 @@
 from django.urls import path, include
 from accounts.views.users import UserAPIView
+from accounts.views.mlm import MLMDownlineExportView
+from accounts.views.search import UserSearchView
+from accounts.views.imports import UserImportView, UserImportStatusView
 
 app_name = 'users'
 urlpatterns = [
     path('', UserAPIView.as_view(), name='users'),
     path('profiles/', include('accounts.urls.profiles')),
+    path('search/', UserSearchView.as_view(), name='search'),
+    path('import/', UserImportView.as_view(), name='import'),
+    path('import/<str:job_id>/', UserImportStatusView.as_view(),
+         name='import-status'),
+    path('mlm/<str:referral_code>/downline/',
+         MLMDownlineExportView.as_view(), name='mlm-downline'),
 ]
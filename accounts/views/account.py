@@ -70,7 +70,7 @@ class VerificationView(APIView):
             access, refresh = auth_tokens.get_token_pair()
 
             user_instance.is_active = True
-            user_instance.save()
+            user_instance.save(update_fields=["is_active", "datetime_updated"])
 
             if is_valid:
                 data = {}
@@ -9,7 +9,8 @@ from utilities.models.fields import validation
 from utilities.generators.otp import OTPGenerator
 from utilities.permissions import DeviceAuthPermission
 from utilities.permissions import GrantPermission
-from utilities.account import Verification
+from utilities.account import send_verification_code
+from utilities.executor import background
 from utilities import response
 
 # Importing `models` Modules From Package `accounts.models`
@@ -32,8 +33,6 @@ from accounts.views.user_actions.logout import Logout as UserLogout
 
 from difflib import SequenceMatcher
 
-import threading
-
 
 class RedirectLoginView(APIView):
 
@@ -200,16 +199,12 @@ class RequestLoginOTP(APIView):
         # Determining the verification type
         verification_type = "email" if user_instance.email else "phone"
 
-        # Creating a thread for the appropriate verification method
-        send_verification_thread = threading.Thread(
-            target=getattr(
-                Verification(user=user_instance, model=LoginOTP),
-                verification_type
-            )
+        # Sending the OTP through the appropriate verification method
+        background.submit(
+            "notifications", send_verification_code,
+            user_instance.pk, LoginOTP._meta.model_name, verification_type
         )
 
-        send_verification_thread.start()
-
         return Response(status=status.HTTP_200_OK)
 
 
@@ -289,7 +284,7 @@ class ChangePasswordAPIView(APIView):
 
             request.user.password = validated_password
 
-            request.user.save()
+            request.user.save(update_fields=["password", "datetime_updated"])
 
         else:
             response.errors(
@@ -0,0 +1,90 @@
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser
+from rest_framework import status
+
+from accounts.imports import IMPORT_FORMATS, import_status, submit_import
+
+from utilities import response
+
+import os
+
+
+class UserImportView(APIView):
+    """
+    Imports the users of an uploaded CSV or JSONL `file` (the format is
+    guessed from its extension unless `?format=` is given) in the
+    background, see `UserImporter`. `?notify=false` skips sending
+    verification codes.
+
+    Responds with the id of the import job, whose progress and report
+    are served by `UserImportStatusView`.
+    """
+
+    permission_classes = (IsAdminUser,)
+    parser_classes = (MultiPartParser,)
+
+    def post(self, request):
+        upload = request.FILES.get("file")
+
+        if upload is None:
+            response.errors(
+                field_error="No File Uploaded",
+                for_developer="Users Should Be Uploaded As `file`",
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        input_format = request.query_params.get("format") or (
+            os.path.splitext(upload.name)[1].lstrip(".")
+        )
+
+        if input_format.lower() not in IMPORT_FORMATS:
+            response.errors(
+                field_error="Unsupported File Format",
+                for_developer=(
+                    f"Format Should Be One Of: {', '.join(IMPORT_FORMATS)}"
+                ),
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        notify = request.query_params.get("notify", "true").lower() != "false"
+
+        job_id = submit_import(upload, input_format.lower(), notify=notify)
+
+        if job_id is None:
+            response.errors(
+                field_error="Too Many Imports In Progress, Try Again Later",
+                for_developer="The `imports` Background Queue Is Full",
+                code="SERVICE_UNAVAILABLE",
+                status_code=503
+            )
+
+        return Response(
+            {"job_id": job_id, "status": "QUEUED"},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+class UserImportStatusView(APIView):
+    """
+    Status of an import job (QUEUED, RUNNING, DONE or FAILED), with its
+    report (`created` and `errors`) once done.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, job_id):
+        job = import_status(job_id)
+
+        if job is None:
+            response.errors(
+                field_error="Import Not Found",
+                for_developer=f"No Import Job `{job_id}` (Or It Expired)",
+                code="NOT_FOUND",
+                status_code=404
+            )
+
+        return Response({"job_id": job_id, **job}, status=status.HTTP_200_OK)
@@ -0,0 +1,100 @@
+from django.conf import settings
+
+from rest_framework.views import APIView
+from rest_framework.permissions import IsAdminUser
+
+from accounts.models.mlm_user import MLMUser, MLMClosure
+from accounts.managers.mlm import DOWNLINE_COLUMNS
+
+from utilities import response
+from utilities.streaming import FORMATS, stream_response
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+def parse_downline_cursor(value: str) -> tuple:
+    """`level:member_id` keyset cursor, as found in the last exported row."""
+
+    if not value:
+        return None
+
+    try:
+        level, member_id = (int(part) for part in value.split(":"))
+    except ValueError:
+        response.errors(
+            field_error="Invalid Cursor",
+            for_developer=(
+                f"Cursor `{value}` Should Be `<level>:<member_id>`,"
+                " Taken From The Last Row Received"
+            ),
+            code="BAD_REQUEST",
+            status_code=400
+        )
+
+    return level, member_id
+
+
+class MLMDownlineExportView(APIView):
+    """
+    Streams the whole downline of an MLM user, identified by their
+    referral code, as NDJSON (default) or CSV (`?output=csv`).
+
+    Rows are read through a server-side cursor in chunks and written as
+    they come, so memory stays flat whatever the size of the downline.
+    An interrupted export resumes with `?after=<level>:<member_id>` of
+    the last row received.
+    """
+
+    permission_classes = (IsAdminUser,)
+
+    def get(self, request, referral_code: str):
+        output = request.query_params.get("output", "ndjson").lower()
+
+        if output not in FORMATS:
+            response.errors(
+                field_error="Unsupported Output Format",
+                for_developer=(
+                    f"Output Should Be One Of: {', '.join(FORMATS)}"
+                ),
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        root_pk = MLMUser.objects.filter(
+            referral_code=referral_code
+        ).values_list("pk", flat=True).first()
+
+        if root_pk is None:
+            response.errors(
+                field_error="MLM User Not Found",
+                for_developer=(
+                    f"No MLM User With Referral Code `{referral_code}`"
+                ),
+                code="NOT_FOUND",
+                status_code=404
+            )
+
+        max_depth = request.query_params.get("max_depth")
+
+        if max_depth is not None and not max_depth.isdigit():
+            response.errors(
+                field_error="Invalid Maximum Depth",
+                for_developer="`max_depth` Should Be A Positive Integer",
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        chunk_size = app_settings.get("EXPORT_CHUNK_SIZE", 2000)
+
+        rows = MLMClosure.objects.downline_rows(
+            root_pk,
+            after=parse_downline_cursor(request.query_params.get("after")),
+            max_depth=int(max_depth) if max_depth else None
+        ).iterator(chunk_size=chunk_size)
+
+        return stream_response(
+            rows, list(DOWNLINE_COLUMNS), output=output,
+            filename=f"downline-{referral_code}", chunk_size=chunk_size
+        )
@@ -12,6 +12,7 @@ from accounts.models.plans import (
     SubscriptionPlan, UserSubscriptionPlan
 )
 from accounts.models.users import User
+from accounts.registry import plan_features, PlanFeature
 
 from accounts.serializers.plans import (
     DefaultFeatureSerializer,
@@ -20,12 +21,12 @@ from accounts.serializers.plans import (
 )
 
 from utilities import response
+from utilities.pricing import PricingEngine, with_snapshot_price
 from utilities.views.accounts.plans import check_user_plan_decorator
 
 from typing import Union, Optional
 
 import base64
-import importlib
 
 
 class PlanFeatureAPIView(APIView):
@@ -39,49 +40,27 @@ class PlanFeatureAPIView(APIView):
         )
         return user
 
-    def get_serializer_class(
-        self, plan_feature
-    ) -> serializers.Serializer:
-
-        plan_feature = f"{plan_feature}Serializer"
+    def get_plan_feature(self, plan_feature: str) -> PlanFeature:
+        feature = plan_features.get(plan_feature)
 
-        try:
-            # Dynamically import the serializers module
-            # from accounts.serializers.plans
-            module = importlib.import_module(
-                "accounts.serializers.plans"
-            )
-
-            # Attempt to get the serializer class from the module
-            serializer_class = getattr(module, plan_feature, None)
-
-            if serializer_class is None:
-                # Return None if the feature does
-                # not match any serializer class
-                response.errors(
-                    field_error="Plan feature not found.",
-                    for_developer=(
-                        f"Serializer class with name: {plan_feature}"
-                        " not found."
-                    ),
-                    code="INTERNAL_SERVER_ERROR",
-                    status_code=500
-                )
-
-            # Return the found serializer class
-            return serializer_class
-
-        except ImportError as e:
-            # Handle case where the module cannot be imported
+        if feature is None:
             response.errors(
                 field_error="Plan feature not found.",
                 for_developer=(
-                    f"Error importing serializers: {e}"
+                    f"Plan feature with name: {plan_feature} not found"
                 ),
-                code="INTERNAL_SERVER_ERROR",
-                status_code=500
+                code="BAD_REQUEST",
+                status_code=400
             )
 
+        return feature
+
+    def get_serializer_class(
+        self, plan_feature
+    ) -> serializers.Serializer:
+
+        return self.get_plan_feature(plan_feature).serializer
+
     def get_serialized_data(
         self,
         # Single model instance or list of instances
@@ -142,41 +121,8 @@ class PlanFeatureAPIView(APIView):
     def get_model(
         self, plan_feature: str
     ) -> models.Model:
-        try:
-            # Dynamically import the serializers module
-            # from accounts.models.plans
-            module = importlib.import_module(
-                "accounts.models.plans"
-            )
 
-            # Attempt to get the model class from the module
-            model_class = getattr(
-                module, plan_feature, None
-            )
-
-            if model_class is None:
-                # Return None if the feature does
-                # not match any serializer class
-                response.errors(
-                    field_error="Plan feature not found.",
-                    for_developer=(
-                        f"Model class with name: {plan_feature} not found"
-                    ),
-                    code="BAD_REQUEST",
-                    status_code=400
-                )
-
-            # Return the found serializer class
-            return model_class
-
-        except ImportError as e:
-            # Handle case where the module cannot be imported
-            response.errors(
-                field_error="Plan feature not found.",
-                for_developer=f"Error importing model: {e}",
-                code="BAD_REQUEST",
-                status_code=400
-            )
+        return self.get_plan_feature(plan_feature).model
 
     def get_model_instance_by_pk(
         self, pk: int, plan_feature: str
@@ -186,8 +132,10 @@ class PlanFeatureAPIView(APIView):
             plan_feature=plan_feature
         )
 
+        # Related features are fetched with the instance so
+        # pricing it doesn't query for them one by one
         model_data = get_object_or_404(
-            model, pk=pk
+            model.objects.select_related(*model.priced_related()), pk=pk
         )
 
         return model_data
@@ -200,7 +148,9 @@ class PlanFeatureAPIView(APIView):
             plan_feature=plan_feature
         )
 
-        model_data = model.objects.all()
+        model_data = model.objects.select_related(
+            *model.priced_related()
+        )
 
         return model_data
 
@@ -321,6 +271,8 @@ class SubscriptionPlanView(APIView):
 
         plan_instances = SubscriptionPlan.objects.filter(
             name__in=main
+        ).select_related(
+            *SubscriptionPlan.priced_related()
         ).order_by("pk")
 
         return plan_instances
@@ -330,13 +282,17 @@ class SubscriptionPlanView(APIView):
 
         plan_instances = SubscriptionPlan.objects.filter(
             is_custom=True
+        ).select_related(
+            *SubscriptionPlan.priced_related()
         )
 
         return plan_instances
 
     def get(self, request):
 
-        plan_instances = SubscriptionPlan.objects.all()
+        plan_instances = SubscriptionPlan.objects.select_related(
+            *SubscriptionPlan.priced_related()
+        )
 
         lists = request.query_params.get(
             "lists", None
@@ -348,8 +304,22 @@ class SubscriptionPlanView(APIView):
             elif lists.lower() == "inbuilt":
                 plan_instances = self.get_custom_plans
 
+        user = (
+            request.user if request.user.is_authenticated else None
+        )
+
+        # The user's currency and rate are resolved once for the
+        # whole listing and plan prices are read from their
+        # snapshots in the same query as the plans
+        pricing = PricingEngine.for_user(user)
+        plan_instances = with_snapshot_price(
+            plan_instances, pricing.currency
+        )
+
         serializer_data = SubscriptionPlanSerializer(
-            plan_instances, many=True
+            plan_instances, many=True, context={
+                "user": user, "pricing": pricing
+            }
         ).data
 
         return Response(serializer_data)
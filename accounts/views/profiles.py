@@ -11,8 +11,6 @@ from utilities.permissions import GrantPermission
 from utilities import response
 from rest_framework.parsers import JSONParser
 
-import requests
-
 """
 User Profiles are created automatically when user creates an account
 so, no POST method in any of these classes.
@@ -74,21 +72,6 @@ class UserProfileView(APIView):
             return UserProfile.objects.all()
 
     def get(self, request):
-        # ip_address = request.META.get('REMOTE_ADDR')
-        url = "https://ipinfo.io/154.72.153.201/json"
-        response = requests.get(url)
-        data = response.json()
-
-        # ip_address = '8.8.8.8'
-        # Replace with the IP address you want to look up
-        ip_info = data
-
-        print(f"IP Address: {ip_info.get('ip')}")
-        print(f"""Location: {ip_info.get('city')}, {ip_info.get('region')},
-              {ip_info.get('country')}""")
-        print(f"Latitude/Longitude: {ip_info.get('loc')}")
-        print("Device Type: Not available (IP addresses do not"
-              " inherently provide device type information)")
         # Access query parameters
         query_params = request.query_params
 
@@ -99,11 +82,12 @@ class UserProfileView(APIView):
 
         if query_id:
             return Response(
-                self.get_user_profiles(query_id=query_id).data
+                UserProfileSerializer(
+                    self.get_user_profiles(query_id=query_id)).data
             )
 
         else:
-            Response(
+            return Response(
                 UserProfileSerializer(
                     self.get_user_profiles(), many=True).data)
 
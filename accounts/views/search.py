@@ -0,0 +1,130 @@
+from django.conf import settings
+
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework.permissions import IsAuthenticated
+from rest_framework import status
+
+from accounts.models.users import User
+
+from utilities import response
+
+from decimal import Decimal, InvalidOperation
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+SEARCH_COLUMNS = ("pk", "_pk_hidden", "username", "userprofile__legal_name")
+
+
+def parse_search_cursor(value: str) -> tuple:
+    """
+    `similarity:token` keyset cursor, as returned by the last page, the
+    token is a primary key encoded by `User.cursor_codec()`.
+    """
+
+    if not value:
+        return None
+
+    try:
+        similarity, token = value.rsplit(":", 1)
+        similarity = Decimal(similarity)
+
+        if not similarity.is_finite():
+            raise ValueError(similarity)
+
+        return similarity, User.cursor_codec().decode(token)
+    except (ValueError, InvalidOperation):
+        response.errors(
+            field_error="Invalid Cursor",
+            for_developer=(
+                f"Cursor `{value}` Should Be The `next` Value"
+                " Of The Previous Page"
+            ),
+            code="BAD_REQUEST",
+            status_code=400
+        )
+
+
+class UserSearchView(APIView):
+    """
+    Searches users by username, phone, email or legal name (`?q=`),
+    best matches first and `?limit=` at a time (capped). Following
+    pages are fetched with `?after=` set to the `next` of the previous
+    one. `?mode=autocomplete` matches prefixes of usernames and legal
+    names instead, for suggestions while typing.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        mode = request.query_params.get("mode", "rank").lower()
+        limit = request.query_params.get("limit")
+
+        min_length = app_settings.get("USER_SEARCH", {}).get(
+            "MIN_QUERY_LENGTH", 3
+        )
+
+        if len(query.lstrip("@")) < min_length:
+            response.errors(
+                field_error=f"Search With At Least {min_length} Characters",
+                for_developer=(
+                    f"`q` Should Hold At Least {min_length} Characters"
+                ),
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        if limit is not None and not limit.isdigit():
+            response.errors(
+                field_error="Invalid Limit",
+                for_developer="`limit` Should Be A Positive Integer",
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        limit = int(limit) if limit else None
+
+        if mode == "autocomplete":
+            users = list(
+                User.search.autocomplete(query, limit=limit).values_list(
+                    *SEARCH_COLUMNS
+                )
+            )
+            similarities = [None] * len(users)
+
+        else:
+            users = list(
+                User.search.rank(
+                    query, limit=limit,
+                    after=parse_search_cursor(request.query_params.get("after"))
+                ).values_list(*SEARCH_COLUMNS, "similarity")
+            )
+            similarities = [user[-1] for user in users]
+
+        encode = User.query_id_codec().encode
+
+        # As `UserSerializer`, hidden query ids are left out
+        results = [
+            {
+                "query_id": None if user[1] else encode(user[0]),
+                "username": user[2],
+                "legal_name": user[3],
+                "similarity": float(similarity) if similarity is not None else None,
+            }
+            for user, similarity in zip(users, similarities)
+        ]
+
+        # A full page may be followed by another one
+        next_cursor = None
+        if mode != "autocomplete" and len(users) == User.search.get_limit(limit):
+            next_cursor = (
+                f"{similarities[-1]}:{User.cursor_codec().encode(users[-1][0])}"
+            )
+
+        return Response(
+            {"results": results, "next": next_cursor},
+            status=status.HTTP_200_OK
+        )
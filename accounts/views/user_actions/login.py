@@ -18,14 +18,13 @@ from accounts.serializers.users import UserSerializer
 from accounts.models.devices import DeviceToken, Device, DeviceLoginHistory
 
 from utilities.generators.tokens import UserAuthToken, DeviceAuthenticator
-from utilities.account import OTP as _OTP, Verification
+from utilities.account import OTP as _OTP, send_verification_code
 from utilities.analysis.device_analysis import MatchDeviceAnalysis
+from utilities.geolocation import ip_geolocation
+from utilities.executor import background
+from utilities.middleware import get_device_meta_info
 from utilities import response
 
-import threading
-import requests
-import base64
-
 
 class HandleLoginData:
     def __init__(self, with_code: bool = False):
@@ -35,26 +34,29 @@ class HandleLoginData:
         if "Device-Authorization" in request.headers:
             header_values = request.headers["Device-Authorization"]
 
+            # Called from the request, a malformed header is the
+            # client's error
             try:
                 header_values = header_values.split(" ")
                 access_token = header_values[1]
-            except Exception as e:
+            except IndexError:
                 response.errors(
                     field_error="Login Failed",
-                    for_developer=(f"""Login Failed: Failed To Load
-                                   Device Access Token: {str(e)}"""),
-                    code="INTERNAL_SERVER_ERROR",
-                    status_code=1011,
-                    main_thread=False,
-                    param=user_instance.pk
+                    for_developer=(
+                        "Malformed `Device-Authorization` Header, Expected"
+                        " `<Type> <Device Access Token>`"
+                    ),
+                    code="BAD_REQUEST",
+                    status_code=400
                 )
 
             return access_token
         else:
             return None
 
-    def get_active_device_instance(self, request, user_instance):
-        access_token = self.get_device_access_token(request=request)
+    def get_active_device_instance(self, device_access_token,
+                                   device_meta_info, user_instance):
+        access_token = device_access_token
 
         if access_token:
             try:
@@ -110,9 +112,10 @@ class HandleLoginData:
             try:
                 device_instance = Device.objects.create(
                     user=user_instance,
-                    device_type=request.device_meta_info["device_type"],
-                    client_type=request.device_meta_info["client_clientversion"],
-                    operating_system=request.device_meta_info["os_osversion"],
+                    user_agent=device_meta_info["user_agent"],
+                    device_type=device_meta_info["device_type"],
+                    client_type=device_meta_info["client_clientversion"],
+                    operating_system=device_meta_info["os_osversion"],
                     _is_trusted=100)
 
             except Exception as e:
@@ -127,10 +130,13 @@ class HandleLoginData:
 
             return device_instance
 
-    def set_device_login_history(self, request, user_ip,
-                                 geolocation_data, user_instance):
+    def set_device_login_history(self, device_access_token, device_meta_info,
+                                 user_ip, geolocation_data, user_instance):
 
-        device_instance = self.get_active_device_instance(request=request)
+        device_instance = self.get_active_device_instance(
+            device_access_token=device_access_token,
+            device_meta_info=device_meta_info,
+            user_instance=user_instance)
 
         try:
             DeviceLoginHistory.objects.create(
@@ -147,27 +153,18 @@ class HandleLoginData:
                 param=user_instance.pk
             )
 
-    def get_geolocation(self, request, user_ip, callback, user_instance):
+    def get_geolocation(self, device_access_token, device_meta_info,
+                        user_ip, user_instance):
 
         try:
-            # Perform the geolocation lookup
-            url = f"https://ipinfo.io/{user_ip}/json/"
-            res = requests.get(url)
-            geolocation_data = res.json()
-            callback(request=request, geolocation_data=geolocation_data,
-                     user_ip=user_ip, user_instance=user_instance)
+            # Perform the geolocation lookup against the local dataset
+            geolocation_data = ip_geolocation.lookup(user_ip)
+            self.set_device_login_history(
+                device_access_token=device_access_token,
+                device_meta_info=device_meta_info, user_ip=user_ip,
+                geolocation_data=geolocation_data, user_instance=user_instance)
 
         # This Error Response Should Use Websocket (Real Time)
-        except requests.RequestException as e:
-            response.errors(
-                field_error="Failure To Get Device GeoLocation Data",
-                for_developer=f"{str(e)}",
-                code="SERVER_ERROR",
-                status_code=1011,
-                main_thread=False,
-                param=user_instance.pk
-            )
-
         except Exception as e:
             response.errors(
                 field_error="Failure To Get Device GeoLocation Data",
@@ -178,13 +175,21 @@ class HandleLoginData:
                 param=user_instance.pk
             )
 
-    def handle_geolocation(self, request, geolocation_data, user_ip, user_instance):
 
-        self.set_device_login_history(request=request, user_ip=user_ip,
-                                      geolocation_data=geolocation_data,
-                                      user_instance=user_instance)
+def record_login_geolocation(user_pk: int, user_ip: str,
+                             device_access_token: str, device_meta_info: dict,
+                             with_code: bool = False):
+    """
+    Background job recording the device and login history of a login.
+    Only takes JSON serializable arguments so it can run on Celery too.
+    """
+
+    user_instance = User.objects.get(pk=user_pk)
 
-        return not None
+    HandleLoginData(with_code=with_code).get_geolocation(
+        device_access_token=device_access_token,
+        device_meta_info=device_meta_info, user_ip=user_ip,
+        user_instance=user_instance)
 
 
 # Login view class that extends from APIView
@@ -205,12 +210,8 @@ class Login:
         return
 
     def get_query_id(self, user_instance):
-        # Assuming that `user_instance.query_id` contains the binary data
-        binary_data = user_instance.query_id
-        if binary_data:
-            # Encode the binary data to Base64
-            return base64.b64encode(binary_data).decode('utf-8')
-        return None
+        # Encoded from `pk`, see `QueryIDMixin`
+        return user_instance.public_query_id
 
     # Handle HTTP Post method
     def login(self):
@@ -240,19 +241,15 @@ class Login:
             # Perform geolocation lookup asynchronously
             user_ip = self.request.device_meta_info["ip"]
 
-            # Perform geolocation lookup in a separate thread
-            geolocation_thread = threading.Thread(
-                target=HandleLoginData().get_geolocation,
-                args=(
-                    self.request,
-                    user_ip,
-                    HandleLoginData().handle_geolocation,
-                    user_instance,
-                )
+            # Record the device and its login history in the background
+            background.submit(
+                "geolocation", record_login_geolocation,
+                user_instance.pk, user_ip,
+                HandleLoginData().get_device_access_token(
+                    request=self.request, user_instance=user_instance),
+                get_device_meta_info(self.request)
             )
 
-            geolocation_thread.start()
-
             tokens_data = {
                 "access": {
                     "token": access[0],
@@ -404,17 +401,22 @@ class LoginWithCode:
             self.check_verification_validity(
                 user_instance=user_instance, otp=otp)
 
-            # Creating a thread for the appropriate verification method
+            send_code_to = self.request.data.get("send_code_to")
+
+            if send_code_to not in ("email", "phone"):
+                response.errors(
+                    field_error="`send_code_to` Must Be `email` Or `phone`",
+                    for_developer="`send_code_to` Must Be `email` Or `phone`",
+                    code="BAD_REQUEST",
+                    status_code=400
+                )
+
+            # Sending the OTP through the appropriate verification method
             try:
-                send_verification_thread = threading.Thread(
-                    target=getattr(
-                        Verification(
-                            user=user_instance, model=LoginOTP
-                        ),
-                        self.request.data["send_code_to"]
-                    )
+                background.submit(
+                    "notifications", send_verification_code,
+                    user_instance.pk, LoginOTP._meta.model_name, send_code_to
                 )
-                send_verification_thread.start()
             except Exception as e:
                 response.errors(
                     field_error="Failure To Send OTP",
@@ -442,18 +444,15 @@ class LoginWithCode:
             # Perform geolocation lookup asynchronously
             user_ip = self.request.device_meta_info["ip"]
 
-            # Perform geolocation lookup in a separate thread
-            geolocation_thread = threading.Thread(
-                target=HandleLoginData(with_code=True).get_geolocation,
-                args=(
-                    self.request, user_ip,
-                    HandleLoginData(with_code=True).handle_geolocation,
-                    user_instance
-                )
+            # Record the device and its login history in the background
+            background.submit(
+                "geolocation", record_login_geolocation,
+                user_instance.pk, user_ip,
+                HandleLoginData(with_code=True).get_device_access_token(
+                    request=self.request, user_instance=user_instance),
+                get_device_meta_info(self.request), True
             )
 
-            geolocation_thread.start()
-
             tokens_data = {
                 "access": {
                     "token": access[0],
@@ -544,7 +543,7 @@ class LoginWithoutDeviceToken:
 
             # Setting User Data
             data["user"] = {}
-            data["user"]["query_id"] = user_instance["query_id"]
+            data["user"]["query_id"] = user_instance.public_query_id
             data["user"]["tokens"] = tokens_data
 
             # Setting Device Data
@@ -1,6 +1,6 @@
 from typing import List, Union
 from django.conf import settings
-from django.utils.timezone import now
+from django.db import transaction
 
 # Import necessary libraries and modules from rest_framework
 from rest_framework.views import APIView
@@ -8,45 +8,95 @@ from rest_framework.response import Response
 from rest_framework import status
 
 # Import models from accounts models
-from accounts.models.users import User, APIKey
+from accounts.models.users import User
 from accounts.models.devices import Device, DeviceLoginHistory
-from accounts.models.settings import UserSettings
-from accounts.models.mlm_user import MLMUser
-from accounts.models.profiles import UserProfile
 from accounts.models.account import (
-    PhoneNumberVerificationOTP, EmailVerificationOTP, AccountVerification,
-    KYCVerificationCheck, RealEstateCertification
+    PhoneNumberVerificationOTP, EmailVerificationOTP
 )
+from accounts.registration import RegistrationUnitOfWork
 
 # Import serializers from accounts serializer
 from accounts.serializers.users import UserSerializer
 
 from utilities import response
-from utilities.account import Verification
-from utilities.generators.string_generators import QueryID
+from utilities.account import send_verification_code
+from utilities.executor import background
+from utilities.middleware import get_device_meta_info
+from utilities.websockets.pending import PendingDelivery
+from utilities.geolocation import ip_geolocation
 from utilities.permissions import GrantPermission
+from utilities.streaming import FORMATS, stream_response
 
-from rest_framework.pagination import PageNumberPagination
+from datetime import datetime, timedelta, timezone as dt_timezone
 
-from channels.layers import get_channel_layer
-from asgiref.sync import async_to_sync
 
-from datetime import timedelta
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
 
-import time
-import requests
-import threading
-import secrets
 
+# Fields user listings can be restricted to with `?fields=`
+LISTING_FIELDS = tuple(
+    field for field in UserSerializer.Meta.fields if field != "password"
+)
 
-# Load Application Settings
-app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def user_cursor(datetime_joined: datetime, pk: int) -> str:
+    """
+    `<microseconds since epoch>:<token>` keyset cursor of a user, the
+    token is its primary key encoded by `User.cursor_codec()`.
+    """
 
+    microseconds = (datetime_joined - EPOCH) // timedelta(microseconds=1)
 
-class CustomPageNumberPagination(PageNumberPagination):
-    page_size = 10  # Number of items per page
-    page_size_query_param = 'page_size'
-    max_page_size = 1
+    return f"{microseconds}:{User.cursor_codec().encode(pk)}"
+
+
+def parse_user_cursor(value: str) -> tuple:
+
+    if not value:
+        return None
+
+    try:
+        microseconds, token = value.split(":")
+
+        return (
+            EPOCH + timedelta(microseconds=int(microseconds)),
+            User.cursor_codec().decode(token)
+        )
+    except ValueError:
+        response.errors(
+            field_error="Invalid Cursor",
+            for_developer=(
+                f"Cursor `{value}` Should Be The `next` Value"
+                " Of The Previous Page"
+            ),
+            code="BAD_REQUEST",
+            status_code=400
+        )
+
+
+def parse_listing_fields(value: str) -> list:
+
+    if not value:
+        return list(LISTING_FIELDS)
+
+    fields = [field.strip() for field in value.split(",") if field.strip()]
+    unknown = set(fields) - set(LISTING_FIELDS)
+
+    if unknown or not fields:
+        response.errors(
+            field_error="Invalid Fields",
+            for_developer=(
+                f"Unknown Fields: {', '.join(sorted(unknown))}."
+                f" `fields` Should Be Among: {', '.join(LISTING_FIELDS)}"
+            ),
+            code="BAD_REQUEST",
+            status_code=400
+        )
+
+    return fields
 
 
 # User view class that extends from APIView
@@ -57,8 +107,6 @@ class UserAPIView(APIView):
             return [GrantPermission()]
         return []
 
-    pagination_class = CustomPageNumberPagination
-
     def check_remember_me_instance(self, remember_me):
         if not isinstance(remember_me, bool):
             response.errors(
@@ -85,22 +133,24 @@ class UserAPIView(APIView):
         # Validating is request body (data is valid)
         if serializer.is_valid():
 
-            # Save the user instance to the database
-            user_instance = serializer.save()
+            # The user and its companion rows (profile, settings,
+            # verification checks, ...) are created together or not at all
+            with transaction.atomic():
+                user_instance = serializer.save()
+
+                user_instance._pk_hidden = False
+                user_instance.save(update_fields=["_pk_hidden"])
 
-            user_instance._pk_hidden = False
-            user_instance.save()
+                RegistrationUnitOfWork(user_instance).commit()
 
             # Perform geolocation lookup asynchronously
             user_ip = request.device_meta_info["ip"]
 
-            # Perform geolocation lookup in a separate thread
-            geolocation_thread = threading.Thread(
-                target=self._completion,
-                args=(request.device_meta_info, user_ip,
-                      self.handle_geolocation, user_instance))
-
-            geolocation_thread.start()
+            # Completing the registration in the background
+            background.submit(
+                "registration", complete_registration,
+                user_instance.pk, user_ip, get_device_meta_info(request)
+            )
 
             # Determining the verification type
             if user_instance.email:
@@ -108,15 +158,12 @@ class UserAPIView(APIView):
             else:
                 verification_type = ["phone", PhoneNumberVerificationOTP]
 
-            # Creating a thread for the appropriate verification method
-            send_verification_thread = threading.Thread(
-                target=getattr(
-                    Verification(user=user_instance, model=verification_type[1]),
-                    verification_type[0])
+            # Sending the OTP through the appropriate verification method
+            background.submit(
+                "notifications", send_verification_code, user_instance.pk,
+                verification_type[1]._meta.model_name, verification_type[0]
             )
 
-            send_verification_thread.start()
-
             # Create the response data
 
             data = {}
@@ -135,102 +182,15 @@ class UserAPIView(APIView):
         # If the data is not valid, return validation errors
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-    def generate_api_key(
-            self, user, name=None, expires_in_days=None, scopes=None
-    ):
-        """
-        Generate and associate an API key with the user.
-
-        Args:
-            user: User instance.
-            name (str): A name for the API key (optional).
-            expires_in_days (int): Number of days until the key expires (optional).
-            scopes (str): A comma-separated list of scopes (optional).
-
-        Returns:
-            APIKey: The created APIKey instance.
-        """
-        key = secrets.token_urlsafe(32)
-        expires_at = None
-        if expires_in_days:
-            expires_at = now() + timedelta(days=expires_in_days)
-        return APIKey.objects.create(
-            user=user,
-            key=key,
-            name=name,
-            expires_at=expires_at,
-            scopes=scopes
-        )
-
-    def _user_completion(self, instance):
-        if instance:
-            UserProfile.objects.create(user=instance)
-
-            UserSettings.objects.create(user=instance)
-
-            real_estate_certifications_instance = (
-                RealEstateCertification.objects.create(
-                    user=instance
-                )
-            )
-
-            kyc_verification_check_instance = (
-                KYCVerificationCheck.objects.create(
-                    user=instance,
-                    real_estate_certifications=real_estate_certifications_instance
-                )
-            )
-
-            AccountVerification.objects.create(
-                user=instance,
-                kyc_verification_check=kyc_verification_check_instance
-            )
-
-            if instance.is_mlm_user:
-                MLMUser.objects.create(user=instance)
-
-            # if user is external user
-            if instance.user_type.lower() == instance.UserType.EXTERNAL.lower():
-                self.generate_api_key(
-                    user=instance,
-                    expires_in_days=(
-                        app_settings.get("API_KEY", {}).get("EXPIRES_IN", 14)
-                    )
-                )
-
     def _completion(self, device_meta_info, user_ip, callback, user_instance):
         try:
-            self._user_completion(instance=user_instance)
-        except Exception as e:
-            response.errors(
-                field_error="Failure To Get Device GeoLocation Data",
-                for_developer=f"{str(e)}",
-                code="SERVER_ERROR",
-                status_code=1011,
-                main_thread=False,
-                param=user_instance.pk
-            )
-
-        try:
-            # Perform the geolocation lookup
-            url = f"https://ipinfo.io/{user_ip}/json/"
-            res = requests.get(url)
-            geolocation_data = res.json()
+            # Perform the geolocation lookup against the local dataset
+            geolocation_data = ip_geolocation.lookup(user_ip)
             callback(device_meta_info=device_meta_info,
                      geolocation_data=geolocation_data, user_ip=user_ip,
                      user_instance=user_instance)
 
         # This Error Response Should Use Websocket (Real Time)
-        except requests.RequestException as e:
-            response.errors(
-                field_error="Failure To Get Device GeoLocation Data",
-                for_developer=f"{str(e)}",
-                code="SERVER_ERROR",
-                status_code=1011,
-                main_thread=False,
-                param=user_instance.pk
-            )
-
         except Exception as e:
             response.errors(
                 field_error="Failure To Get Device GeoLocation Data",
@@ -282,11 +242,11 @@ class UserAPIView(APIView):
 
         data = {}
         data["user"] = {
-            "query_id": QueryID().get_query_id(user_instance.query_id)
+            "query_id": user_instance.public_query_id
         }
 
         user_device_instance = Device.objects.filter(
-            user__query_id=user_instance.query_id).last()
+            user=user_instance).last()
 
         # If User Device Was Created Successfully,
         # Extract The Device's Token Data
@@ -343,21 +303,10 @@ class UserAPIView(APIView):
         Tokens For The Device Making The Request Should Be Sent
         """
 
-        channel_layer = get_channel_layer()
-
-        time.sleep(35)
-
-        async def send_device_data():
-            await channel_layer.group_send(
-                f"user_{user_instance.pk}",
-                {
-                    'type': 'send.device_data',
-                    'device_data': data,
-                }
-            )
-
-        # Convert the asynchronous function to a synchronous one
-        async_to_sync(send_device_data)()
+        # Stored until the client's websocket subscribes to `user_{pk}`
+        # (flushed by `DeviceConsumer.connect`) or sent right away if
+        # it is already connected
+        PendingDelivery(user_pk=user_instance.pk).push(data)
 
         return
 
@@ -380,6 +329,99 @@ class UserAPIView(APIView):
             else None
         )
 
+    def list_users(self, request, fields: list) -> dict:
+        """
+        A page of users in the order they joined, the next one is
+        fetched with `?after=` set to the `next` value of this one.
+        """
+
+        listing_settings = app_settings.get("USER_LISTING", {})
+        limit = request.GET.get("limit")
+
+        if limit is not None and not limit.isdigit():
+            response.errors(
+                field_error="Invalid Limit",
+                for_developer="`limit` Should Be A Positive Integer",
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        limit = min(
+            int(limit) if limit else listing_settings.get("LIMIT", 20),
+            listing_settings.get("MAX_LIMIT", 100)
+        )
+
+        # `query_id` is encoded from `pk`, no need for the legacy column
+        columns = [field for field in fields if field != "query_id"]
+
+        users = list(
+            User.get_by.joined_after(
+                parse_user_cursor(request.GET.get("after"))
+            ).only(*columns, "datetime_joined", "_pk_hidden")[:limit]
+        )
+
+        next_cursor = None
+        if len(users) == limit:
+            next_cursor = user_cursor(users[-1].datetime_joined, users[-1].pk)
+
+        return {
+            "results": UserSerializer(users, many=True, fields=fields).data,
+            "next": next_cursor,
+        }
+
+    def stream_users(self, request, fields: list, output: str):
+        """
+        Every user (from `?after=` on) streamed as NDJSON or CSV, read
+        in chunks through a server-side cursor. Administrators only.
+        """
+
+        if not getattr(request.user, "is_staff", False):
+            response.errors(
+                field_error="Not Allowed To Export Users",
+                for_developer="Streaming User Listings Is For Staff Only",
+                code="FORBIDDEN",
+                status_code=403
+            )
+
+        if output not in FORMATS:
+            response.errors(
+                field_error="Unsupported Output Format",
+                for_developer=(
+                    f"Output Should Be One Of: {', '.join(FORMATS)}"
+                ),
+                code="BAD_REQUEST",
+                status_code=400
+            )
+
+        columns = ["pk", "_pk_hidden"] + [
+            field for field in fields if field != "query_id"
+        ]
+        positions = {column: index for index, column in enumerate(columns)}
+        encode = User.query_id_codec().encode
+
+        # As `UserSerializer`, hidden query ids are left out (blank here,
+        # rows of a stream share their columns)
+        def query_id(row):
+            return None if row[1] else encode(row[0])
+
+        chunk_size = app_settings.get("EXPORT_CHUNK_SIZE", 2000)
+
+        rows = User.get_by.joined_after(
+            parse_user_cursor(request.GET.get("after"))
+        ).values_list(*columns).iterator(chunk_size=chunk_size)
+
+        return stream_response(
+            (
+                [
+                    query_id(row) if field == "query_id"
+                    else row[positions[field]]
+                    for field in fields
+                ]
+                for row in rows
+            ),
+            fields, output=output, filename="users", chunk_size=chunk_size
+        )
+
     # Define a method that handles GET requests
     def get(self, request):
 
@@ -390,19 +432,17 @@ class UserAPIView(APIView):
             get_users = self.get_users(
                 is_single_user
                 if is_single_user
-                else is_multiple_users
+                else is_multiple_users.split(",")
             )
 
         else:
-            user_instance = User.objects.all()
-            serialized_data = UserSerializer(
-                user_instance, many=True
-            )
-            get_users = (
-                serialized_data.data
-                if serialized_data
-                else None
-            )
+            fields = parse_listing_fields(request.GET.get("fields"))
+            output = request.GET.get("output")
+
+            if output:
+                return self.stream_users(request, fields, output.lower())
+
+            get_users = self.list_users(request, fields)
 
         return (
             Response(
@@ -414,3 +454,17 @@ class UserAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
         )
+
+
+def complete_registration(user_pk: int, user_ip: str, device_meta_info: dict):
+    """
+    Background job creating the device and login history of a newly
+    registered user.
+    Only takes JSON serializable arguments so it can run on Celery too.
+    """
+
+    user_instance = User.objects.get(pk=user_pk)
+
+    view = UserAPIView()
+    view._completion(device_meta_info, user_ip,
+                     view.handle_geolocation, user_instance)
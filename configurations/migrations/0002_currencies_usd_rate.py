@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-19 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("configurations", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="currencies",
+            name="usd_rate",
+            field=models.DecimalField(
+                blank=True, decimal_places=10, max_digits=24, null=True
+            ),
+        ),
+    ]
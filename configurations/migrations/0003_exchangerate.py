@@ -0,0 +1,40 @@
+# Generated by Django 5.1.1 on 2026-10-19 14:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("configurations", "0002_currencies_usd_rate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExchangeRate",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("code", models.CharField(max_length=3)),
+                ("rate", models.DecimalField(decimal_places=10, max_digits=24)),
+            ],
+            options={
+                "verbose_name": "Exchange Rate",
+                "verbose_name_plural": "Exchange Rates",
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("code", "date"),
+                        name="exchange_rate__unique_code_per_date",
+                    )
+                ],
+            },
+        ),
+    ]
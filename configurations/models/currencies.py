@@ -6,9 +6,40 @@ class Currencies(models.Model):
     symbol = models.CharField(max_length=10, null=False, blank=False)
     code = models.CharField(max_length=3, unique=True, null=False, blank=False)
 
+    # Units of this currency per US Dollar, copied from the latest exchange
+    # rates snapshot so prices can be converted (sorted, filtered) in SQL
+    usd_rate = models.DecimalField(
+        max_digits=24, decimal_places=10, null=True, blank=True
+    )
+
     class Meta:
         verbose_name = 'Currency'
         verbose_name_plural = 'Currencies'
 
     def __str__(self):
         return f"{self.name} {self.code}"
+
+
+class ExchangeRate(models.Model):
+    """
+    Daily history of exchange rates from US Dollar, one row per currency
+    and day: the first rates snapshot published that day.
+    """
+
+    date = models.DateField()
+    code = models.CharField(max_length=3)
+    rate = models.DecimalField(max_digits=24, decimal_places=10)
+
+    class Meta:
+        verbose_name = 'Exchange Rate'
+        verbose_name_plural = 'Exchange Rates'
+        constraints = [
+            # Also the (code, date) index point-in-time lookups use
+            models.UniqueConstraint(
+                fields=['code', 'date'],
+                name='exchange_rate__unique_code_per_date'
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.code} {self.rate} ({self.date})"
@@ -1,5 +1,7 @@
 from configurations.utilities.currencies import ExchangeRates
 
+from utilities.pricing import rebuild_plan_price_snapshots
+
 from celery import shared_task
 
 
@@ -7,5 +9,10 @@ from celery import shared_task
 def update_exchange_rates_cache():
     # Instantiate the ExchangeRates class
     exchange_rates = ExchangeRates()
-    # Call the store_exchange_rates_to_cache method to update the cache
-    exchange_rates.store_exchange_rates_to_cache()
+    # Publishing a new rates snapshot. This is the only place rates are
+    # fetched from the exchange rate API; readers only use the snapshot
+    rates = exchange_rates.store_exchange_rates_to_cache()
+
+    # Plan prices in every currency follow the new rates
+    if rates is not None:
+        rebuild_plan_price_snapshots(rates=rates)
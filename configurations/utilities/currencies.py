@@ -1,50 +1,285 @@
 from django.core.cache import cache
 from django.conf import settings
+from django.db import DatabaseError
+from django.utils import timezone
+
+from datetime import date, datetime
 from decimal import Decimal
+from functools import lru_cache
+from types import MappingProxyType
+
+import threading
 import requests
+import logging
+import time
+import uuid
+
+
+logger = logging.getLogger(__name__)
 
 # Define a timeout value (1 month)
 ONE_MONTH_TIMEOUT = 30 * 24 * 60 * 60  # 1 month
 BASE_CURRENCY = 'USD'
 
+# All rates live in a single blob, published together with a version key.
+# Processes only read the (tiny) version key to know if their copy is stale.
+SNAPSHOT_CACHE_KEY = 'exchange_rates_snapshot'
+VERSION_CACHE_KEY = 'exchange_rates_version'
+REFRESH_LOCK_CACHE_KEY = 'exchange_rates_refresh_requested'
+
+# How often a process checks the version key (in seconds)
+VERSION_CHECK_INTERVAL = 60
+
+# Snapshots older than this trigger a background refresh (in seconds)
+STALE_AFTER = 2 * 60 * 60
+
+# Past days of rates `HistoricalExchangeRates` keeps in memory
+HISTORY_CACHE_DAYS = 64
+
+
+class RateSnapshot:
+    """Immutable set of exchange rates from `BASE_CURRENCY`."""
+
+    def __init__(self, version: str = None, fetched_at=None, rates: dict = None):
+        self.version = version
+        self.fetched_at = fetched_at
+        self.rates = MappingProxyType(
+            {
+                code.upper(): Decimal(rate)
+                for code, rate in (rates or {}).items()
+            }
+        )
+
+    def get(self, code: str) -> Decimal:
+        if code.upper() == BASE_CURRENCY:
+            return Decimal(1)
+
+        return self.rates.get(code.upper())
+
+    @property
+    def is_stale(self) -> bool:
+        return self.fetched_at is None or (
+            timezone.now() - self.fetched_at
+        ).total_seconds() > STALE_AFTER
+
+
+class RateSnapshotStore:
+    """
+    Process-local, immutable copy of the exchange rates snapshot.
+
+    Reads never touch the network: the copy is swapped only when the
+    version key in the cache changes, and that key is checked at most
+    once every `VERSION_CHECK_INTERVAL` seconds. Refreshing the snapshot
+    is the job of the `update_exchange_rates_cache` task; readers only
+    request one when the snapshot is missing or stale, and keep serving
+    the copy they have meanwhile.
+    """
+
+    def __init__(self):
+        self._snapshot = RateSnapshot()
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current(self) -> RateSnapshot:
+        now = time.monotonic()
+
+        if (
+            self._checked_at is not None
+            and now - self._checked_at < VERSION_CHECK_INTERVAL
+        ):
+            return self._snapshot
+
+        with self._lock:
+            self._checked_at = now
+            version = cache.get(VERSION_CACHE_KEY)
+
+            if version is not None and version != self._snapshot.version:
+                data = cache.get(SNAPSHOT_CACHE_KEY)
+
+                if data is not None:
+                    self._snapshot = RateSnapshot(**data)
+
+        if version is None or self._snapshot.is_stale:
+            self.request_refresh()
+
+        return self._snapshot
+
+    def request_refresh(self):
+        # Only one refresh request per window across all processes
+        if not cache.add(REFRESH_LOCK_CACHE_KEY, True, VERSION_CHECK_INTERVAL * 5):
+            return
+
+        # Imported lazily to avoid a circular import with the tasks module
+        from configurations.tasks import update_exchange_rates_cache
+
+        try:
+            update_exchange_rates_cache.delay()
+        except Exception as e:
+            logger.error(f"Failed To Request Exchange Rates Refresh: {str(e)}")
+
+    def invalidate(self):
+        self._checked_at = None
+
+
+rate_snapshots = RateSnapshotStore()
+
 
 class ExchangeRates:
+    def snapshot(self) -> RateSnapshot:
+        """Current exchange rates snapshot (no network access)."""
+        return rate_snapshots.current()
+
     def get_exchange_rate(self, to_currency: str = 'USD') -> Decimal:
         """Retrieve exchange rate for the specified currency."""
         if to_currency.upper() == BASE_CURRENCY:
             return Decimal(1)
 
-        # Generate a unique cache key for this currency
-        cache_key = f'exchange_rate_{to_currency.upper()}'
-        exchange_rate = cache.get(cache_key)
-
-        if exchange_rate is None:
-            # Fetch rates and store them in the cache
-            self.store_exchange_rates_to_cache()
-            exchange_rate = cache.get(cache_key)
-
-        return Decimal(exchange_rate or 0)
+        return self.snapshot().get(to_currency) or Decimal(0)
 
     def _fetch_exchange_rates(self) -> dict:
         """Fetch exchange rates from the external API."""
         api_key = settings.EXCHANGE_RATE_API
         url = f"https://v6.exchangerate-api.com/v6/{api_key}/latest/{BASE_CURRENCY}"
-        print(f"Fetching exchange rates from: {url}")
 
         try:
-            response = requests.get(url)
+            response = requests.get(url, timeout=10)
             response.raise_for_status()
             data = response.json()
             return data.get('conversion_rates', {})
-        except requests.RequestException as e:
-            print(f"Error fetching exchange rates: {e}")
+        except (requests.RequestException, ValueError) as e:
+            logger.error(f"Error Fetching Exchange Rates: {str(e)}")
             return {}
 
-    def store_exchange_rates_to_cache(self):
-        """Store exchange rates in the cache."""
+    def store_exchange_rates_to_cache(self) -> RateSnapshot:
+        """
+        Fetch the latest rates and publish them as a new snapshot.
+        On failure the previous snapshot keeps being served.
+        """
         rates = self._fetch_exchange_rates()
 
-        for currency, rate in rates.items():
-            # Create a unique cache key for each currency
-            cache_key = f'exchange_rate_{currency.upper()}'
-            cache.set(cache_key, Decimal(rate), timeout=ONE_MONTH_TIMEOUT)
+        if not rates:
+            return None
+
+        data = {
+            "version": uuid.uuid4().hex,
+            "fetched_at": timezone.now(),
+            "rates": {code.upper(): str(rate) for code, rate in rates.items()},
+        }
+
+        # The blob is written before the version key so readers never
+        # see a version whose snapshot isn't there yet
+        cache.set(SNAPSHOT_CACHE_KEY, data, timeout=None)
+        cache.set(VERSION_CACHE_KEY, data["version"], timeout=None)
+        cache.delete(REFRESH_LOCK_CACHE_KEY)
+
+        rate_snapshots.invalidate()
+
+        snapshot = RateSnapshot(**data)
+        self.store_exchange_rates_to_database(snapshot)
+
+        return snapshot
+
+    def store_exchange_rates_to_database(self, snapshot: RateSnapshot) -> int:
+        """
+        Copy the snapshot's rates to `Currencies.usd_rate`, the rates
+        table prices are converted against in SQL, and add them to the
+        daily `ExchangeRate` history unless that day is already in it.
+        """
+        # Imported lazily, models import this module
+        from configurations.models.currencies import Currencies, ExchangeRate
+
+        day = timezone.localdate(snapshot.fetched_at)
+
+        try:
+            currencies = list(Currencies.objects.only("id", "code", "usd_rate"))
+
+            for currency in currencies:
+                currency.usd_rate = snapshot.get(currency.code)
+
+            updated = Currencies.objects.bulk_update(
+                currencies, ["usd_rate"], batch_size=500
+            )
+
+            # The first snapshot of the day is kept so conversions made
+            # for that day can always be reproduced
+            ExchangeRate.objects.bulk_create(
+                [
+                    ExchangeRate(date=day, code=code, rate=rate)
+                    for code, rate in snapshot.rates.items()
+                ],
+                batch_size=500, ignore_conflicts=True
+            )
+
+        except DatabaseError as e:
+            logger.error(f"Failed To Store Exchange Rates: {str(e)}")
+            return 0
+
+        return updated
+
+
+class HistoricalExchangeRates:
+    """
+    Point-in-time exchange rates from the daily `ExchangeRate` history.
+
+    The rates of a day are, per currency, the latest stored on or before
+    that day, so conversions are reproducible and never call the
+    exchange rate API. Past days no longer change: the most recently
+    used ones are kept in memory, while today's rates are read from the
+    database until the day is over.
+    """
+
+    def __init__(self, cache_days: int = HISTORY_CACHE_DAYS):
+        self._cached_rates_on = lru_cache(maxsize=cache_days)(
+            self._load_rates_on
+        )
+
+    def _load_rates_on(self, day: date) -> RateSnapshot:
+        # Imported lazily, models import this module
+        from configurations.models.currencies import ExchangeRate
+
+        # DISTINCT ON (code), answered from the (code, date) index
+        rates = ExchangeRate.objects.filter(
+            date__lte=day
+        ).order_by(
+            "code", "-date"
+        ).distinct(
+            "code"
+        ).values_list("code", "rate")
+
+        return RateSnapshot(version=day.isoformat(), rates=dict(rates))
+
+    def rates_on(self, day: date) -> RateSnapshot:
+        if isinstance(day, datetime):
+            day = timezone.localdate(day) if timezone.is_aware(day) else day.date()
+
+        if day >= timezone.localdate():
+            return self._load_rates_on(day)
+
+        return self._cached_rates_on(day)
+
+    def convert(
+            self, amount: Decimal, from_currency: str,
+            to_currency: str, on: date
+    ) -> Decimal:
+        """
+        Convert `amount` with the exchange rates of day `on`.
+
+        Returns:
+            Decimal: The unrounded converted amount, or None if either
+            currency had no known rate by then.
+        """
+        rates = self.rates_on(on)
+
+        from_rate = rates.get(from_currency)
+        to_rate = rates.get(to_currency)
+
+        if not from_rate or not to_rate:
+            return None
+
+        return Decimal(amount) * to_rate / from_rate
+
+    def clear(self):
+        self._cached_rates_on.cache_clear()
+
+
+historical_exchange_rates = HistoricalExchangeRates()
@@ -0,0 +1,40 @@
+from django.db import models
+from django.db.models.functions import NullIf, Round
+
+from configurations.models.currencies import Currencies
+
+
+class UnitQuerySet(models.QuerySet):
+    def with_price_in(self, currency: str) -> models.QuerySet:
+        """
+        Annotate units with `price_in_currency`: their cost converted into
+        `currency` in SQL, against the `Currencies.usd_rate` rates table,
+        so listings can be sorted and filtered by the viewer's price.
+        The annotation is NULL where a rate is missing.
+        """
+
+        target_rate = models.Subquery(
+            Currencies.objects.filter(
+                code=currency.upper()
+            ).values("usd_rate")[:1]
+        )
+
+        return self.annotate(
+            price_in_currency=Round(
+                models.ExpressionWrapper(
+                    models.F("cost") * target_rate
+                    / NullIf(models.F("currency__usd_rate"), 0),
+                    output_field=models.DecimalField(
+                        max_digits=34, decimal_places=10
+                    )
+                ),
+                2,
+                output_field=models.DecimalField(
+                    max_digits=24, decimal_places=2
+                )
+            )
+        )
+
+    def prices_in(self, currency: str) -> list:
+        """Converted price of every unit, see `Unit.get_prices`."""
+        return self.model.get_prices(self.select_related("currency"), currency)
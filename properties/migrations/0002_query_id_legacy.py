@@ -0,0 +1,27 @@
+# Generated by Django 5.1.1 on 2026-10-19 16:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("properties", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name=model_name,
+            name="query_id",
+            field=models.BinaryField(
+                blank=True, db_index=True, max_length=10000, null=True
+            ),
+        )
+        for model_name in (
+            "partition",
+            "roompartition",
+            "unit",
+            "building",
+            "residentialproperty",
+        )
+    ]
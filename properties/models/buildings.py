@@ -5,14 +5,12 @@ from properties.models.amenities import Amenity
 from properties.models.units import Unit
 
 from utilities import response
-from utilities.generators.string_generators import QueryID
+from utilities.models.query_ids import QueryIDMixin
 
 from datetime import date
 
-import uuid
 
-
-class Building(models.Model):
+class Building(QueryIDMixin, models.Model):
 
     class AvailabilityStatus(models.TextChoices):
         # Indicates that the property is available for rental
@@ -125,8 +123,9 @@ class Building(models.Model):
 
     partial_upload = models.BooleanField(default=False)
 
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True
+        null=True, blank=True, max_length=10000, db_index=True
     )
 
     class Meta:
@@ -173,16 +172,4 @@ class Building(models.Model):
                 status_code=405
             )
 
-        # Building user_id_generator parameters
-
-        data = [self.name, str(uuid.uuid5)]
-        data_length = sum(len(item) for item in data)
-
-        # Stopped building user_id_generator parameters
-
-        query_id_instance = QueryID(data=data, length=data_length)
-
-        # Generating query_id and saving it to database
-        self.query_id = query_id_instance.to_database()
-
         super().save(*args, **kwargs)
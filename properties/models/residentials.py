@@ -3,6 +3,7 @@ from django.contrib.gis.db import models
 from properties.models.buildings import Building
 from properties.models.amenities import Amenity
 from properties.models.environments import Environment
+from utilities.models.query_ids import QueryIDMixin
 
 
 class ResidentialPropertyType(models.Model):
@@ -30,7 +31,7 @@ class ResidentialPropertyTypeInclusive(models.Model):
         return f'{self.main} includes {includes}'
 
 
-class ResidentialProperty(models.Model):
+class ResidentialProperty(QueryIDMixin, models.Model):
 
     environment = models.OneToOneField(
         Environment, on_delete=models.CASCADE,
@@ -47,8 +48,9 @@ class ResidentialProperty(models.Model):
 
     partial_upload = models.BooleanField(default=False)
 
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True
+        null=True, blank=True, max_length=10000, db_index=True
     )
 
     class Meta:
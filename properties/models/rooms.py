@@ -1,12 +1,10 @@
 from django.contrib.gis.db import models
 from django.utils.translation import gettext_lazy as _
 
-from utilities.generators.string_generators import QueryID
+from utilities.models.query_ids import QueryIDMixin
 
-import uuid
 
-
-class Partition(models.Model):
+class Partition(QueryIDMixin, models.Model):
     class PartitionName(models.TextChoices):
         ROOM = 'room', 'Room'
         KITCHEN = 'kitchen', 'Kitchen'
@@ -20,8 +18,9 @@ class Partition(models.Model):
         unique=True, null=False, blank=False
     )
 
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True
+        null=True, blank=True, max_length=10000, db_index=True
     )
 
     def __str__(self) -> str:
@@ -31,31 +30,16 @@ class Partition(models.Model):
         verbose_name = 'Partition'
         verbose_name_plural = 'Partitions'
 
-    def save(self, *args, **kwargs) -> None:
-
-        # Building user_id_generator parameters
-
-        data = [self.name, str(uuid.uuid5)]
-        data_length = sum(len(item) for item in data)
-
-        # Stopped building user_id_generator parameters
-
-        query_id_instance = QueryID(data=data, length=data_length)
-
-        # Generating query_id and saving it to database
-        self.query_id = query_id_instance.to_database()
-
-        return super().save(*args, **kwargs)
-
 
-class RoomPartition(models.Model):
+class RoomPartition(QueryIDMixin, models.Model):
     partition = models.ForeignKey(
         Partition, null=False, blank=False, on_delete=models.CASCADE,
         help_text='Room Partition'
     )
     number = models.SmallIntegerField(default=1)
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True
+        null=True, blank=True, max_length=10000, db_index=True
     )
 
     def __str__(self) -> str:
@@ -67,19 +51,3 @@ class RoomPartition(models.Model):
     class Meta:
         verbose_name = 'Room Partition'
         verbose_name_plural = 'Room Partitions'
-
-    def save(self, *args, **kwargs) -> None:
-
-        # Building user_id_generator parameters
-
-        data = [self.name, str(uuid.uuid5)]
-        data_length = sum(len(item) for item in data)
-
-        # Stopped building user_id_generator parameters
-
-        query_id_instance = QueryID(data=data, length=data_length)
-
-        # Generating query_id and saving it to database
-        self.query_id = query_id_instance.to_database()
-
-        return super().save(*args, **kwargs)
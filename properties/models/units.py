@@ -1,15 +1,14 @@
 from django.contrib.gis.db import models
 
 from configurations.models.currencies import Currencies
-from configurations.utilities.currencies import ExchangeRates
 
 from properties.models.rooms import RoomPartition
-from utilities.generators.string_generators import QueryID
+from properties.managers.units import UnitQuerySet
+from utilities.models.query_ids import QueryIDMixin
+from utilities.pricing import convert_amounts
 
-import uuid
 
-
-class Unit(models.Model):
+class Unit(QueryIDMixin, models.Model):
     class UnitType(models.TextChoices):
         APARTMENT = 'apartment', 'Apartment'
         # SELF_CONTAINED = 'self_contained', 'Self Contained'
@@ -36,44 +35,44 @@ class Unit(models.Model):
         max_digits=10, decimal_places=2
     )
 
+    # Legacy ids, public ids are now encoded from `pk` (see `QueryIDMixin`)
     query_id = models.BinaryField(
-        null=False, blank=False, max_length=10000, db_index=True
+        null=True, blank=True, max_length=10000, db_index=True
     )
 
+    objects = UnitQuerySet.as_manager()
+
     def rooms_remaining(self) -> int:
         if self.rooms_taken > self.number_of_rooms:
             return 0
         else:
             return (self.number_of_rooms - self.rooms_taken)
 
-    def get_price(self, to_currency: str) -> str:
-        """
-        Converts the cost of a property to the specified currency.
+    @classmethod
+    def get_prices(cls, units, to_currency: str) -> list:
         """
-        # If the currency matches, return the cost directly
-        if self.currency.code.upper() == to_currency.upper():
-            return f'{self.cost} {self.currency.code}'
-
-        # Convert the property's cost currency to USD (Base Currency)
-        exchange_rate_instance = ExchangeRates()
-        property_equivalent_usd_rate = exchange_rate_instance.get_exchange_rate(
-            to_currency=self.currency.code.upper()
-        )
-
-        property_eqv_usd_cost = self.cost / property_equivalent_usd_rate
+        Converts the cost of many units to the specified currency at
+        once, loading the exchange rates a single time. Units should be
+        fetched with `select_related("currency")`.
 
-        # If the target currency is USD, return the USD equivalent
-        if to_currency.upper() == 'USD':
-            return f'{property_eqv_usd_cost} USD'
+        Returns:
+            list: A `Money` per unit, None where a rate is unknown.
+        """
+        units = list(units)
 
-        # Convert the USD cost to the target currency
-        # eqv = equivalent
-        user_eqv_usd_rate = exchange_rate_instance.get_exchange_rate(
-            to_currency=to_currency.upper()
+        return convert_amounts(
+            [unit.cost for unit in units],
+            [unit.currency.code for unit in units],
+            to_currency
         )
-        user_eqv_usd_cost = user_eqv_usd_rate * property_eqv_usd_cost
 
-        return f'{user_eqv_usd_cost} {to_currency.upper()}'
+    def get_price(self, to_currency: str) -> str:
+        """
+        Converts the cost of a property to the specified currency.
+        """
+        price = self.get_prices([self], to_currency)[0]
+
+        return str(price) if price is not None else None
 
     def save(self, *args, **kwargs):
         if not self.pk:
@@ -84,17 +83,4 @@ class Unit(models.Model):
                     name='US Dollar', code='USD'.upper(), symbol='$'
                 )
 
-        # Building user_id_generator parameters
-
-        data = [self.name, str(uuid.uuid5(uuid.NAMESPACE_DNS, self.name))]
-
-        data_length = sum(len(item) for item in data)
-
-        # Stopped building user_id_generator parameters
-
-        query_id_instance = QueryID(data=data, length=data_length)
-
-        # Generating query_id and saving it to database
-        self.query_id = query_id_instance.to_database()
-
         super().save(*args, **kwargs)
@@ -8,6 +8,7 @@ class BuildingSerializer(serializers.ModelSerializer):
     age = serializers.SerializerMethodField()
     number_of_rooms = serializers.SerializerMethodField()
     rooms_remaining = serializers.SerializerMethodField()
+    query_id = serializers.CharField(source="public_query_id", read_only=True)
 
     class Meta:
         model = Building
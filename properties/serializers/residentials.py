@@ -52,6 +52,7 @@ class ResidentialPropertySerializer(serializers.ModelSerializer):
     _type = ResidentialPropertyTypeSerializer()
     buildings = BuildingSerializer(many=True)
     general_amenities = AmenitySerializer(many=True)
+    query_id = serializers.CharField(source="public_query_id", read_only=True)
 
     class Meta:
         model = ResidentialProperty
@@ -5,6 +5,8 @@ from properties.models.rooms import Partition, RoomPartition
 class PartitionSerializer(serializers.ModelSerializer):
     """Serializer for Partition model with explicitly defined methods."""
 
+    query_id = serializers.CharField(source="public_query_id", read_only=True)
+
     class Meta:
         model = Partition
         fields = '__all__'  # Include all fields
@@ -48,6 +50,7 @@ class RoomPartitionSerializer(serializers.ModelSerializer):
 
     # Nest Partition inside RoomPartition
     partition = PartitionSerializer()
+    query_id = serializers.CharField(source="public_query_id", read_only=True)
 
     class Meta:
         model = RoomPartition
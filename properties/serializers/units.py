@@ -2,6 +2,7 @@ from rest_framework import serializers
 from properties.models.units import Unit
 from configurations.models.currencies import Currencies
 from properties.serializers.rooms import RoomPartitionSerializer
+from utilities.pricing import Money
 
 
 class UnitSerializer(serializers.ModelSerializer):
@@ -11,6 +12,7 @@ class UnitSerializer(serializers.ModelSerializer):
     currency = serializers.SlugRelatedField(
         queryset=Currencies.objects.all(), slug_field="code"
     )
+    query_id = serializers.CharField(source="public_query_id", read_only=True)
 
     class Meta:
         model = Unit
@@ -24,6 +26,16 @@ class UnitSerializer(serializers.ModelSerializer):
         representation = super().to_representation(instance)
         representation['rooms'] = RoomPartitionSerializer(
             instance.rooms.all(), many=True).data
+
+        # Set when the queryset was annotated by `with_price_in`, the
+        # view passing the same currency in the context
+        currency = self.context.get('currency', None)
+        if currency and hasattr(instance, 'price_in_currency'):
+            representation['price'] = (
+                str(Money(instance.price_in_currency, currency))
+                if instance.price_in_currency is not None else None
+            )
+
         return representation
 
     def create(self, validated_data):
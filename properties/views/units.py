@@ -5,6 +5,8 @@ from rest_framework import status
 from properties.models.units import Unit
 from properties.serializers.units import UnitSerializer
 
+from decimal import Decimal, InvalidOperation
+
 
 class UnitAPIView(APIView):
     """
@@ -16,9 +18,43 @@ class UnitAPIView(APIView):
     def get(self, request):
         """
         Retrieve all units.
+
+        With a `currency` query parameter units also get their price in
+        that currency, and can be filtered (`min_price`, `max_price`) and
+        sorted (`ordering=price` or `-price`) by it.
         """
-        units = Unit.objects.all()
-        serializer = UnitSerializer(units, many=True)
+        units = Unit.objects.select_related(
+            "currency"
+        ).prefetch_related("rooms")
+
+        currency = request.query_params.get("currency", None)
+
+        if currency:
+            units = units.with_price_in(currency)
+
+            try:
+                for param, lookup in (
+                    ("min_price", "price_in_currency__gte"),
+                    ("max_price", "price_in_currency__lte"),
+                ):
+                    value = request.query_params.get(param, None)
+                    if value is not None:
+                        units = units.filter(**{lookup: Decimal(value)})
+            except InvalidOperation:
+                return Response(
+                    {"error": "Prices must be decimal numbers"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            ordering = request.query_params.get("ordering", None)
+            if ordering in ("price", "-price"):
+                units = units.order_by(
+                    ordering.replace("price", "price_in_currency"), "pk"
+                )
+
+        serializer = UnitSerializer(
+            units, many=True, context={"currency": currency}
+        )
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request):
@@ -9,6 +9,7 @@ from django.core.mail import send_mail
 from django.template.loader import render_to_string
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
+from django.apps import apps
 from django.db import models
 from django.conf import settings
 
@@ -204,6 +205,22 @@ class Verification:
         self.send_code_to_user(model_instance=self.model)
 
 
+def send_verification_code(user_pk: int, model_name: str, channel: str):
+    """
+    Background job sending the user's current OTP of the `accounts`
+    model `model_name` through `channel` ("email" or "phone").
+    Only takes JSON serializable arguments so it can run on Celery too.
+    """
+
+    if channel not in ("email", "phone"):
+        raise ValueError(f"Unknown Verification Channel `{channel}`")
+
+    user = User.objects.get(pk=user_pk)
+    model = apps.get_model("accounts", model_name)
+
+    getattr(Verification(user=user, model=model), channel)()
+
+
 class CheckVerifiedCredentials:
     """
         This checks if the various user credentials has been verified.
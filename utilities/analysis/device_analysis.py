@@ -2,11 +2,9 @@ from django.db import models
 from django.conf import settings
 from django.http import HttpRequest
 
-from accounts.models.devices import DeviceLoginHistory
+from accounts.models.devices import Device, DeviceLoginHistory
 from utilities.analysis.ip_analysis import IPAddressAnalyzer
-
-from difflib import SequenceMatcher
-import numpy as np
+from utilities.analysis.device_fingerprint import DeviceFingerprint
 
 
 class MatchDeviceAnalysis:
@@ -21,25 +19,25 @@ class MatchDeviceAnalysis:
         self.devices = devices
         self.request = request
 
-    def get_device_ip_list(self, device_instance: models.Model) -> np.ndarray:
+    def get_device_ip_lists(self) -> tuple:
         """
-        Retrieve and return a NumPy array of IP
-        addresses for a given device.
-
-        Args:
-            device_instance (models.Model): The device instance
-            to retrieve IP addresses for.
+        Retrieve the login history IP addresses of every device
+        in a single query.
 
         Returns:
-            np.ndarray: Array of IP addresses associated with the device.
+            tuple: (list of IP addresses, list of the owning device ids)
         """
 
-        # Fetch IP addresses from the login history for
-        # the given device
-        ip_addresses = DeviceLoginHistory.objects.filter(
-            device=device_instance
-        ).values_list('ip_address', flat=True)
-        return np.array(list(ip_addresses))
+        history = DeviceLoginHistory.objects.filter(
+            device__in=self.devices
+        ).values_list('device_id', 'ip_address')
+
+        device_ids, ip_addresses = [], []
+        for device_id, ip_address in history:
+            device_ids.append(device_id)
+            ip_addresses.append(ip_address)
+
+        return ip_addresses, device_ids
 
     def compute_ip_similarity(self) -> list:
         """
@@ -54,26 +52,25 @@ class MatchDeviceAnalysis:
         # Initialize the IP address analyzer with the current IP
         analyzer = IPAddressAnalyzer(
             base_ip=current_ip, octet_count=2,
-            n_clusters=2, similarity_threshold=100
+            similarity_threshold=100
         )
 
+        # Score the IP addresses of all devices in one vectorized pass
+        ip_addresses, device_ids = self.get_device_ip_lists()
+        device_scores = analyzer.score_groups(ip_addresses, device_ids)
+
+        pass_score = settings.APPLICATION_SETTINGS[
+            "IP_MATCH_PROBABILITY_PASS_SCORE"
+        ]
+
         matched_devices = []
 
         for device in self.devices:
-            # Get the list of IP addresses associated with the device
-            device_ip_list = self.get_device_ip_list(device)
-            if device_ip_list.size == 0:
-                continue
-
-            # Perform IP analysis and get the similarity score
-            ip_analysis_results = analyzer.analyze(device_ip_list.tolist())
-            ip_analysis_score = ip_analysis_results[
-                'total_probability_score'
-            ]
+            ip_analysis_score = device_scores.get(device.id)
 
-            pass_score = settings.APPLICATION_SETTINGS[
-                "IP_MATCH_PROBABILITY_PASS_SCORE"
-            ]
+            # Devices without login history can't be matched by IP
+            if ip_analysis_score is None:
+                continue
 
             # Check if the similarity score meets the threshold
             if ip_analysis_score >= pass_score:
@@ -87,58 +84,40 @@ class MatchDeviceAnalysis:
     def compute_device_data_similarity(self) -> list:
         """
         Match the current device against the user's existing
-        devices based on device data analysis.
+        devices based on their precomputed fingerprints.
 
         Returns:
             list: List of matched devices with their similarity scores.
         """
-        meta_info = self.request.device_meta_info
-        matched_devices = []
+        signature = DeviceFingerprint.from_meta_info(
+            self.request.device_meta_info
+        ).signature()
 
-        for device in self.devices:
-            score = 0  # Initialize similarity score
-            condition_count = 0  # Initialize condition count
-
-            # Check client version
-            if meta_info["client_clientversion"] == device.client_type:
-                score += 1
-                condition_count += 1
-
-            # Check OS version
-            if meta_info["os_osversion"] == device.client_type:
-                score += 1
-                condition_count += 1
-
-            # Check device type
-            if meta_info["device_type"] == device.device_type:
-                score += 1
-                condition_count += 1
-
-            # Calculate user agent similarity
-            user_agent_similarity = SequenceMatcher(
-                None, str(meta_info["user_agent"]), device.user_agent
-            ).ratio()
-            score += user_agent_similarity
-            condition_count += 1
-
-            # Calculate total similarity score
-            if condition_count > 0:
-                total_similarity_score = (score / condition_count) * condition_count
-            else:
-                total_similarity_score = 0
-
-            pass_score = settings.APPLICATION_SETTINGS[
-                "DEVICE_DATA_SIMILARITY_MATCH_SCORE"
-            ]
+        devices = list(self.devices)
 
-            # Check if the similarity score meets the threshold
-            if total_similarity_score >= pass_score:
-                matched_devices.append({
-                    "device": device,
-                    "score": total_similarity_score
-                })
+        # Devices stored before fingerprints existed get theirs
+        # computed once here and persisted for the next logins
+        stale_devices = [
+            device for device in devices if device.refresh_fingerprint()
+        ]
 
-        return matched_devices
+        if stale_devices:
+            Device.objects.bulk_update(stale_devices, ["fingerprint"])
+
+        scores = DeviceFingerprint.similarities(
+            signature, [device.fingerprint for device in devices]
+        )
+
+        pass_score = settings.APPLICATION_SETTINGS[
+            "DEVICE_DATA_SIMILARITY_MATCH_SCORE"
+        ]
+
+        # Check if the similarity scores meet the threshold
+        return [
+            {"device": device, "score": float(score)}
+            for device, score in zip(devices, scores)
+            if score >= pass_score
+        ]
 
     def most_similar(self):
         """
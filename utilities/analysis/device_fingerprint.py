@@ -0,0 +1,119 @@
+import numpy as np
+import hashlib
+import re
+
+
+class DeviceFingerprint:
+    """
+    MinHash signature of a device's tokenized user agent plus its
+    operating system, client and device type.
+
+    The signature is computed once when a device is created or its
+    identifying fields change, and stored as a compact byte string
+    (NUM_PERMUTATIONS x uint32). Comparing two signatures estimates
+    the Jaccard similarity of their feature sets, so matching a
+    request against all of a user's devices is a single vectorized
+    comparison instead of a `SequenceMatcher` per device.
+
+    NOTE: `NUM_PERMUTATIONS` and `SEED` must stay fixed, otherwise
+    stored signatures are no longer comparable with new ones.
+    """
+
+    NUM_PERMUTATIONS = 64
+    SEED = 20241019
+
+    # Smallest prime above 2**32
+    _PRIME = np.uint64(4294967311)
+
+    _rng = np.random.default_rng(SEED)
+    _A = _rng.integers(1, 2 ** 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+    _B = _rng.integers(0, 2 ** 32, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+    _TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:[._][a-z0-9]+)*")
+
+    def __init__(
+            self, user_agent: str = "", operating_system: str = "",
+            client_type: str = "", device_type: str = ""
+    ):
+
+        self.user_agent = user_agent or ""
+        self.operating_system = operating_system or ""
+        self.client_type = client_type or ""
+        self.device_type = device_type or ""
+
+    @classmethod
+    def from_device(cls, device):
+        return cls(
+            user_agent=device.user_agent,
+            operating_system=device.operating_system,
+            client_type=device.client_type,
+            device_type=device.device_type
+        )
+
+    @classmethod
+    def from_meta_info(cls, meta_info: dict):
+        return cls(
+            user_agent=str(meta_info.get("user_agent", "")),
+            operating_system=meta_info.get("os_osversion"),
+            client_type=meta_info.get("client_clientversion"),
+            device_type=meta_info.get("device_type")
+        )
+
+    def tokens(self) -> set:
+        tokens = set(self._TOKEN_PATTERN.findall(self.user_agent.lower()))
+
+        tokens.add(f"os:{self.operating_system.lower()}")
+        tokens.add(f"client:{self.client_type.lower()}")
+        tokens.add(f"type:{self.device_type.lower()}")
+
+        return tokens
+
+    def signature(self) -> np.ndarray:
+        hashes = np.fromiter(
+            (
+                int.from_bytes(
+                    hashlib.blake2b(token.encode(), digest_size=4).digest(),
+                    "big"
+                )
+                for token in self.tokens()
+            ),
+            dtype=np.uint64
+        )
+
+        # (a * h + b) stays below 2**64 because a, b and h are all
+        # below 2**32.
+        permuted = (
+            self._A[:, None] * hashes[None, :] + self._B[:, None]
+        ) % self._PRIME
+
+        return (permuted.min(axis=1) & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def to_database(self) -> bytes:
+        return self.signature().astype("<u4").tobytes()
+
+    @classmethod
+    def from_database(cls, data) -> np.ndarray:
+        return np.frombuffer(bytes(data), dtype="<u4")
+
+    @classmethod
+    def similarities(cls, signature: np.ndarray, stored: list) -> np.ndarray:
+        """
+        Estimated Jaccard similarity between `signature` and every
+        stored fingerprint.
+
+        Args:
+            signature: Signature of the device being matched.
+            stored: Stored fingerprints (bytes) to compare against.
+
+        Returns:
+            np.ndarray: One similarity in [0, 1] per stored fingerprint.
+        """
+
+        if not stored:
+            return np.empty(0)
+
+        matrix = np.frombuffer(
+            b"".join(bytes(data) for data in stored), dtype="<u4"
+        ).reshape(len(stored), cls.NUM_PERMUTATIONS)
+
+        return (matrix == signature).mean(axis=1)
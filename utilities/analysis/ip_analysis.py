@@ -1,107 +1,236 @@
 import numpy as np
 import ipaddress
-from sklearn.cluster import KMeans
 
 
-class IPPatternMatcher:
-    def __init__(self, base_ip, octet_count=2):
-        self.base_ip = base_ip
-        self.octet_count = octet_count
-        self.base_ip_parts = base_ip.split('.')[:octet_count]
+# IPv4 addresses are mapped into the IPv6 space (::ffff:a.b.c.d)
+# so both families share one 128-bit representation.
+_IPV4_MAPPED_PREFIX = b"\x00" * 10 + b"\xff\xff"
+_IPV4_MAPPED_BITS = 96
 
-    def find_pattern_based_ips(self, ip_list):
-        matching_ips = []
-        for ip in ip_list:
-            ip_parts = ip.split('.')[:self.octet_count]
-            if ip_parts == self.base_ip_parts:
-                matching_ips.append(ip)
-        return matching_ips
+_WORD_MASK = (1 << 64) - 1
 
 
-class IPClusterer:
-    def __init__(self, n_clusters=2):
-        self.n_clusters = n_clusters
+def ips_to_words(ip_list) -> np.ndarray:
+    """
+    Parse every address exactly once into an (n, 2) uint64 array
+    holding the high and low 64 bits of its 128-bit value.
 
-    def ip_to_int(self, ip):
-        return int(ipaddress.ip_address(ip))
+    Raises:
+        ValueError: If any entry is not a valid IPv4/IPv6 address.
+    """
 
-    def cluster_ips(self, ip_list):
-        ip_ints = np.array([self.ip_to_int(ip) for ip in ip_list]).reshape(-1, 1)
-        kmeans = KMeans(n_clusters=self.n_clusters)
-        kmeans.fit(ip_ints)
-        labels = kmeans.labels_
+    packed = bytearray()
 
-        clusters = [[] for _ in range(self.n_clusters)]
-        for ip, label in zip(ip_list, labels):
-            clusters[label].append(ip)
+    for ip in ip_list:
+        address = ipaddress.ip_address(ip)
 
-        return clusters, labels
+        if address.version == 4:
+            packed += _IPV4_MAPPED_PREFIX
 
+        packed += address.packed
 
-class IPSimilarityChecker:
-    def __init__(self, base_ip, threshold=100):
-        self.base_ip = base_ip
-        self.threshold = threshold
-        self.base_ip_int = int(ipaddress.ip_address(base_ip))
+    return np.frombuffer(bytes(packed), dtype=">u8").astype(
+        np.uint64
+    ).reshape(-1, 2)
+
+
+def prefix_mask(bits: int) -> np.ndarray:
+    """
+    Build a (2,) uint64 mask keeping the leading `bits` of a
+    128-bit address.
+    """
+
+    bits = max(0, min(128, bits))
+    mask = ((1 << bits) - 1) << (128 - bits)
 
-    def find_similar_ips(self, ip_list):
-        similar_ips = []
-        for ip in ip_list:
-            ip_int = int(ipaddress.ip_address(ip))
-            if abs(self.base_ip_int - ip_int) <= self.threshold:
-                similar_ips.append(ip)
-        return similar_ips
+    return np.array([mask >> 64, mask & _WORD_MASK], dtype=np.uint64)
+
+
+_IPV4_MAPPED_WORDS = ips_to_words(["0.0.0.0"])[0]
 
 
 class IPAddressAnalyzer:
+    """
+    Vectorized IP-affinity scoring of a list of addresses against a
+    base address.
+
+    Every address gets three signals:
+        - pattern: it shares the base address' leading octets
+          (`octet_count` octets for IPv4, hextets for IPv6).
+        - similarity: its numeric distance to the base address is
+          within `similarity_threshold`.
+        - subnet frequency: the share of the list living in the same
+          /24 (IPv4) or /64 (IPv6) subnet, which replaces the former
+          per-call KMeans clustering.
+    """
+
+    PATTERN_WEIGHT = 0.4
+    SIMILARITY_WEIGHT = 0.4
+    SUBNET_WEIGHT = 0.2
+
+    IPV4_SUBNET_BITS = 24
+    IPV6_SUBNET_BITS = 64
+
     def __init__(
-            self, base_ip, octet_count=2, n_clusters=2,
-            similarity_threshold=100
+            self, base_ip, octet_count=2, similarity_threshold=100
     ):
 
-        self.pattern_matcher = IPPatternMatcher(base_ip, octet_count)
-        self.clusterer = IPClusterer(n_clusters)
-        self.similarity_checker = IPSimilarityChecker(
-            base_ip, similarity_threshold
+        self.base_ip = base_ip
+        self.similarity_threshold = np.uint64(similarity_threshold)
+
+        self.base_words = ips_to_words([base_ip])[0]
+        self.is_ipv4 = ipaddress.ip_address(base_ip).version == 4
+
+        if self.is_ipv4:
+            pattern_bits = _IPV4_MAPPED_BITS + octet_count * 8
+        else:
+            pattern_bits = octet_count * 16
+
+        self.pattern_mask = prefix_mask(pattern_bits)
+        self.base_pattern = self.base_words & self.pattern_mask
+
+    def pattern_matches(self, words: np.ndarray) -> np.ndarray:
+        return np.all(
+            (words & self.pattern_mask) == self.base_pattern, axis=1
+        )
+
+    def similarity_matches(self, words: np.ndarray) -> np.ndarray:
+        base_hi, base_lo = self.base_words
+        hi, lo = words[:, 0], words[:, 1]
+
+        same_hi = hi == base_hi
+
+        # Addresses in the neighbouring 64-bit word are within 2 ** 64
+        # only from the boundary's other side, where the uint64
+        # subtraction wrapping around gives their distance.
+        hi_above = (hi > base_hi) & (hi - base_hi == 1) & (lo < base_lo)
+        hi_below = (hi < base_hi) & (base_hi - hi == 1) & (lo > base_lo)
+
+        distance = np.select(
+            [same_hi, hi_above, hi_below],
+            [
+                np.where(lo >= base_lo, lo - base_lo, base_lo - lo),
+                lo - base_lo,
+                base_lo - lo,
+            ],
+            default=np.uint64(_WORD_MASK)
+        )
+
+        return (same_hi | hi_above | hi_below) & (
+            distance <= self.similarity_threshold
+        )
+
+    def subnet_keys(self, words: np.ndarray) -> np.ndarray:
+        is_ipv4 = np.all(
+            (words & prefix_mask(_IPV4_MAPPED_BITS)) == _IPV4_MAPPED_WORDS,
+            axis=1
+        )
+
+        return np.where(
+            is_ipv4[:, None],
+            words & prefix_mask(_IPV4_MAPPED_BITS + self.IPV4_SUBNET_BITS),
+            words & prefix_mask(self.IPV6_SUBNET_BITS)
+        )
+
+    def subnet_frequency(
+            self, words: np.ndarray, groups: np.ndarray
+    ) -> tuple:
+        """
+        Share of each address' group living in the same subnet.
+
+        Returns:
+            tuple: (frequency per address, subnet label per address)
+        """
+
+        keys = np.column_stack((groups.astype(np.uint64), self.subnet_keys(words)))
+        _, labels, counts = np.unique(
+            keys, axis=0, return_inverse=True, return_counts=True
+        )
+        labels = labels.reshape(-1)
+
+        group_sizes = np.bincount(groups)[groups]
+
+        return counts[labels] / group_sizes, labels
+
+    def score_words(
+            self, words: np.ndarray, groups: np.ndarray
+    ) -> tuple:
+
+        pattern = self.pattern_matches(words)
+        similar = self.similarity_matches(words)
+        frequency, labels = self.subnet_frequency(words, groups)
+
+        scores = (
+            pattern * self.PATTERN_WEIGHT
+            + similar * self.SIMILARITY_WEIGHT
+            + frequency * self.SUBNET_WEIGHT
+        )
+
+        return scores, pattern, similar, labels
+
+    def score_groups(self, ip_list, groups) -> dict:
+        """
+        Score many address lists (e.g. one per device) in a single
+        vectorized pass.
+
+        Args:
+            ip_list: Flat list of addresses.
+            groups: Group identifier of each address.
+
+        Returns:
+            dict: Group identifier -> mean probability score.
+        """
+
+        if not len(ip_list):
+            return {}
+
+        group_ids, group_index = np.unique(
+            np.asarray(groups), return_inverse=True
         )
+        group_index = group_index.reshape(-1)
+
+        scores = self.score_words(ips_to_words(ip_list), group_index)[0]
+        totals = np.bincount(group_index, weights=scores)
+        sizes = np.bincount(group_index)
+
+        return {
+            group_id.item(): float(total / size)
+            for group_id, total, size in zip(group_ids, totals, sizes)
+        }
 
     def analyze(self, ip_list):
-        pattern_based_ips = self.pattern_matcher.find_pattern_based_ips(ip_list)
-        clusters, labels = self.clusterer.cluster_ips(ip_list)
-        similar_ips = self.similarity_checker.find_similar_ips(ip_list)
-
-        # Calculate probability scores
-        ip_scores = {}
-        for ip in ip_list:
-            # Pattern match score
-            pattern_score = 1 if ip in pattern_based_ips else 0
-
-            # Similarity score
-            similarity_score = 1 if ip in similar_ips else 0
-
-            # Cluster score
-            cluster_index = labels[ip_list.index(ip)]
-            cluster_size = len(clusters[cluster_index])
-            cluster_score = cluster_size / len(ip_list)
-
-            # Combined score
-            combined_score = (
-                (pattern_score * 0.4)
-                + (similarity_score * 0.4)
-                + (cluster_score * 0.2)
-            )
-            ip_scores[ip] = combined_score
-
-        # Calculate total probability check
-        if ip_scores:
-            total_score = sum(ip_scores.values()) / len(ip_scores)
-        else:
-            total_score = 0
+        ip_list = list(ip_list)
+
+        if not ip_list:
+            return {
+                'pattern_based_ips': [],
+                'clusters': [],
+                'similar_ips': [],
+                'ip_scores': {},
+                'total_probability_score': 0
+            }
+
+        words = ips_to_words(ip_list)
+        scores, pattern, similar, labels = self.score_words(
+            words, np.zeros(len(ip_list), dtype=np.intp)
+        )
+
+        clusters = [[] for _ in range(labels.max() + 1)]
+        for ip, label in zip(ip_list, labels):
+            clusters[label].append(ip)
+
+        ip_scores = {
+            ip: float(score) for ip, score in zip(ip_list, scores)
+        }
 
         return {
-            'pattern_based_ips': pattern_based_ips,
+            'pattern_based_ips': [
+                ip for ip, match in zip(ip_list, pattern) if match
+            ],
             'clusters': clusters,
-            'similar_ips': similar_ips,
+            'similar_ips': [
+                ip for ip, match in zip(ip_list, similar) if match
+            ],
             'ip_scores': ip_scores,
-            'total_probability_score': total_score
+            'total_probability_score': sum(ip_scores.values()) / len(ip_scores)
         }
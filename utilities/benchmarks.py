@@ -0,0 +1,124 @@
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from dataclasses import dataclass, asdict
+
+import statistics
+import math
+import time
+import json
+
+
+class Rollback(Exception):
+    """Raised to undo what a benchmark iteration wrote."""
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    iterations: int
+    p50_ms: float
+    p95_ms: float
+    mean_ms: float
+    max_ms: float
+    queries: int
+
+
+def percentile(values: list, percent: float) -> float:
+    # Nearest-rank percentile, stable on small samples
+    ordered = sorted(values)
+    rank = max(0, math.ceil(percent / 100 * len(ordered)) - 1)
+    return ordered[rank]
+
+
+def run_scenario(name: str, run, setup=None, iterations: int = 50,
+                 warmup: int = 3, rollback: bool = False) -> ScenarioResult:
+    """
+    Time `run(state)` over `iterations` runs, after `warmup` untimed ones.
+
+    `setup()` builds the state of each run outside of the timings. With
+    `rollback`, each run (and its setup) happens in a transaction that
+    is rolled back, so scenarios that write leave the data unchanged.
+    """
+
+    durations, queries = [], []
+
+    for index in range(warmup + iterations):
+        try:
+            with transaction.atomic():
+                state = setup() if setup is not None else None
+
+                with CaptureQueriesContext(connection) as captured:
+                    started_at = time.perf_counter()
+                    run(state)
+                    elapsed = time.perf_counter() - started_at
+
+                if rollback:
+                    raise Rollback()
+        except Rollback:
+            pass
+
+        if index >= warmup:
+            durations.append(elapsed * 1000)
+            queries.append(len(captured.captured_queries))
+
+    return ScenarioResult(
+        name=name,
+        iterations=iterations,
+        p50_ms=round(percentile(durations, 50), 3),
+        p95_ms=round(percentile(durations, 95), 3),
+        mean_ms=round(statistics.fmean(durations), 3),
+        max_ms=round(max(durations), 3),
+        queries=int(statistics.median(queries)),
+    )
+
+
+def save_baseline(path: str, results: list, meta: dict = None):
+    with open(path, "w") as baseline_file:
+        json.dump(
+            {
+                "meta": meta or {},
+                "scenarios": {result.name: asdict(result) for result in results},
+            },
+            baseline_file, indent=2, default=str
+        )
+
+
+def compare_to_baseline(path: str, results: list,
+                        tolerance: float = 0.2) -> list:
+    """
+    Regressions against the baseline saved at `path`: scenarios whose
+    p95 grew by more than `tolerance` (a ratio) or that run more queries.
+
+    Returns:
+        list: (scenario name, description) tuples.
+    """
+
+    with open(path) as baseline_file:
+        baseline = json.load(baseline_file).get("scenarios", {})
+
+    regressions = []
+
+    for result in results:
+        reference = baseline.get(result.name)
+
+        if reference is None:
+            continue
+
+        if result.p95_ms > reference["p95_ms"] * (1 + tolerance):
+            regressions.append(
+                (
+                    result.name,
+                    f"p95 {reference['p95_ms']}ms -> {result.p95_ms}ms"
+                )
+            )
+
+        if result.queries > reference["queries"]:
+            regressions.append(
+                (
+                    result.name,
+                    f"queries {reference['queries']} -> {result.queries}"
+                )
+            )
+
+    return regressions
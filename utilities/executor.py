@@ -0,0 +1,255 @@
+from django.conf import settings
+from django.db import close_old_connections
+
+from concurrent.futures import ThreadPoolExecutor
+
+import threading
+import logging
+import json
+import time
+
+
+logger = logging.getLogger(__name__)
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+class BackgroundQueue:
+    """
+    A named, bounded pool of worker threads.
+
+    At most `max_workers` jobs run at once and at most `max_depth` jobs
+    are accepted (queued + running). When the queue is full the job is
+    either run in the caller's thread (`on_full="run"`, which applies
+    back-pressure to the request) or dropped (`on_full="reject"`).
+    """
+
+    def __init__(
+            self, name: str, max_workers: int = 4,
+            max_depth: int = 100, on_full: str = "run"
+    ):
+
+        self.name = name
+        self.max_workers = max_workers
+        self.max_depth = max_depth
+        self.on_full = on_full
+
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=f"background-{name}"
+        )
+        self._slots = threading.BoundedSemaphore(max_depth)
+        self._lock = threading.Lock()
+
+        self._metrics = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "ran_inline": 0,
+            "depth": 0,
+            "max_depth_seen": 0,
+            "wait_ms_total": 0.0,
+            "wait_ms_max": 0.0,
+            "run_ms_total": 0.0,
+            "run_ms_max": 0.0,
+        }
+
+    def _record(self, **changes):
+        with self._lock:
+            for key, value in changes.items():
+                if key.endswith("_max"):
+                    self._metrics[key] = max(self._metrics[key], value)
+                else:
+                    self._metrics[key] += value
+
+            self._metrics["max_depth_seen"] = max(
+                self._metrics["max_depth_seen"], self._metrics["depth"]
+            )
+
+    def _call(self, fn, args, kwargs) -> bool:
+        try:
+            fn(*args, **kwargs)
+            return True
+        except Exception:
+            logger.exception(
+                f"Background Job {getattr(fn, '__qualname__', fn)}"
+                f" Failed On Queue `{self.name}`"
+            )
+            return False
+
+    def _run(self, fn, args, kwargs, queued_at):
+        started_at = time.monotonic()
+        wait_ms = (started_at - queued_at) * 1000
+
+        # Worker threads outlive requests, so they must not keep
+        # stale database connections around
+        close_old_connections()
+
+        try:
+            if self._call(fn, args, kwargs):
+                outcome = {"completed": 1}
+            else:
+                outcome = {"failed": 1}
+        finally:
+            close_old_connections()
+
+        run_ms = (time.monotonic() - started_at) * 1000
+
+        self._record(
+            depth=-1, wait_ms_total=wait_ms, wait_ms_max=wait_ms,
+            run_ms_total=run_ms, run_ms_max=run_ms, **outcome
+        )
+        self._slots.release()
+
+    def submit(self, fn, *args, **kwargs) -> bool:
+        """
+        Returns:
+            bool: False if the job was rejected because the queue is full.
+        """
+
+        if not self._slots.acquire(blocking=False):
+            if self.on_full == "reject":
+                self._record(rejected=1)
+                logger.warning(
+                    f"Background Queue `{self.name}` Is Full"
+                    f" ({self.max_depth}), Job Rejected"
+                )
+                return False
+
+            self._record(ran_inline=1)
+            self._call(fn, args, kwargs)
+            return True
+
+        self._record(submitted=1, depth=1)
+        self._pool.submit(self._run, fn, args, kwargs, time.monotonic())
+
+        return True
+
+    def metrics(self) -> dict:
+        with self._lock:
+            metrics = dict(self._metrics)
+
+        finished = metrics["completed"] + metrics["failed"]
+
+        metrics["wait_ms_avg"] = (
+            metrics.pop("wait_ms_total") / finished if finished else 0.0
+        )
+        metrics["run_ms_avg"] = (
+            metrics.pop("run_ms_total") / finished if finished else 0.0
+        )
+        metrics["max_workers"] = self.max_workers
+        metrics["max_depth"] = self.max_depth
+
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        self._pool.shutdown(wait=wait)
+
+
+class BackgroundExecutor:
+    """
+    Process-wide registry of bounded background queues, configured
+    through `APPLICATION_SETTINGS["BACKGROUND_TASKS"]`.
+
+    With `BACKEND` set to "celery" (globally or per queue) jobs are
+    handed to the `utilities.tasks.run_background_job` Celery task
+    instead. That requires a module-level function and JSON serializable
+    arguments; other jobs fall back to the local thread pool.
+    """
+
+    def __init__(self, config: dict = None):
+        self.config = config or app_settings.get("BACKGROUND_TASKS", {})
+        self._queues = {}
+        self._lock = threading.Lock()
+        self._celery_fallbacks = 0
+
+    def queue_config(self, name: str) -> dict:
+        queues = self.config.get("QUEUES", {})
+        return queues.get(name, queues.get("default", {}))
+
+    def get_queue(self, name: str) -> BackgroundQueue:
+        queue = self._queues.get(name)
+
+        if queue is None:
+            with self._lock:
+                queue = self._queues.get(name)
+
+                if queue is None:
+                    config = self.queue_config(name)
+                    queue = BackgroundQueue(
+                        name=name,
+                        max_workers=config.get("MAX_WORKERS", 4),
+                        max_depth=config.get("MAX_DEPTH", 100),
+                        on_full=config.get("ON_FULL", "run")
+                    )
+                    self._queues[name] = queue
+
+        return queue
+
+    def uses_celery(self, name: str) -> bool:
+        backend = self.queue_config(name).get(
+            "BACKEND", self.config.get("BACKEND", "thread")
+        )
+        return backend == "celery"
+
+    def _job_path(self, fn):
+        qualname = getattr(fn, "__qualname__", "")
+
+        if "." in qualname or "<" in qualname:
+            return None
+
+        return f"{fn.__module__}.{qualname}"
+
+    def _send_to_celery(self, name, fn, args, kwargs) -> bool:
+        # Imported lazily: the tasks module pulls in notification SDKs
+        from utilities.tasks import run_background_job
+
+        job_path = self._job_path(fn)
+
+        try:
+            json.dumps([args, kwargs])
+        except (TypeError, ValueError):
+            job_path = None
+
+        if job_path is None:
+            with self._lock:
+                self._celery_fallbacks += 1
+            return False
+
+        run_background_job.apply_async(
+            args=(job_path, list(args), kwargs),
+            queue=self.queue_config(name).get("CELERY_QUEUE")
+        )
+        return True
+
+    def submit(self, name: str, fn, *args, **kwargs) -> bool:
+        """
+        Run `fn(*args, **kwargs)` in the background on queue `name`.
+
+        Returns:
+            bool: False if the job was rejected because the queue is full.
+        """
+
+        if self.uses_celery(name) and self._send_to_celery(
+            name, fn, args, kwargs
+        ):
+            return True
+
+        return self.get_queue(name).submit(fn, *args, **kwargs)
+
+    def metrics(self) -> dict:
+        metrics = {
+            name: queue.metrics() for name, queue in list(self._queues.items())
+        }
+        metrics["celery_fallbacks"] = self._celery_fallbacks
+
+        return metrics
+
+    def shutdown(self, wait: bool = True):
+        for queue in list(self._queues.values()):
+            queue.shutdown(wait=wait)
+
+
+background = BackgroundExecutor()
@@ -0,0 +1,276 @@
+from django.conf import settings
+from django.db import connection
+
+import string
+import hashlib
+import base64
+import hmac
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+ROUNDS = 6
+
+
+class FeistelPermutation:
+    """
+    Keyed bijection of the integers in [0, 2 ** bits).
+
+    A balanced Feistel network whose round function is HMAC-SHA256, so
+    the permutation can't be inverted (or predicted) without the key.
+    """
+
+    def __init__(self, key: bytes, bits: int, rounds: int = ROUNDS):
+        self.key = key
+        self.half_bits = (bits + 1) // 2
+        self.mask = (1 << self.half_bits) - 1
+        self.rounds = rounds
+
+    def _round(self, index: int, value: int) -> int:
+        digest = hmac.new(
+            self.key, bytes([index]) + value.to_bytes(8, "big"), hashlib.sha256
+        ).digest()
+
+        return int.from_bytes(digest[:8], "big") & self.mask
+
+    def permute(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.mask
+
+        for index in range(self.rounds):
+            left, right = right, left ^ self._round(index, right)
+
+        return (left << self.half_bits) | right
+
+    def invert(self, value: int) -> int:
+        left, right = value >> self.half_bits, value & self.mask
+
+        for index in reversed(range(self.rounds)):
+            left, right = right ^ self._round(index, left), left
+
+        return (left << self.half_bits) | right
+
+
+class CodeGenerator:
+    """
+    Unique, fixed-length and non-guessable codes without lookups.
+
+    Each code encodes the next value of a PostgreSQL sequence through a
+    keyed permutation of all the `len(alphabet) ** length` codes
+    (cycle walking a `FeistelPermutation` into that range). Distinct
+    sequence values always give distinct codes, so nothing needs to be
+    checked against the table the codes are stored in.
+
+    The key must never change once codes were issued: codes generated
+    with another key could collide with existing ones.
+    """
+
+    def __init__(self, namespace: str, length: int,
+                 alphabet: str = string.ascii_uppercase + string.digits,
+                 key: str = None):
+        self.namespace = namespace
+        self.length = length
+        self.alphabet = alphabet
+        self.capacity = len(alphabet) ** length
+
+        key = key or app_settings.get("UNIQUE_CODES", {}).get("KEY") or (
+            settings.SECRET_KEY
+        )
+
+        # One permutation per namespace, from the same key
+        self.permutation = FeistelPermutation(
+            key=hmac.new(
+                str(key).encode(), namespace.encode(), hashlib.sha256
+            ).digest(),
+            bits=(self.capacity - 1).bit_length()
+        )
+
+    @property
+    def sequence(self) -> str:
+        return f"unique_code__{self.namespace}"
+
+    def encode(self, value: int) -> str:
+        if not 0 <= value < self.capacity:
+            raise ValueError(
+                f"`{self.namespace}` Codes Exhausted: {value} Is Out Of Range"
+            )
+
+        # The permutation's range is larger than the codes', walking the
+        # cycle until it falls back into it keeps it a bijection
+        value = self.permutation.permute(value)
+        while value >= self.capacity:
+            value = self.permutation.permute(value)
+
+        base = len(self.alphabet)
+        characters = []
+
+        for _ in range(self.length):
+            value, digit = divmod(value, base)
+            characters.append(self.alphabet[digit])
+
+        return "".join(reversed(characters))
+
+    def decode(self, code: str) -> int:
+        """Sequence value `code` was generated from."""
+
+        if len(code) != self.length:
+            raise ValueError(f"Invalid `{self.namespace}` Code: {code}")
+
+        value = 0
+        for character in code:
+            digit = self.alphabet.find(character)
+
+            if digit < 0:
+                raise ValueError(f"Invalid `{self.namespace}` Code: {code}")
+
+            value = value * len(self.alphabet) + digit
+
+        value = self.permutation.invert(value)
+        while value >= self.capacity:
+            value = self.permutation.invert(value)
+
+        return value
+
+    def next_values(self, count: int = 1) -> list:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT nextval(%s) FROM generate_series(1, %s)",
+                [self.sequence, count]
+            )
+
+            return [row[0] for row in cursor.fetchall()]
+
+    def generate(self) -> str:
+        return self.encode(self.next_values(1)[0])
+
+    def allocate(self, count: int) -> list:
+        """
+        Reserve `count` codes with a single query, e.g. for bulk imports.
+        """
+        return [self.encode(value) for value in self.next_values(count)]
+
+
+class QueryIDCodec:
+    """
+    Fixed-length, URL-safe public ids of a model's rows, decoded back
+    to primary keys in-process.
+
+    An id is the primary key through a keyed 64 bit `FeistelPermutation`
+    (so it hides how many rows there are) followed by a truncated HMAC
+    of (namespace, primary key), so ids can't be forged or enumerated:
+    `decode` rejects any id it didn't issue without a database lookup.
+
+    Like `CodeGenerator`, the key must never change once ids were
+    handed out.
+    """
+
+    KEY_BYTES = 8
+    TAG_BYTES = 4
+
+    # Base64 of the 12 bytes, no padding needed
+    LENGTH = (KEY_BYTES + TAG_BYTES) * 4 // 3
+
+    _codecs = {}
+
+    def __init__(self, namespace: str, key: str = None):
+        self.namespace = namespace
+
+        key = str(
+            key or app_settings.get("UNIQUE_CODES", {}).get("KEY") or (
+                settings.SECRET_KEY
+            )
+        ).encode()
+
+        self.permutation = FeistelPermutation(
+            key=hmac.new(
+                key, f"query_id:{namespace}".encode(), hashlib.sha256
+            ).digest(),
+            bits=self.KEY_BYTES * 8
+        )
+        self.tag_key = hmac.new(
+            key, f"query_id_tag:{namespace}".encode(), hashlib.sha256
+        ).digest()
+
+    @classmethod
+    def for_model(cls, model, purpose: str = None) -> "QueryIDCodec":
+        """
+        Codec of a model's ids, or of its ids for another `purpose` (e.g.
+        pagination cursors), which can't be linked to its public ids.
+        """
+
+        namespace = model._meta.label_lower
+
+        if purpose:
+            namespace = f"{namespace}:{purpose}"
+
+        if namespace not in cls._codecs:
+            cls._codecs[namespace] = cls(namespace=namespace)
+
+        return cls._codecs[namespace]
+
+    def _tag(self, pk: int) -> bytes:
+        return hmac.new(
+            self.tag_key, pk.to_bytes(self.KEY_BYTES, "big"), hashlib.sha256
+        ).digest()[:self.TAG_BYTES]
+
+    def encode(self, pk: int) -> str:
+        if not 0 < pk < 1 << (self.KEY_BYTES * 8):
+            raise ValueError(f"Invalid `{self.namespace}` Primary Key: {pk}")
+
+        token = self.permutation.permute(pk).to_bytes(self.KEY_BYTES, "big")
+
+        return base64.urlsafe_b64encode(token + self._tag(pk)).decode()
+
+    def decode(self, query_id: str) -> int:
+        """
+        Primary key `query_id` was issued for.
+
+        Raises:
+            ValueError: `query_id` wasn't issued by this codec.
+        """
+
+        if not isinstance(query_id, str) or len(query_id) != self.LENGTH:
+            raise ValueError(f"Invalid `{self.namespace}` QueryID")
+
+        try:
+            token = base64.urlsafe_b64decode(query_id.encode())
+        except ValueError:
+            raise ValueError(f"Invalid `{self.namespace}` QueryID")
+
+        pk = self.permutation.invert(
+            int.from_bytes(token[:self.KEY_BYTES], "big")
+        )
+
+        if not hmac.compare_digest(token[self.KEY_BYTES:], self._tag(pk)):
+            raise ValueError(f"Invalid `{self.namespace}` QueryID")
+
+        return pk
+
+    def encode_many(self, pks) -> list:
+        return [self.encode(pk) for pk in pks]
+
+    def decode_many(self, query_ids) -> dict:
+        """
+        Primary keys of `query_ids`, by id. Ids this codec didn't issue
+        (e.g. legacy ones) are left out.
+        """
+
+        decoded = {}
+
+        for query_id in query_ids:
+            try:
+                decoded[query_id] = self.decode(query_id)
+            except ValueError:
+                continue
+
+        return decoded
+
+
+# Longer than the 8 characters of randomly generated codes, so the two
+# can't collide
+referral_codes = CodeGenerator(namespace="referral_code", length=10)
+
+# Letters only: generated usernames used to end with 6 digits
+username_suffixes = CodeGenerator(
+    namespace="username", length=6, alphabet=string.ascii_lowercase
+)
@@ -1,4 +1,5 @@
 from utilities.cryptography.algorithms import AlphanumericCipher
+from utilities.generators.codes import username_suffixes
 
 import secrets
 import base64
@@ -6,6 +7,7 @@ import time
 import hashlib
 
 
+# Legacy ids, models now hand out `QueryIDCodec` ids (see `QueryIDMixin`)
 class QueryID:
     def __init__(self, data: list = [], length: int = 80):
         self.data = data
@@ -66,20 +68,27 @@ class QueryID:
         return None
 
 
+GENERATED_NAME_NOUN = 'lalouge-user'
+
+
 def generate_name():
-    # Generate a random name by combining a predefined noun
-    # and a secure random number at the end
-    while True:
-        noun = 'lalouge-user'
+    # Generate a unique name by combining a predefined noun
+    # and a sequence-encoded suffix (no uniqueness check needed)
+    return f'{GENERATED_NAME_NOUN}{username_suffixes.generate()}'
+
 
-        # Generates a random number in the range [100000, 999999]
-        number = secrets.randbelow(900000) + 100000
-        name = f'{noun}{number}'
+def generate_names(count: int) -> list:
+    # As `generate_name`, reserving all the suffixes in one query
+    return [
+        f'{GENERATED_NAME_NOUN}{suffix}'
+        for suffix in username_suffixes.allocate(count)
+    ]
 
-        if len(name) <= 18:
-            break
 
-    return name
+def is_generated_name(name: str) -> bool:
+    # Names starting with the noun are reserved to generated ones, a
+    # chosen one could be generated later
+    return name.lstrip('@').lower().startswith(GENERATED_NAME_NOUN)
 
 
 class Keys:
@@ -0,0 +1,194 @@
+from django.conf import settings
+
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import ipaddress
+import requests
+import logging
+import json
+import time
+import os
+
+
+logger = logging.getLogger(__name__)
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+class IPGeolocation:
+    """
+    In-process IP geolocation backed by a local CIDR -> location dataset.
+
+    The dataset is built by the `refresh_geolocation` management command
+    into sorted, non-overlapping integer ranges stored as `.npy` files,
+    which are memory-mapped and searched with `np.searchsorted`:
+
+        ipv4_start.npy, ipv4_end.npy, ipv4_location.npy  (uint32)
+        ipv6_start.npy, ipv6_end.npy, ipv6_location.npy  (uint64)
+        locations.json
+
+    IPv6 ranges are indexed on their upper 64 bits, which is the
+    granularity geolocation datasets are published at.
+
+    Each build lives in its own `versions/` directory and the `current`
+    symlink is swapped to it atomically, so a process always loads one
+    complete build and files it has mapped are never rewritten. A flat
+    dataset directory (no `current` link) is still read as is.
+
+    Lookups are answered from an LRU cache on top of the index. The
+    remote API (ipinfo.io) is only used when `REMOTE_FALLBACK` is
+    enabled and the address is not covered by the local dataset.
+
+    Results keep the ipinfo.io shape so they can be stored as
+    `DeviceLoginHistory.physical_address` unchanged:
+
+        {"ip", "city", "region", "country", "loc", "timezone"}
+    """
+
+    LOCATIONS_FILE = "locations.json"
+    CURRENT_LINK = "current"
+    VERSIONS_DIR = "versions"
+
+    def __init__(self, config: dict = None):
+        config = config or app_settings.get("GEOLOCATION", {})
+
+        self.dataset_dir = Path(
+            config.get(
+                "DATASET_DIR", Path(settings.BASE_DIR) / "data" / "geolocation"
+            )
+        )
+        self.reload_interval = config.get("RELOAD_INTERVAL", 300)
+        self.remote_fallback = config.get("REMOTE_FALLBACK", False)
+        self.remote_url = config.get(
+            "REMOTE_URL", "https://ipinfo.io/{ip}/json/"
+        )
+        self.remote_timeout = config.get("REMOTE_TIMEOUT", 2)
+
+        self.lookup = lru_cache(maxsize=config.get("CACHE_SIZE", 4096))(
+            self._lookup
+        )
+
+        self._index = None
+        self._dataset_version = None
+        self._checked_at = 0
+
+    def index_dir(self) -> Path:
+        """Directory of the current build, resolved once per load."""
+
+        current = self.dataset_dir / self.CURRENT_LINK
+
+        if current.is_symlink():
+            return Path(os.path.realpath(current))
+
+        return self.dataset_dir
+
+    def dataset_version(self, index_dir: Path):
+        try:
+            return (
+                str(index_dir),
+                os.stat(index_dir / self.LOCATIONS_FILE).st_mtime
+            )
+        except FileNotFoundError:
+            return None
+
+    def _load_index(self, index_dir: Path) -> dict:
+        index = {}
+
+        for version in ("ipv4", "ipv6"):
+            index[version] = tuple(
+                np.load(index_dir / f"{version}_{column}.npy", mmap_mode="r")
+                for column in ("start", "end", "location")
+            )
+
+        with open(index_dir / self.LOCATIONS_FILE) as locations_file:
+            index["locations"] = json.load(locations_file)
+
+        return index
+
+    def get_index(self):
+        """
+        Return the loaded index, (re)loading it when the dataset on disk
+        changed. The dataset is stat'ed at most once per `RELOAD_INTERVAL`.
+        """
+
+        now = time.monotonic()
+
+        if self._index is not None and now - self._checked_at < self.reload_interval:
+            return self._index
+
+        self._checked_at = now
+        index_dir = self.index_dir()
+        version = self.dataset_version(index_dir)
+
+        if version is None:
+            self._index = None
+
+        elif version != self._dataset_version:
+            try:
+                self._index = self._load_index(index_dir)
+                self._dataset_version = version
+                self.lookup.cache_clear()
+            except (OSError, ValueError) as e:
+                logger.error(f"Failed To Load Geolocation Dataset: {str(e)}")
+                self._index = None
+
+        return self._index
+
+    def _local_lookup(self, address) -> dict:
+        index = self.get_index()
+
+        if index is None:
+            return None
+
+        if address.version == 4:
+            starts, ends, locations = index["ipv4"]
+            value = int(address)
+        else:
+            starts, ends, locations = index["ipv6"]
+            value = int(address) >> 64
+
+        position = int(np.searchsorted(starts, value, side="right")) - 1
+
+        if position < 0 or value > int(ends[position]):
+            return None
+
+        return index["locations"][int(locations[position])]
+
+    def _remote_lookup(self, ip: str) -> dict:
+        try:
+            res = requests.get(
+                self.remote_url.format(ip=ip), timeout=self.remote_timeout
+            )
+            res.raise_for_status()
+            return res.json()
+
+        except (requests.RequestException, ValueError) as e:
+            logger.warning(f"Remote Geolocation Lookup Failed For {ip}: {str(e)}")
+            return None
+
+    def _lookup(self, ip: str) -> dict:
+        try:
+            address = ipaddress.ip_address(ip)
+        except ValueError:
+            return {"ip": ip}
+
+        if isinstance(address, ipaddress.IPv6Address) and address.ipv4_mapped:
+            address = address.ipv4_mapped
+
+        # Same answer ipinfo.io gives for private and reserved ranges
+        if not address.is_global:
+            return {"ip": ip, "bogon": True}
+
+        location = self._local_lookup(address)
+
+        if location is None and self.remote_fallback:
+            return self._remote_lookup(ip) or {"ip": ip}
+
+        return {"ip": ip, **(location or {})}
+
+
+ip_geolocation = IPGeolocation()
@@ -0,0 +1,214 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from utilities.geolocation import ip_geolocation
+
+import numpy as np
+import ipaddress
+import requests
+import tempfile
+import shutil
+import json
+import time
+import csv
+import os
+
+
+class Command(BaseCommand):
+    help = ('Rebuilds the local IP geolocation index from a'
+            ' CIDR -> location CSV file or URL')
+
+    """
+    The CSV needs a header row with either a `network` column (CIDR) or
+    `start_ip` and `end_ip` columns, plus any of `country`, `region`,
+    `city`, `latitude`, `longitude`, `timezone` and `postal`.
+    """
+
+    LOCATION_COLUMNS = ("city", "region", "country", "postal", "timezone")
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--source', required=True,
+            help='Path or URL of the CIDR -> location CSV dataset'
+        )
+        parser.add_argument(
+            '--dataset-dir',
+            help='Where to write the index (defaults to GEOLOCATION.DATASET_DIR)'
+        )
+
+    def handle(self, *args, **options):
+        source = options['source']
+        dataset_dir = options.get('dataset_dir') or ip_geolocation.dataset_dir
+
+        with tempfile.TemporaryDirectory() as workdir:
+            if source.startswith(('http://', 'https://')):
+                source = self.download(source, workdir)
+
+            try:
+                with open(source, newline='', encoding='utf-8') as csv_file:
+                    ranges, locations = self.parse(csv.DictReader(csv_file))
+            except OSError as e:
+                raise CommandError(f'Unable To Read Dataset: {str(e)}')
+
+            versions_dir = os.path.join(
+                dataset_dir, ip_geolocation.VERSIONS_DIR
+            )
+            os.makedirs(versions_dir, exist_ok=True)
+
+            # Built next to the live index (same filesystem) and never
+            # written to once in use: running processes map its files
+            build_dir = tempfile.mkdtemp(
+                prefix=time.strftime('%Y%m%d%H%M%S-'), dir=versions_dir
+            )
+            os.chmod(build_dir, 0o755)
+
+            try:
+                counts = self.write_index(build_dir, ranges, locations)
+                self.activate(dataset_dir, build_dir)
+            except BaseException:
+                shutil.rmtree(build_dir, ignore_errors=True)
+                raise
+
+        self.prune(dataset_dir, keep=build_dir)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                (f'Geolocation index rebuilt in {dataset_dir}:'
+                 f' {counts[4]} IPv4 ranges, {counts[6]} IPv6 ranges,'
+                 f' {len(locations)} locations')
+            )
+        )
+
+    def activate(self, dataset_dir, build_dir):
+        """
+        Point the `current` link at `build_dir`. The link is replaced
+        with a rename, so processes see either the old or the new build.
+        """
+
+        link = os.path.join(dataset_dir, ip_geolocation.CURRENT_LINK)
+        staged_link = f'{link}.{os.getpid()}'
+
+        os.symlink(os.path.relpath(build_dir, dataset_dir), staged_link)
+        os.replace(staged_link, link)
+
+    def prune(self, dataset_dir, keep):
+        """
+        Remove builds older than the previous one. That one is kept for
+        processes which resolved the link before it was swapped.
+        """
+
+        versions_dir = os.path.join(dataset_dir, ip_geolocation.VERSIONS_DIR)
+        builds = sorted(
+            os.path.join(versions_dir, name) for name in os.listdir(versions_dir)
+        )
+
+        for build in builds[:-2]:
+            if build != keep:
+                shutil.rmtree(build, ignore_errors=True)
+
+    def download(self, url, workdir):
+        path = os.path.join(workdir, 'source.csv')
+
+        try:
+            with requests.get(url, stream=True, timeout=30) as res:
+                res.raise_for_status()
+
+                with open(path, 'wb') as csv_file:
+                    for chunk in res.iter_content(chunk_size=1 << 20):
+                        csv_file.write(chunk)
+
+        except requests.RequestException as e:
+            raise CommandError(f'Unable To Download Dataset: {str(e)}')
+
+        return path
+
+    def parse_range(self, row):
+        if row.get('network'):
+            network = ipaddress.ip_network(row['network'], strict=False)
+            first, last = network.network_address, network.broadcast_address
+        else:
+            first = ipaddress.ip_address(row['start_ip'])
+            last = ipaddress.ip_address(row['end_ip'])
+
+        if first.version != last.version:
+            raise ValueError('Range Mixes IPv4 And IPv6 Addresses')
+
+        if first.version == 4:
+            return 4, int(first), int(last)
+
+        # IPv6 ranges are indexed on their upper 64 bits
+        return 6, int(first) >> 64, int(last) >> 64
+
+    def parse(self, reader):
+        if not reader.fieldnames or not (
+            'network' in reader.fieldnames
+            or {'start_ip', 'end_ip'} <= set(reader.fieldnames)
+        ):
+            raise CommandError(
+                'Dataset Needs A `network` Or `start_ip`/`end_ip` Columns'
+            )
+
+        ranges = {4: [], 6: []}
+        locations, location_ids = [], {}
+        skipped = 0
+
+        for row in reader:
+            try:
+                version, start, end = self.parse_range(row)
+            except (ValueError, KeyError):
+                skipped += 1
+                continue
+
+            location = {
+                column: row[column]
+                for column in self.LOCATION_COLUMNS
+                if row.get(column)
+            }
+
+            if row.get('latitude') and row.get('longitude'):
+                location['loc'] = f"{row['latitude']},{row['longitude']}"
+
+            key = tuple(sorted(location.items()))
+            if key not in location_ids:
+                location_ids[key] = len(locations)
+                locations.append(location)
+
+            ranges[version].append((start, end, location_ids[key]))
+
+        if skipped:
+            self.stdout.write(
+                self.style.WARNING(f'Skipped {skipped} invalid rows')
+            )
+
+        return ranges, locations
+
+    def write_index(self, build_dir, ranges, locations):
+        counts = {}
+
+        for version, dtype in ((4, np.uint32), (6, np.uint64)):
+            rows = sorted(ranges[version])
+
+            # Drop ranges overlapping the previous one so the starts stay
+            # strictly increasing and a binary search stays unambiguous
+            kept, last_end = [], -1
+            for start, end, location_id in rows:
+                if start > last_end:
+                    kept.append((start, end, location_id))
+                    last_end = end
+
+            counts[version] = len(kept)
+            columns = zip(*kept) if kept else ((), (), ())
+
+            for column, values in zip(('start', 'end', 'location'), columns):
+                np.save(
+                    os.path.join(build_dir, f'ipv{version}_{column}.npy'),
+                    np.array(
+                        values, dtype=np.uint32 if column == 'location' else dtype
+                    )
+                )
+
+        with open(
+            os.path.join(build_dir, ip_geolocation.LOCATIONS_FILE), 'w'
+        ) as locations_file:
+            json.dump(locations, locations_file)
+
+        return counts
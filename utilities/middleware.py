@@ -131,3 +131,20 @@ class DeviceMetaInfoMiddleware:
 
         request.device_meta_info = meta_info
         return self.get_response(request)
+
+
+def get_device_meta_info(request: HttpRequest) -> dict:
+    """
+    JSON serializable copy of the device data set by
+    `DeviceMetaInfoMiddleware`, for handing over to background jobs.
+    """
+
+    meta_info = request.device_meta_info
+
+    return {
+        "ip": meta_info["ip"],
+        "user_agent": str(meta_info["user_agent"]),
+        "device_type": str(meta_info["device_type"]),
+        "client_clientversion": meta_info["client_clientversion"],
+        "os_osversion": meta_info["os_osversion"],
+    }
@@ -0,0 +1,18 @@
+from django.db.models import lookups
+
+
+class ILikeStartsWith(lookups.IStartsWith):
+    """
+    `istartswith` as a plain `column ILIKE 'prefix%'`, which trigram
+    (`gin_trgm_ops`) indexes on the column serve. Django's own compiles
+    to `UPPER(column::text) LIKE UPPER(...)`, which no column index can.
+    PostgreSQL only.
+    """
+
+    lookup_name = "ilike_startswith"
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, lhs_params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+
+        return f"{lhs_sql} ILIKE {rhs_sql}", (*lhs_params, *rhs_params)
@@ -0,0 +1,67 @@
+from django.db.models import Q
+
+from utilities.generators.codes import QueryIDCodec
+
+import binascii
+import base64
+
+
+class QueryIDMixin:
+    """
+    Public ids (`query_id` in responses) of a model's rows: its primary
+    keys encoded by a `QueryIDCodec`, so resolving one is a primary key
+    lookup.
+
+    Rows created before the codec still hold their legacy id in the
+    `query_id` column. Their old ids (base64 of that column) keep
+    resolving through it, while responses hand out the new ones.
+    """
+
+    @classmethod
+    def query_id_codec(cls) -> QueryIDCodec:
+        return QueryIDCodec.for_model(cls)
+
+    @classmethod
+    def cursor_codec(cls) -> QueryIDCodec:
+        """
+        Codec of the primary keys in pagination cursors: a cursor doesn't
+        give away the public id of its row, which may be hidden.
+        """
+
+        return QueryIDCodec.for_model(cls, purpose="cursor")
+
+    @property
+    def public_query_id(self) -> str:
+        if self.pk is None:
+            return None
+
+        return self.query_id_codec().encode(self.pk)
+
+    @classmethod
+    def query_id_filter(cls, query_ids) -> Q:
+        """
+        Lookup matching the rows of `query_ids` (an id or a list of
+        ids), ids that are neither current nor legacy ones match nothing.
+        """
+
+        if isinstance(query_ids, str):
+            query_ids = [query_ids]
+
+        decoded = cls.query_id_codec().decode_many(query_ids)
+        lookup = Q(pk__in=list(decoded.values()))
+
+        legacy_query_ids = []
+
+        for query_id in query_ids:
+            if query_id in decoded:
+                continue
+
+            try:
+                legacy_query_ids.append(base64.b64decode(query_id.encode()))
+            except (binascii.Error, AttributeError):
+                continue
+
+        if legacy_query_ids:
+            lookup |= Q(query_id__in=legacy_query_ids)
+
+        return lookup
@@ -0,0 +1,378 @@
+from django.conf import settings
+from django.db import models, transaction
+
+from configurations.utilities.currencies import (
+    ExchangeRates, RateSnapshot, BASE_CURRENCY
+)
+
+from dataclasses import dataclass
+from decimal import Decimal
+from fractions import Fraction
+
+import numpy as np
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+# Batch conversions work on integer cents, multiplied by the exact
+# ratio of the exchange rates as an integer fraction
+_SPLIT_BITS = 24
+
+# Bounds keeping every intermediate product of `_scale_cents` in int64
+_MAX_CENTS = 1 << 34
+_MAX_NUMERATOR = 1 << 53
+_MAX_DENOMINATOR = 1 << 38
+_MAX_RESULT = 1 << 62
+
+
+def default_currency_code() -> str:
+    return (
+        app_settings.get("DEFAULT_CURRENCY", {}).get("code") or BASE_CURRENCY
+    ).upper()
+
+
+@dataclass(frozen=True)
+class Money:
+    """
+    An amount in a given currency.
+
+    Amounts are kept unrounded so they can be summed and converted
+    without accumulating rounding errors; they are only rounded (to
+    cents) when formatted, e.g. `str(Money(Decimal("1.005"), "USD"))`
+    gives "1.00 USD", the format prices have always been returned in.
+    """
+
+    amount: Decimal
+    currency: str = BASE_CURRENCY
+
+    def __post_init__(self):
+        object.__setattr__(self, "amount", Decimal(self.amount))
+        object.__setattr__(self, "currency", self.currency.upper())
+
+    @classmethod
+    def zero(cls, currency: str = BASE_CURRENCY) -> "Money":
+        return cls(Decimal("0.00"), currency)
+
+    def __add__(self, other) -> "Money":
+        # Lets `sum()` start from 0
+        if isinstance(other, int) and other == 0:
+            return self
+
+        if not isinstance(other, Money):
+            return NotImplemented
+
+        if other.currency != self.currency:
+            raise ValueError(
+                f"Cannot Add {other.currency} To {self.currency}"
+            )
+
+        return Money(self.amount + other.amount, self.currency)
+
+    __radd__ = __add__
+
+    def __mul__(self, factor) -> "Money":
+        return Money(self.amount * Decimal(factor), self.currency)
+
+    __rmul__ = __mul__
+
+    def rounded(self, places: int = 2) -> "Money":
+        return Money(round(self.amount, places), self.currency)
+
+    def __str__(self) -> str:
+        return f"{round(self.amount, 2)} {self.currency}"
+
+
+class PricingEngine:
+    """
+    Converts costs computed in `BASE_CURRENCY` (USD) into one currency.
+
+    The currency and its rate are resolved once, when the engine is
+    built (usually once per request, through `for_user`), and reused for
+    every object priced afterwards. Priced objects only need a `cost()`
+    method returning their USD cost, and a `cost_breakdown()` method
+    for `breakdown`.
+    """
+
+    def __init__(self, currency: str = None, rate: Decimal = None):
+        self.currency = (currency or default_currency_code()).upper()
+
+        if rate is None:
+            # The rates snapshot lives in process memory: no network
+            # access and, for USD, no cache access either
+            rate = ExchangeRates().get_exchange_rate(
+                to_currency=self.currency
+            )
+
+        self.rate = Decimal(rate)
+
+    @classmethod
+    def for_user(cls, user=None) -> "PricingEngine":
+        """
+        Engine for the user's preferred currency (a single query), or for
+        the default currency if there is no user.
+        """
+
+        if user is None:
+            return cls()
+
+        # Imported lazily: accounts models price themselves through
+        # this module
+        from accounts.models.settings import UserSettings
+
+        currency = UserSettings.objects.filter(
+            user=user
+        ).values_list(
+            "preferred_currency__code", flat=True
+        ).first()
+
+        return cls(currency)
+
+    @classmethod
+    def resolve(cls, user=None, pricing: "PricingEngine" = None):
+        return pricing if pricing is not None else cls.for_user(user)
+
+    def convert(self, cost: Decimal) -> Money:
+        return Money(Decimal(cost) * self.rate, self.currency)
+
+    def price(self, obj) -> Money:
+        return self.convert(obj.cost())
+
+    def breakdown(self, obj) -> dict:
+        return {
+            name: self.convert(cost)
+            for name, cost in obj.cost_breakdown().items()
+        }
+
+    def price_many(self, objs) -> dict:
+        """
+        Price a whole queryset (or list) of plans or features in one
+        pass. Related features should be `select_related` beforehand.
+
+        Returns:
+            dict: `Money` by primary key.
+        """
+
+        return {obj.pk: self.price(obj) for obj in objs}
+
+
+def _scale_cents(cents: np.ndarray, numerator: int,
+                 denominator: int) -> np.ndarray:
+    """
+    `round(cents * numerator / denominator)` (half away from zero, as
+    SQL's ROUND) in int64 arithmetic.
+
+    `cents * numerator` can overflow 64 bits, so `numerator` is split
+    into its high and low `_SPLIT_BITS` and the high part is divided by
+    `denominator` before being shifted back.
+    """
+
+    signs, cents = np.sign(cents), np.abs(cents)
+
+    high = numerator >> _SPLIT_BITS
+    low = numerator & ((1 << _SPLIT_BITS) - 1)
+    high_quotient, high_remainder = np.divmod(cents * high, denominator)
+
+    return signs * ((high_quotient << _SPLIT_BITS) + (
+        (high_remainder << _SPLIT_BITS) + cents * low + denominator // 2
+    ) // denominator)
+
+
+def _scale_cent(value: int, numerator: int, denominator: int) -> int:
+    # As `_scale_cents`, for a single value of any size
+    scaled = (abs(value) * numerator * 2 + denominator) // (denominator * 2)
+
+    return -scaled if value < 0 else scaled
+
+
+def convert_amounts(
+        amounts, currencies, to_currency: str, rates: RateSnapshot = None
+) -> list:
+    """
+    Convert many amounts, each in its own currency, into `to_currency`.
+
+    The rates are read once and amounts are converted per source
+    currency with integer array arithmetic: cents are multiplied by the
+    exact ratio of the rates, as an integer fraction, and rounded half
+    away from zero to the cent, giving the prices the SQL conversion
+    (`UnitQuerySet.with_price_in`) does.
+
+    Args:
+        amounts: Decimal amounts.
+        currencies: Currency code of each amount.
+        to_currency: Currency to convert into.
+        rates: Exchange rates to use (the current snapshot when None).
+
+    Returns:
+        list: A `Money` per amount, or None where a rate is unknown.
+    """
+
+    rates = rates or ExchangeRates().snapshot()
+    to_currency = to_currency.upper()
+    to_rate = rates.get(to_currency)
+
+    codes = np.array([code.upper() for code in currencies], dtype=object)
+    cents = np.array(
+        [int(Decimal(amount).scaleb(2).to_integral_value()) for amount in amounts],
+        dtype=np.int64
+    )
+
+    converted = np.zeros(len(cents), dtype=np.int64)
+    known = np.zeros(len(cents), dtype=bool)
+
+    for code in set(codes.tolist()):
+        from_rate = rates.get(code)
+        positions = np.flatnonzero(codes == code)
+        group = cents[positions]
+
+        if code == to_currency:
+            ratio = Fraction(1)
+        elif from_rate and to_rate:
+            ratio = Fraction(to_rate) / Fraction(from_rate)
+        else:
+            continue
+
+        numerator, denominator = ratio.numerator, ratio.denominator
+        largest = int(np.abs(group).max()) if len(group) else 0
+
+        if (
+            numerator < _MAX_NUMERATOR and denominator < _MAX_DENOMINATOR
+            and largest < _MAX_CENTS
+            and largest * numerator < _MAX_RESULT * denominator
+        ):
+            converted[positions] = _scale_cents(group, numerator, denominator)
+        else:
+            # Out of the int64 safe range, rare enough to do one by one
+            converted[positions] = [
+                _scale_cent(int(value), numerator, denominator)
+                for value in group
+            ]
+
+        known[positions] = True
+
+    return [
+        Money(Decimal(int(value)).scaleb(-2), to_currency) if is_known else None
+        for value, is_known in zip(converted.tolist(), known.tolist())
+    ]
+
+
+def plans_priced_with(instance) -> list:
+    """
+    Primary keys of the subscription plans whose price depends on
+    `instance` (a plan or a plan feature).
+    """
+
+    from accounts.models.plans import SubscriptionPlan
+
+    if isinstance(instance, SubscriptionPlan):
+        return [instance.pk]
+
+    paths = SubscriptionPlan.priced_paths().get(type(instance), [])
+
+    if not paths:
+        return []
+
+    lookup = models.Q()
+    for path in paths:
+        lookup |= models.Q(**{path: instance.pk})
+
+    return list(
+        SubscriptionPlan.objects.get_queryset().filter(
+            lookup
+        ).values_list("pk", flat=True)
+    )
+
+
+def rebuild_plan_price_snapshots(
+        plan_pks: list = None, rates: RateSnapshot = None
+) -> int:
+    """
+    Recompute the `PlanPriceSnapshot` rows of the active plans in every
+    currency of the `Currencies` table with a known rate.
+
+    Args:
+        plan_pks: Only rebuild these plans (all plans when None).
+        rates: Exchange rates to use (the current snapshot when None).
+
+    Returns:
+        int: Number of snapshot rows written.
+    """
+
+    from accounts.models.plans import SubscriptionPlan, PlanPriceSnapshot
+    from configurations.models.currencies import Currencies
+
+    rates = rates or ExchangeRates().snapshot()
+
+    engines = []
+    for code in Currencies.objects.values_list("code", flat=True):
+        rate = rates.get(code)
+
+        # Plans keep being priced on the fly in currencies without a rate
+        if rate:
+            engines.append(PricingEngine(code, rate))
+
+    plans = SubscriptionPlan.objects.filter(
+        auto=False, is_active=True
+    ).select_related(*SubscriptionPlan.priced_related())
+
+    snapshots = PlanPriceSnapshot.objects.all()
+
+    if plan_pks is not None:
+        plans = plans.filter(pk__in=plan_pks)
+        snapshots = snapshots.filter(plan_id__in=plan_pks)
+
+    rows = [
+        PlanPriceSnapshot(
+            plan=plan, currency_code=engine.currency,
+            amount=engine.convert(cost).rounded().amount
+        )
+        for plan in plans
+        # A plan is costed once and converted into every currency
+        for cost in [plan.cost()]
+        for engine in engines
+    ]
+
+    with transaction.atomic():
+        # Snapshots of deactivated plans or of currencies that lost their
+        # rate would otherwise be served forever
+        snapshots.exclude(
+            plan_id__in={row.plan_id for row in rows},
+            currency_code__in=[engine.currency for engine in engines]
+        ).delete()
+
+        PlanPriceSnapshot.objects.bulk_create(
+            rows, batch_size=1000, update_conflicts=True,
+            unique_fields=["plan", "currency_code"],
+            update_fields=["amount", "updated_at"]
+        )
+
+    return len(rows)
+
+
+def refresh_plan_price_snapshots(plan_pks: list = None):
+    """Background job rebuilding plan price snapshots."""
+
+    written = rebuild_plan_price_snapshots(plan_pks=plan_pks)
+
+    logger.info(f"Rebuilt {written} Plan Price Snapshots")
+
+
+def with_snapshot_price(queryset, currency: str):
+    """
+    Annotate plans with their `snapshot_price` in `currency`, read from
+    `PlanPriceSnapshot` in the same query (None when there is none).
+    """
+
+    from accounts.models.plans import PlanPriceSnapshot
+
+    return queryset.annotate(
+        snapshot_price=models.Subquery(
+            PlanPriceSnapshot.objects.filter(
+                plan=models.OuterRef("pk"), currency_code=currency.upper()
+            ).values("amount")[:1]
+        )
+    )
@@ -0,0 +1,95 @@
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterable, Iterator
+
+import csv
+
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+class Echo:
+    """File-like object handing back what `csv.writer` writes to it."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def row_encoder(columns: list, output: str) -> Callable:
+    """Function turning a row (values ordered as `columns`) into a line."""
+
+    if output == "csv":
+        return csv.writer(Echo()).writerow
+
+    encoder = DjangoJSONEncoder(separators=(",", ":"))
+
+    return lambda row: encoder.encode(dict(zip(columns, row))) + "\n"
+
+
+def encode_lines(rows: Iterable, columns: list,
+                 output: str) -> Iterator[str]:
+    """
+    Lines of `rows` in the `output` format (CSV starting with its
+    header), one row at a time, for synchronous writers such as
+    management commands.
+    """
+
+    encode = row_encoder(columns, output)
+
+    if output == "csv":
+        yield encode(columns)
+
+    for row in rows:
+        yield encode(row)
+
+
+async def stream_lines(rows: Iterable, columns: list, output: str,
+                       chunk_size: int) -> AsyncIterator[str]:
+    """
+    Lines of `rows` in the `output` format, `chunk_size` rows at a time.
+
+    Rows are read in a worker thread (the one the request's ORM calls
+    run in, so a server-side cursor stays usable) while the event loop
+    only sends out what has already been read.
+    """
+
+    rows = iter(rows)
+    encode = row_encoder(columns, output)
+    fetch = sync_to_async(lambda: list(islice(rows, chunk_size)))
+
+    if output == "csv":
+        yield encode(columns)
+
+    while chunk := await fetch():
+        yield "".join(encode(row) for row in chunk)
+
+
+def stream_response(rows: Iterable, columns: list, output: str = "ndjson",
+                    filename: str = None,
+                    chunk_size: int = 2000) -> StreamingHttpResponse:
+    """
+    Stream `rows` without holding them in memory, rows should come from
+    `QuerySet.iterator(chunk_size=chunk_size)` so they are fetched in
+    chunks too.
+
+    The body is asynchronous: under ASGI Django would otherwise read a
+    synchronous one whole before sending its first byte.
+    """
+
+    stream = StreamingHttpResponse(
+        stream_lines(rows, columns, output, chunk_size),
+        content_type=FORMATS.get(output, FORMATS["ndjson"])
+    )
+
+    if filename:
+        stream["Content-Disposition"] = (
+            f'attachment; filename="{filename}.{output}"'
+        )
+
+    return stream
@@ -2,6 +2,7 @@
 from celery import shared_task
 
 from django.core.management import call_command
+from django.utils.module_loading import import_string
 from django.conf import settings
 
 from typing import Union, List
@@ -95,3 +96,12 @@ def clean_up_unverified_accounts():
         '--secret-key',
         settings.APPLICATION_SETTINGS['CMD_SECRET_KEY']
     )
+
+
+@shared_task
+def run_background_job(job_path: str, args: list, kwargs: dict):
+
+    # Jobs Handed Over By `utilities.executor.BackgroundExecutor`
+    # When A Queue Is Configured To Use Celery
+    job = import_string(job_path)
+    job(*args, **kwargs)
@@ -1,10 +1,22 @@
 # test_middleware.py
 import json
-from django.test import TestCase, RequestFactory
+from django.test import SimpleTestCase, TestCase, RequestFactory
 from django.http import JsonResponse
 from django.urls import reverse
 
+from accounts.models.users import User
+
 from utilities.middleware import IsUserRobot
+from utilities.analysis.ip_analysis import IPAddressAnalyzer
+from utilities.pricing import convert_amounts, Money
+from utilities.generators.codes import CodeGenerator, QueryIDCodec
+from utilities.streaming import stream_response
+
+from configurations.utilities.currencies import RateSnapshot
+
+from asgiref.sync import async_to_sync
+
+from decimal import Decimal, ROUND_HALF_UP
 
 
 class IsUserRobotMiddlewareTest(TestCase):
@@ -87,3 +99,230 @@ class IsUserRobotMiddlewareTest(TestCase):
             response_json["message"]["field"],
             "Unable To Read Device Properties"
         )
+
+
+class IPAddressAnalyzerTest(SimpleTestCase):
+    def setUp(self):
+        self.analyzer = IPAddressAnalyzer(base_ip="192.168.1.10")
+
+    def test_analyze_scores(self):
+        results = self.analyzer.analyze(
+            ["192.168.1.50", "192.168.1.200", "10.0.0.1"]
+        )
+
+        self.assertEqual(
+            results["pattern_based_ips"], ["192.168.1.50", "192.168.1.200"]
+        )
+        self.assertEqual(results["similar_ips"], ["192.168.1.50"])
+        self.assertAlmostEqual(
+            results["ip_scores"]["192.168.1.50"], 0.4 + 0.4 + 0.2 * 2 / 3
+        )
+        self.assertAlmostEqual(results["ip_scores"]["10.0.0.1"], 0.2 / 3)
+
+    def test_mixed_address_families(self):
+        results = self.analyzer.analyze(["2001:db8::1", "192.168.1.11"])
+
+        self.assertEqual(results["pattern_based_ips"], ["192.168.1.11"])
+        self.assertEqual(len(results["clusters"]), 2)
+
+    def test_ipv6_similarity_across_word_boundary(self):
+        # 2001:db8::ffff:ffff:ffff:ffff and 2001:db8:0:1:: are neighbours
+        analyzer = IPAddressAnalyzer(base_ip="2001:db8::ffff:ffff:ffff:ffff")
+
+        self.assertEqual(
+            analyzer.analyze(
+                ["2001:db8:0:1::", "2001:db8:0:1::63", "2001:db8:0:1::64"]
+            )["similar_ips"],
+            ["2001:db8:0:1::", "2001:db8:0:1::63"]
+        )
+
+        analyzer = IPAddressAnalyzer(base_ip="2001:db8:0:1::")
+
+        self.assertEqual(
+            analyzer.analyze(
+                ["2001:db8::ffff:ffff:ffff:ffff", "2001:db8::ffff:ffff:ffff:ff00"]
+            )["similar_ips"],
+            ["2001:db8::ffff:ffff:ffff:ffff"]
+        )
+
+    def test_ipv6_far_across_word_boundary(self):
+        analyzer = IPAddressAnalyzer(base_ip="2001:db8::5")
+
+        self.assertEqual(
+            analyzer.analyze(
+                ["2001:db8:0:1::3", "2001:db8::ffff:ffff:ffff:fffe", "2001:db8::9"]
+            )["similar_ips"],
+            ["2001:db8::9"]
+        )
+
+    def test_score_groups_matches_analyze(self):
+        ip_lists = {
+            1: ["192.168.1.11", "192.168.7.1"],
+            2: ["10.0.0.1", "2001:db8::1", "10.0.0.2"],
+        }
+
+        ip_addresses, groups = [], []
+        for group, ips in ip_lists.items():
+            ip_addresses += ips
+            groups += [group] * len(ips)
+
+        scores = self.analyzer.score_groups(ip_addresses, groups)
+
+        for group, ips in ip_lists.items():
+            self.assertAlmostEqual(
+                scores[group],
+                self.analyzer.analyze(ips)["total_probability_score"]
+            )
+
+
+class ConvertAmountsTest(SimpleTestCase):
+    def setUp(self):
+        self.rates = RateSnapshot(
+            rates={
+                "XAF": "603.512", "KWD": "0.3071", "LBP": "89500",
+                "VND": "25400", "BHD": "0.376",
+            }
+        )
+
+    def assertMatchesDecimalConversion(self, amounts, currencies, to_currency):
+        prices = convert_amounts(amounts, currencies, to_currency, self.rates)
+
+        for amount, currency, price in zip(amounts, currencies, prices):
+            expected = (
+                amount * self.rates.get(to_currency) / self.rates.get(currency)
+            ).quantize(Decimal("0.01"), ROUND_HALF_UP)
+
+            self.assertEqual(price, Money(expected, to_currency))
+
+    def test_matches_decimal_conversion(self):
+        self.assertMatchesDecimalConversion(
+            [Decimal("99999999.99"), Decimal("0.01"), Decimal("1250.55")],
+            ["KWD", "XAF", "USD"], "LBP"
+        )
+
+    def test_weak_to_strong_currencies(self):
+        amounts = [
+            Decimal("99999999.99"), Decimal("123456789.12"),
+            Decimal("-99999999.99")
+        ]
+
+        self.assertMatchesDecimalConversion(
+            amounts, ["XAF", "LBP", "XAF"], "KWD"
+        )
+        self.assertMatchesDecimalConversion(
+            [Decimal("9999999999.99"), Decimal("0.01")], ["VND"] * 2, "BHD"
+        )
+
+        prices = convert_amounts(amounts[:2], ["XAF", "LBP"], "KWD", self.rates)
+
+        self.assertEqual(
+            [price.amount for price in prices],
+            [Decimal("50885.48"), Decimal("423.62")]
+        )
+
+    def test_unknown_rates(self):
+        prices = convert_amounts(
+            [Decimal("10.00"), Decimal("10.00")], ["ZZZ", "XAF"], "XAF",
+            self.rates
+        )
+
+        self.assertEqual(prices, [None, Money(Decimal("10.00"), "XAF")])
+
+
+class CodeGeneratorTest(SimpleTestCase):
+    def setUp(self):
+        self.codes = CodeGenerator(
+            namespace="test", length=3, alphabet="abcdefghij", key="test"
+        )
+
+    def test_encoding_is_a_bijection(self):
+        codes = [self.codes.encode(value) for value in range(1000)]
+
+        self.assertEqual(len(set(codes)), 1000)
+        self.assertTrue(all(len(code) == 3 for code in codes))
+        self.assertEqual(
+            [self.codes.decode(code) for code in codes], list(range(1000))
+        )
+
+    def test_codes_depend_on_the_key(self):
+        other = CodeGenerator(
+            namespace="test", length=3, alphabet="abcdefghij", key="other"
+        )
+
+        self.assertNotEqual(
+            [self.codes.encode(value) for value in range(10)],
+            [other.encode(value) for value in range(10)]
+        )
+
+    def test_out_of_range(self):
+        with self.assertRaises(ValueError):
+            self.codes.encode(1000)
+
+
+class QueryIDCodecTest(SimpleTestCase):
+    def setUp(self):
+        self.query_ids = QueryIDCodec(namespace="accounts.user", key="test")
+
+    def test_round_trip(self):
+        pks = [1, 2, 1000, 2 ** 63 - 1]
+        query_ids = self.query_ids.encode_many(pks)
+
+        self.assertTrue(
+            all(len(query_id) == QueryIDCodec.LENGTH for query_id in query_ids)
+        )
+        self.assertEqual(
+            list(self.query_ids.decode_many(query_ids).values()), pks
+        )
+
+    def test_rejects_ids_it_did_not_issue(self):
+        query_id = self.query_ids.encode(5)
+        tampered = query_id[:-1] + ("A" if query_id[-1] != "A" else "B")
+        other_model = QueryIDCodec(namespace="properties.unit", key="test")
+
+        for invalid in (tampered, other_model.encode(5), "?" * 16, "legacy"):
+            with self.assertRaises(ValueError):
+                self.query_ids.decode(invalid)
+
+        self.assertEqual(
+            self.query_ids.decode_many([query_id, tampered]), {query_id: 5}
+        )
+
+    def test_cursors_do_not_reveal_query_ids(self):
+        cursor_codec = QueryIDCodec.for_model(User, purpose="cursor")
+        token = cursor_codec.encode(5)
+
+        self.assertNotEqual(token, User.query_id_codec().encode(5))
+        self.assertEqual(cursor_codec.decode(token), 5)
+
+        with self.assertRaises(ValueError):
+            User.query_id_codec().decode(token)
+
+
+class StreamResponseTest(SimpleTestCase):
+    def read(self, stream):
+        async def chunks():
+            return [chunk async for chunk in stream]
+
+        return async_to_sync(chunks)()
+
+    def test_streams_chunks_asynchronously(self):
+        rows = iter([(pk, f"user{pk}") for pk in range(5)])
+        stream = stream_response(
+            rows, ["pk", "username"], output="csv", chunk_size=2
+        )
+
+        self.assertTrue(stream.is_async)
+
+        chunks = self.read(stream)
+
+        # The header, then one chunk of lines per 2 rows
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(
+            b"".join(chunks).decode().splitlines(),
+            ["pk,username"] + [f"{pk},user{pk}" for pk in range(5)]
+        )
+
+    def test_ndjson(self):
+        stream = stream_response([(1, "a")], ["pk", "username"])
+
+        self.assertEqual(self.read(stream), [b'{"pk":1,"username":"a"}\n'])
@@ -1,5 +1,7 @@
 from accounts.models.users import User
 
+from utilities.websockets.pending import PendingDelivery
+
 from asgiref.sync import sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
 
@@ -20,23 +22,32 @@ class DeviceConsumer(AsyncWebsocketConsumer):
     async def connect(self):
         user_query_id = self.scope['url_route']['kwargs']['user_query_id']
 
-        user_id = await self.get_user_id(user_query_id=user_query_id)
+        self.user_id = await self.get_user_id(user_query_id=user_query_id)
 
-        # Use user_id as needed for your logic
-        await self.accept()
+        if self.user_id is None:
+            await self.close()
+            return
 
         # Connect to a unique channel based on the user ID
         await self.channel_layer.group_add(
-            f"user_{user_id}",
+            f"user_{self.user_id}",
             self.channel_name
         )
 
+        await self.accept()
+
+        # Flush device data produced before the client subscribed
+        device_data = await PendingDelivery(user_pk=self.user_id).claim()
+
+        if device_data is not None:
+            await self.send(text_data=json.dumps({'device_data': device_data}))
+
     async def disconnect(self, close_code):
-        user_query_id = self.scope['url_route']['kwargs']['user_query_id']
+        user_id = getattr(self, "user_id", None)
 
-        user_id = await self.get_user_id(user_query_id=user_query_id)
+        if user_id is None:
+            return
 
-        # Use user_id as needed for your logic
         # Disconnect from the unique channel when
         # the WebSocket is closed
         await self.channel_layer.group_discard(
@@ -46,4 +57,14 @@ class DeviceConsumer(AsyncWebsocketConsumer):
 
     async def send_device_data(self, event):
         device_data = event['device_data']
+
+        # Pending deliveries are only sent by whoever claims them first
+        if "delivery_id" in event:
+            device_data = await PendingDelivery(user_pk=self.user_id).claim(
+                delivery_id=event["delivery_id"]
+            )
+
+            if device_data is None:
+                return
+
         await self.send(text_data=json.dumps({'device_data': device_data}))
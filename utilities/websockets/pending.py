@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+
+from channels.layers import get_channel_layer
+from asgiref.sync import async_to_sync
+
+import uuid
+
+
+# Load Application Settings
+app_settings = getattr(settings, "APPLICATION_SETTINGS", {})
+
+
+class PendingDelivery:
+    """
+    At-most-once delivery of a websocket payload to a user who may not
+    be connected yet.
+
+    `push` stores the payload in the cache (Redis) with a TTL and
+    broadcasts it to the `user_{pk}` group. Whichever comes first claims
+    and deletes the stored copy:
+        - a consumer already in the group receiving the broadcast, or
+        - a consumer connecting later, flushing it from `connect`.
+    Redis' DEL is atomic, so only one of them sends it to the client.
+    """
+
+    KEY = "pending_delivery_{kind}_{user_pk}"
+
+    def __init__(self, user_pk: int, kind: str = "device_data"):
+        self.user_pk = user_pk
+        self.kind = kind
+        self.key = self.KEY.format(kind=kind, user_pk=user_pk)
+
+    @property
+    def timeout(self) -> int:
+        return app_settings.get("PENDING_DELIVERY_TTL", 300)
+
+    def push(self, payload: dict) -> str:
+        delivery_id = uuid.uuid4().hex
+
+        cache.set(
+            self.key, {"id": delivery_id, "payload": payload}, self.timeout
+        )
+
+        async_to_sync(get_channel_layer().group_send)(
+            f"user_{self.user_pk}",
+            {
+                "type": f"send.{self.kind}",
+                self.kind: payload,
+                "delivery_id": delivery_id,
+            }
+        )
+
+        return delivery_id
+
+    async def claim(self, delivery_id: str = None):
+        """
+        Take the pending payload, if any, so no other consumer sends it.
+
+        Args:
+            delivery_id: Only claim this delivery (a newer one may have
+            replaced it in the meantime).
+
+        Returns:
+            The payload, or None if there is nothing left to deliver.
+        """
+
+        pending = await cache.aget(self.key)
+
+        if pending is None:
+            return None
+
+        if delivery_id is not None and pending["id"] != delivery_id:
+            return None
+
+        if not await cache.adelete(self.key):
+            return None
+
+        return pending["payload"]